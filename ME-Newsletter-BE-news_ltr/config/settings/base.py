@@ -80,6 +80,7 @@ THIRD_PARTY_APPS = [
     'rest_framework_swagger',
     "corsheaders",
     "drf_spectacular",
+    "django_filters",
     'ckeditor',
     'ckeditor_uploader'
 ]
@@ -90,6 +91,11 @@ LOCAL_APPS = [
     "newsletter.landing",
     "newsletter.updates",
     "newsletter.practicals",
+    "newsletter.tracking",
+    "newsletter.search",
+    "newsletter.locations",
+    "newsletter.sync",
+    "newsletter.feeds",
    # Your stuff: custom apps go here
 ]
 
@@ -143,6 +149,7 @@ AUTH_PASSWORD_VALIDATORS = [
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "newsletter.core.compression.CompressionMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -153,6 +160,16 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
+# Not run for GETs of public API views, see newsletter.core.fastlane
+FAST_LANE = {
+    "SKIP_MIDDLEWARE": [
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.locale.LocaleMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+    ],
+}
 
 # STATIC
 # ------------------------------------------------------------------------------
@@ -232,10 +249,20 @@ X_FRAME_OPTIONS = "DENY"
 # EMAIL
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
-EMAIL_BACKEND = env(
+# Messages are queued and delivered by background threads through ASYNC_EMAIL_BACKEND,
+# so a slow provider does not add EMAIL_TIMEOUT to signup/subscribe requests
+EMAIL_BACKEND = "newsletter.core.mail.AsyncEmailBackend"
+ASYNC_EMAIL_BACKEND = env(
     "DJANGO_EMAIL_BACKEND",
     default="django.core.mail.backends.smtp.EmailBackend",
 )
+ASYNC_EMAIL = {
+    "WORKERS": 2,
+    "QUEUE_SIZE": 1000,
+    "BATCH_SIZE": 50,
+    "RETRIES": 3,
+    "RETRY_DELAY": 1.0,
+}
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-timeout
 EMAIL_TIMEOUT = 5
 
@@ -306,18 +333,28 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
     # Rate limiting for Lovable integration
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'newsletter.core.throttling.AnonThrottle',
+        'newsletter.core.throttling.UserThrottle',
+        'newsletter.core.throttling.ScopedThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '1000/day',
-        'user': '2000/day'
+        'user': '2000/day',
+        # per IP, on views with throttle_scope = "subscribe"
+        'subscribe': '10/hour',
     },
     # Enhanced rendering for API responses
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'newsletter.core.renderers.ORJSONRenderer',
+        'newsletter.core.renderers.MessagePackRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
-    ]
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'newsletter.core.renderers.ORJSONParser',
+        'newsletter.core.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
@@ -356,3 +393,66 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+
+# Subscriptions
+# ------------------------------------------------------------------------------
+# New subscribers stay "pending" until they open the signed confirmation link
+SUBSCRIBE_DOUBLE_OPT_IN = env.bool("DJANGO_SUBSCRIBE_DOUBLE_OPT_IN", True)
+# Lifetime of the signed confirm / unsubscribe links, in seconds
+SUBSCRIBE_CONFIRM_MAX_AGE = 60 * 60 * 24 * 7
+UNSUBSCRIBE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Open/click tracking
+# ------------------------------------------------------------------------------
+# Events are buffered per worker and written in batches
+TRACKING_BUFFER = {
+    "BACKEND": "newsletter.tracking.buffer.LocalEventBuffer",
+    "OPTIONS": {"flush_size": 500, "flush_interval": 10},
+}
+
+# Delta sync
+# ------------------------------------------------------------------------------
+# `changes/` only returns changes older than this many seconds, so a transaction committing
+# after its `modified` timestamp was set cannot land behind a cursor a client already holds
+SYNC_SETTLE_SECONDS = 30
+
+# Content events
+# ------------------------------------------------------------------------------
+# Broker of the `events/` server-sent event stream; in-process unless overridden
+CONTENT_EVENTS = {
+    "BACKEND": "newsletter.sync.events.LocalBroker",
+    "OPTIONS": {"history": 1000},
+}
+
+# Feeds
+# ------------------------------------------------------------------------------
+# Item links of the RSS/Atom/JSON feeds point to the public site
+FEEDS = {
+    "SITE_URL": env("FEEDS_SITE_URL", default="http://localhost:3000"),
+    "ITEMS": 20,
+}
+
+# Response compression
+# ------------------------------------------------------------------------------
+# Per-request levels stay cheap; bodies cached by the views are compressed once at maximum level
+COMPRESSION = {
+    "MIN_SIZE": 860,
+    "BROTLI_QUALITY": 4,
+    "GZIP_LEVEL": 6,
+    "PRECOMPRESS_BROTLI_QUALITY": 11,
+}
+
+# Throttling
+# ------------------------------------------------------------------------------
+# Sliding-window request counters of the DRF throttles; per process unless overridden
+THROTTLE_COUNTER = {
+    "BACKEND": "newsletter.core.throttling.LocalCounter",
+}
+
+# Object cache
+# ------------------------------------------------------------------------------
+# Per-worker LRU in front of the default cache for the content views, see newsletter.core.cache
+OBJECT_CACHE = {
+    "BACKEND": "newsletter.core.cache.ObjectCache",
+    "OPTIONS": {"max_entries": 1000, "timeout": 300, "stale": 3600},
+}
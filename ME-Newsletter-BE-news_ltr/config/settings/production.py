@@ -117,7 +117,7 @@ INSTALLED_APPS += ["anymail"]  # noqa F405
 # https://docs.djangoproject.com/en/dev/ref/settings/#email-backend
 # https://anymail.readthedocs.io/en/stable/installation/#anymail-settings-reference
 # https://anymail.readthedocs.io/en/stable/esps/mailgun/
-EMAIL_BACKEND = "anymail.backends.mailgun.EmailBackend"
+ASYNC_EMAIL_BACKEND = "anymail.backends.mailgun.EmailBackend"
 ANYMAIL = {
     "MAILGUN_API_KEY": env("MAILGUN_API_KEY"),
     "MAILGUN_SENDER_DOMAIN": env("MAILGUN_DOMAIN"),
@@ -182,3 +182,28 @@ SPECTACULAR_SETTINGS["SERVERS"] = [  # noqa F405
 ]
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Open/click events go to a Redis stream, drained by `manage.py flush_tracking_events --follow`
+TRACKING_BUFFER = {
+    "BACKEND": "newsletter.tracking.buffer.RedisStreamBuffer",
+    "OPTIONS": {"url": env("REDIS_URL"), "stream": "newsletter:tracking"},
+}
+# Content events are shared by all workers through Redis pub/sub, with a capped stream for resumes
+CONTENT_EVENTS = {
+    "BACKEND": "newsletter.sync.events.RedisBroker",
+    "OPTIONS": {"url": env("REDIS_URL"), "stream": "newsletter:events", "channel": "newsletter:events"},
+}
+# No browsable API in production: JSON by default, MessagePack on request
+REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
+    "newsletter.core.renderers.ORJSONRenderer",
+    "newsletter.core.renderers.MessagePackRenderer",
+]
+# Throttle counters shared by all workers, updated atomically by a Lua script
+THROTTLE_COUNTER = {
+    "BACKEND": "newsletter.core.throttling.RedisCounter",
+    "OPTIONS": {"url": env("REDIS_URL")},
+}
+# New object cache versions are broadcast to the other workers over pub/sub
+OBJECT_CACHE = {
+    "BACKEND": "newsletter.core.cache.RedisObjectCache",
+    "OPTIONS": {**OBJECT_CACHE["OPTIONS"], "url": env("REDIS_URL"), "version_ttl": 60},
+}
@@ -26,6 +26,11 @@ urlpatterns = [
     path("api/v1/", include("newsletter.practicals.urls")),
     path("api/v1/", include("newsletter.updates.urls")),
     path("api/v1/", include("newsletter.landing.urls")),
+    path("api/v1/", include("newsletter.tracking.urls")),
+    path("api/v1/", include("newsletter.search.urls")),
+    path("api/v1/", include("newsletter.sync.urls")),
+    path("api/v1/", include("newsletter.feeds.urls")),
+    path("api/v1/batch/", core_views.BatchView.as_view(), name="batch"),
     url('api/doc/', schema_view),
     re_path(r'^ckeditor/', include('ckeditor_uploader.urls')),
     # Health check and status endpoints for Lovable integration
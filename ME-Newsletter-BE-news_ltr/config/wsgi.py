@@ -17,8 +17,6 @@ import os
 import sys
 from pathlib import Path
 
-from django.core.wsgi import get_wsgi_application
-
 # This allows easy placement of apps within the interior
 # news_letter directory.
 BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
@@ -29,10 +27,13 @@ sys.path.append(str(BASE_DIR / "news_letter"))
 # os.environ["DJANGO_SETTINGS_MODULE"] = "config.settings.production"
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
 
+from newsletter.core.fastlane import get_fast_lane_application  # noqa E402
+
 # This application object is used by any WSGI server configured to use this
 # file. This includes Django's development server, if the WSGI_APPLICATION
-# setting points here.
-application = get_wsgi_application()
+# setting points here. Anonymous public reads skip the session, CSRF, auth, messages and
+# locale middleware.
+application = get_fast_lane_application()
 # Apply WSGI middleware here.
 # from helloworld.wsgi import HelloWorldApplication
 # application = HelloWorldApplication(application)
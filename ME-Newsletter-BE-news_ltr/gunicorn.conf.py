@@ -0,0 +1,15 @@
+"""
+Gunicorn settings, read from the working directory by ``render.yaml`` and the Dockerfile.
+
+Workers are gevent's, so a client of the ``events/`` stream holds a greenlet rather than a whole
+worker while it waits for publications.
+"""
+worker_class = "gevent"
+worker_connections = 1000
+
+
+def post_fork(server, worker):
+    # psycopg2 waits for the database through gevent instead of blocking every greenlet
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
@@ -1,5 +1,8 @@
 import pytest
+from django.core.cache import cache
 
+from newsletter.core.cache import get_object_cache
+from newsletter.core.throttling import get_counter
 from newsletter.users.models import User
 from newsletter.users.tests.factories import UserFactory
 
@@ -9,6 +12,19 @@ def media_storage(settings, tmpdir):
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def throttle_counts():
+    yield
+    get_counter().clear()
+
+
+@pytest.fixture(autouse=True)
+def object_cache():
+    yield
+    cache.clear()
+    get_object_cache().clear()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
@@ -0,0 +1,116 @@
+"""
+In-process dispatch of several ``api/v1/`` GET requests for the ``batch/`` endpoint.
+
+Only views with ``batchable = True``, reads without side effects, can be called, so a batch
+cannot unsubscribe, confirm or record clicks on behalf of whoever sends it.
+
+The sub-requests are resolved and called directly, without middleware, inside one read-only
+transaction: on PostgreSQL it is REPEATABLE READ, so every response sees the same snapshot; on
+SQLite a transaction reads from one snapshot anyway. Each call runs in a savepoint, so a failing
+one becomes an error entry without affecting the others.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import io
+import logging
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# django imports
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, transaction
+from django.urls import Resolver404, resolve
+
+from newsletter.core import cache
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "/api/v1/"
+MAX_REQUESTS = 20
+
+
+class BatchError(ValueError):
+    pass
+
+
+def normalize_path(path):
+    """
+    ``(path, query string)`` of a path given relative to ``api/v1/`` or absolute.
+    """
+    if not isinstance(path, str):
+        raise BatchError("Paths must be strings")
+    parts = urlsplit(path)
+    if parts.scheme or parts.netloc or ".." in parts.path.split("/"):
+        raise BatchError("Only paths under %s are allowed" % PREFIX)
+    relative = parts.path[len(PREFIX):] if parts.path.startswith(PREFIX) else parts.path.lstrip("/")
+    return PREFIX + relative, parts.query
+
+
+def sub_request(request, path, query):
+    environ = dict(request.META)
+    environ.update({
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "CONTENT_LENGTH": "0",
+        "wsgi.input": io.BytesIO(),
+    })
+    environ.pop("CONTENT_TYPE", None)
+    environ.setdefault("SCRIPT_NAME", "")
+    return WSGIRequest(environ)
+
+
+def dispatch(request, path, query, throttled=True):
+    """
+    ``(status, body)`` of one GET; the body is the view's data, ``None`` for non-API responses.
+    ``throttled=False`` is for requests made by the server itself, like the static export.
+    """
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return 404, {"detail": "Not found."}
+    if not getattr(getattr(match.func, "view_class", None), "batchable", False):
+        return 400, {"detail": "Not available in a batch."}
+    view = match.func if throttled else match.func.view_class.as_view(throttle_classes=())
+    sub = sub_request(request, path, query)
+    sub.resolver_match = match
+    try:
+        with transaction.atomic():
+            response = view(sub, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception("Batched request to %s failed", path)
+        return 500, {"detail": "Server error."}
+    return response.status_code, getattr(response, "data", None)
+
+
+@contextmanager
+def snapshot():
+    """
+    Read-only transaction in which every query sees the same data; cached objects are bypassed,
+    since they may have been built from another one.
+    """
+    with transaction.atomic(), cache.bypass():
+        if connection.vendor == "postgresql":
+            # must be the first statement of the transaction
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        yield
+
+
+def run_batch(request, paths):
+    """
+    Responses of the GET ``paths`` as ``[{"path", "status", "body"}]``, in order.
+    """
+    if not isinstance(paths, list) or not paths:
+        raise BatchError("A non-empty list of paths is required")
+    if len(paths) > MAX_REQUESTS:
+        raise BatchError("At most %d paths per batch" % MAX_REQUESTS)
+    targets = [normalize_path(path) for path in paths]
+
+    results = []
+    with snapshot():
+        for original, (path, query) in zip(paths, targets):
+            status_code, body = dispatch(request, path, query)
+            results.append({"path": original, "status": status_code, "body": body})
+    return results
@@ -0,0 +1,377 @@
+"""
+Two-tier cache of computed objects: a bounded LRU in each worker in front of the default Django
+cache (Redis in production), so a hot key costs a dict lookup instead of a network round trip.
+
+Keys belong to a namespace whose version is part of every key; ``invalidate(namespace)`` drops
+all of them at once by storing a new version in the shared cache. Workers remember versions for
+``version_ttl`` seconds; ``RedisObjectCache`` also announces new versions over pub/sub, so the
+other workers switch right away and ``version_ttl`` only bounds a missed announcement.
+
+An entry is fresh for ``timeout`` seconds and then served stale for up to ``stale`` more while a
+background thread recomputes it. A missing key is computed once: threads of a worker wait for the
+one computing it, and other workers wait for a lock key in the shared cache, for at most
+``lock_timeout`` seconds before computing it themselves. ``compute`` raises ``NotCached`` for a
+value to return without storing it.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import functools
+import hashlib
+import io
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from functools import lru_cache
+from urllib.parse import urlencode
+
+# django imports
+from django.conf import settings
+from django.core.cache import caches
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.utils.module_loading import import_string
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from newsletter.core.compression import attach, precompress
+from newsletter.core.renderers import ORJSONRenderer
+
+logger = logging.getLogger(__name__)
+
+# responses built from the posts and locations, invalidated by newsletterapp.signals
+CONTENT = "content"
+
+Entry = namedtuple("Entry", "value fresh_until stale_until")
+
+_state = threading.local()
+
+
+class NotCached(Exception):
+    """
+    Raised by ``compute`` to have ``value`` returned without caching it, e.g. an error response.
+    """
+
+    def __init__(self, value):
+        super().__init__(value)
+        self.value = value
+
+
+def _computed(compute):
+    try:
+        return compute()
+    except NotCached as error:
+        return error.value
+
+
+class LRU:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ObjectCache:
+    def __init__(
+        self, alias="default", prefix="objects", max_entries=1000, timeout=300, stale=3600,
+        lock_timeout=10, poll_interval=0.05, version_ttl=5,
+    ):
+        self.alias = alias
+        self.prefix = prefix
+        self.timeout = timeout
+        self.stale = stale
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.version_ttl = version_ttl
+        self.local = LRU(max_entries)
+        self._versions = {}
+        self._flights = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def _version_key(self, namespace):
+        return "%s:%s:version" % (self.prefix, namespace)
+
+    def version(self, namespace):
+        known = self._versions.get(namespace)
+        if known is not None and time.monotonic() - known[1] < self.version_ttl:
+            return known[0]
+        key = self._version_key(namespace)
+        version = self.shared.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not self.shared.add(key, version, None):
+                version = self.shared.get(key, version)
+        self.receive(namespace, version)
+        return version
+
+    def receive(self, namespace, version):
+        self._versions[namespace] = (version, time.monotonic())
+
+    def invalidate(self, namespace):
+        version = uuid.uuid4().hex
+        self.shared.set(self._version_key(namespace), version, None)
+        self.receive(namespace, version)
+        self.announce(namespace, version)
+
+    def announce(self, namespace, version):
+        """
+        Tells the other workers about a new version; they re-read it after ``version_ttl`` anyway.
+        """
+
+    def clear(self):
+        self.local.clear()
+        self._versions.clear()
+
+    def get_or_set(self, namespace, key, compute, timeout=None, stale=None):
+        """
+        Cached ``compute()``; ``timeout`` and ``stale`` override the defaults in seconds.
+        """
+        if bypassed():
+            return _computed(compute)
+        timeout = self.timeout if timeout is None else timeout
+        stale = self.stale if stale is None else stale
+        key = "%s:%s:%s:%s" % (self.prefix, namespace, self.version(namespace), key)
+        entry = self._lookup(key)
+        if entry is not None:
+            now = time.time()
+            if now < entry.fresh_until:
+                return entry.value
+            if now < entry.stale_until:
+                self._revalidate(key, compute, timeout, stale)
+                return entry.value
+        return self._fill(key, compute, timeout, stale)
+
+    def _lookup(self, key):
+        entry = self.local.get(key)
+        if entry is None or entry.fresh_until <= time.time():
+            # another worker may have refreshed it already
+            shared = self.shared.get(key)
+            if shared is not None:
+                entry = Entry(*shared)
+                self.local.set(key, entry)
+        return entry
+
+    def _store(self, key, value, timeout, stale):
+        now = time.time()
+        entry = Entry(value, now + timeout, now + timeout + stale)
+        self.shared.set(key, tuple(entry), timeout + stale)
+        self.local.set(key, entry)
+        return value
+
+    def _fill(self, key, compute, timeout, stale):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = threading.Event()
+        if not leader:
+            flight.wait(self.lock_timeout)
+            entry = self._lookup(key)
+            return _computed(compute) if entry is None else entry.value
+        try:
+            return self._fill_shared(key, compute, timeout, stale)
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.set()
+
+    def _fill_shared(self, key, compute, timeout, stale):
+        lock_key = key + ":lock"
+        deadline = time.monotonic() + self.lock_timeout
+        # None when the shared cache is down and its errors are ignored: don't wait for it
+        acquired = self.shared.add(lock_key, 1, self.lock_timeout) is not False
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            entry = self._lookup(key)
+            if entry is not None:
+                return entry.value
+            acquired = self.shared.add(lock_key, 1, self.lock_timeout) is not False
+        try:
+            return self._store(key, compute(), timeout, stale)
+        except NotCached as error:
+            return error.value
+        finally:
+            if acquired:
+                self.shared.delete(lock_key)
+
+    def _revalidate(self, key, compute, timeout, stale):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        if self.shared.add(key + ":lock", 1, self.lock_timeout) is False:
+            with self._lock:
+                self._refreshing.discard(key)
+            return
+        threading.Thread(
+            target=self._refresh, args=(key, compute, timeout, stale), name="object-cache-refresh", daemon=True
+        ).start()
+
+    def _refresh(self, key, compute, timeout, stale):
+        try:
+            self._store(key, compute(), timeout, stale)
+        except NotCached:
+            # served stale until it expires or its namespace changes
+            pass
+        except Exception:
+            logger.exception("Could not refresh %s", key)
+        finally:
+            self.shared.delete(key + ":lock")
+            with self._lock:
+                self._refreshing.discard(key)
+            connections.close_all()
+
+
+class RedisObjectCache(ObjectCache):
+    def __init__(self, url, channel="newsletter:objects", **options):
+        import redis
+
+        super().__init__(**options)
+        self.client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._listener = None
+
+    def version(self, namespace):
+        self._start_listener()
+        return super().version(namespace)
+
+    def announce(self, namespace, version):
+        import redis
+
+        try:
+            self.client.publish(self.channel, json.dumps([namespace, version]))
+        except redis.RedisError:
+            logger.warning("Could not announce version %s of %s", version, namespace, exc_info=True)
+
+    def _start_listener(self):
+        if self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="object-cache-versions", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    self.receive(*json.loads(message["data"]))
+            except Exception:
+                # versions are re-read from the shared cache after version_ttl meanwhile
+                logger.exception("Object cache listener lost its Redis connection")
+                time.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def get_object_cache():
+    config = getattr(settings, "OBJECT_CACHE", {})
+    backend = import_string(config.get("BACKEND", "newsletter.core.cache.ObjectCache"))
+    return backend(**config.get("OPTIONS", {}))
+
+
+@contextmanager
+def bypass():
+    """
+    Computes every object in the block, e.g. to read all of them from one database snapshot.
+    """
+    previous = getattr(_state, "bypass", False)
+    _state.bypass = True
+    try:
+        yield
+    finally:
+        _state.bypass = previous
+
+
+def bypassed():
+    return getattr(_state, "bypass", False)
+
+
+def only_params(request, params):
+    """
+    ``(query string, request)``: a new ``GET`` request for the URL of ``request`` keeping only the
+    query parameters named in ``params``, which stays usable after ``request`` has finished.
+    """
+    query = urlencode([(name, value) for name in params for value in request.GET.getlist(name)])
+    # get_host() rejects hosts not in ALLOWED_HOSTS
+    host = request.get_host()
+    http_request = WSGIRequest({
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": request.META.get("SCRIPT_NAME", ""),
+        "PATH_INFO": request.path_info,
+        "QUERY_STRING": query,
+        "HTTP_HOST": host,
+        "SERVER_NAME": host.rsplit(":", 1)[0],
+        "SERVER_PORT": request.get_port(),
+        "wsgi.url_scheme": request.scheme,
+        "wsgi.input": io.BytesIO(),
+    })
+    return query, Request(
+        http_request, parsers=request.parsers, negotiator=request.negotiator,
+        parser_context=dict(request.parser_context),
+    )
+
+
+def cached_get(namespace=CONTENT, timeout=None, params=()):
+    """
+    Caches the 200 responses of an APIView's ``get`` per URL, with their body compressed once;
+    other responses are returned uncached. Only the query parameters in ``params`` reach the view
+    and the key, so other parameters (tracking tags, cache busters) neither add keys nor end up
+    in a cached body.
+    """
+
+    def decorator(get):
+        @functools.wraps(get)
+        def wrapper(view, request, *args, **kwargs):
+            # a request of its own, as a background refresh runs after this one has finished
+            query, request = only_params(request, params)
+
+            def build():
+                response = get(view, request, *args, **kwargs)
+                if response.status_code != 200:
+                    raise NotCached(response)
+                return response.status_code, response.data, precompress(ORJSONRenderer().render(response.data))
+
+            # the host too, for absolute pagination links
+            url = "%s://%s%s?%s" % (request.scheme, request.get_host(), request.path, query)
+            key = "%s.%s:%s" % (type(view).__module__, type(view).__name__, hashlib.sha1(url.encode()).hexdigest())
+            result = get_object_cache().get_or_set(namespace, key, build, timeout)
+            if isinstance(result, Response):
+                return result
+            status_code, data, compressed = result
+            return attach(Response(data, status=status_code), compressed)
+
+        return wrapper
+
+    return decorator
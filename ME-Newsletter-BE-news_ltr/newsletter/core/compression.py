@@ -0,0 +1,158 @@
+"""
+Brotli and gzip compression of responses.
+
+``CompressionMiddleware`` compresses bodies of compressible types above ``MIN_SIZE`` with the
+best encoding the client accepts; streaming responses are compressed chunk by chunk and flushed
+after each one, so server-sent events still arrive as they are sent. Views serving cached bytes
+attach a ``precompress()`` bundle, built once when the cache is filled, and the middleware sends
+the matching variant instead of compressing on every hit.
+
+Strong ETags become ``"<etag>-br"`` or ``"<etag>-gzip"`` and the suffix is removed from
+``If-None-Match`` before the view sees it, so conditional requests keep working.
+
+HTML is left alone: pages reflecting request input next to a secret (the admin's CSRF token) would
+let an attacker recover it from the compressed sizes (BREACH). So are partial responses, whose
+``Content-Range`` counts bytes of the uncompressed body.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import re
+import zlib
+from functools import lru_cache
+
+# django imports
+import brotli
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+ENCODINGS = ("br", "gzip")
+COMPRESSIBLE = re.compile(r"^(text/(?!html)|application/(json|xml|javascript|msgpack|[\w.+-]+\+(json|xml)))")
+ETAG_SUFFIX = re.compile(r'-(br|gzip)"')
+_QVALUE = re.compile(r"^\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*$")
+
+
+def options():
+    return {
+        "MIN_SIZE": 860,
+        "BROTLI_QUALITY": 4,
+        "GZIP_LEVEL": 6,
+        "PRECOMPRESS_BROTLI_QUALITY": 11,
+        **getattr(settings, "COMPRESSION", {}),
+    }
+
+
+@lru_cache(maxsize=256)
+def negotiate(accept_encoding):
+    """
+    ``"br"``, ``"gzip"`` or ``None`` for an ``Accept-Encoding`` header.
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        match = _QVALUE.match(part)
+        if match:
+            try:
+                accepted[match.group(1).lower()] = float(match.group(2) or 1)
+            except ValueError:
+                continue
+    for encoding in ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body, encoding, precompress=False):
+    config = options()
+    if encoding == "br":
+        quality = config["PRECOMPRESS_BROTLI_QUALITY"] if precompress else config["BROTLI_QUALITY"]
+        return brotli.compress(body, quality=quality)
+    compressor = zlib.compressobj(9 if precompress else config["GZIP_LEVEL"], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def precompress(body):
+    """
+    ``{"identity": body, "br": ..., "gzip": ...}`` to cache with a body; only ``identity`` for
+    bodies too small to be worth it.
+    """
+    bundle = {"identity": body}
+    if len(body) >= options()["MIN_SIZE"]:
+        for encoding in ENCODINGS:
+            bundle[encoding] = compress(body, encoding, precompress=True)
+    return bundle
+
+
+def attach(response, bundle):
+    response.precompressed = bundle
+    return response
+
+
+def _stream(chunks, encoding):
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=options()["BROTLI_QUALITY"])
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(options()["GZIP_LEVEL"], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH", "")
+        suffix = ETAG_SUFFIX.search(if_none_match)
+        if suffix:
+            request.META["HTTP_IF_NONE_MATCH"] = ETAG_SUFFIX.sub('"', if_none_match)
+        response = self.get_response(request)
+        if response.status_code == 304:
+            # same validator as the compressed response the client holds
+            if suffix and response.get("ETag", "").endswith('"'):
+                response["ETag"] = '%s-%s"' % (response["ETag"][:-1], suffix.group(1))
+            return response
+        return self.compress_response(request, response)
+
+    def compress_response(self, request, response):
+        if (
+            response.has_header("Content-Encoding")
+            or response.status_code == 206
+            or response.has_header("Content-Range")
+            or not COMPRESSIBLE.match(response.get("Content-Type", ""))
+            or "no-transform" in response.get("Cache-Control", "")
+        ):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = _stream(response.streaming_content, encoding)
+            del response["Content-Length"]
+        else:
+            bundle = getattr(response, "precompressed", None)
+            if bundle and encoding in bundle and bundle["identity"] == response.content:
+                compressed = bundle[encoding]
+            elif len(response.content) < options()["MIN_SIZE"]:
+                return response
+            else:
+                compressed = compress(response.content, encoding)
+                if len(compressed) >= len(response.content):
+                    return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.endswith('"') and not etag.startswith("W/"):
+            response["ETag"] = '%s-%s"' % (etag[:-1], encoding)
+        response["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,74 @@
+"""
+WSGI entry point sending anonymous public reads through a shorter middleware chain.
+
+Requests are routed before Django handles them: GET and HEAD requests to a view without
+authentication (a DRF view with empty ``authentication_classes``, or any view with
+``fast_lane = True``) go to a handler built without ``FAST_LANE["SKIP_MIDDLEWARE"]``; everything
+else, including unknown paths, goes to the regular handler. Both handlers are ordinary
+``WSGIHandler`` instances sharing the URLconf, so every middleware hook still applies in its lane.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import threading
+from functools import lru_cache
+
+# django imports
+import django
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.test.utils import override_settings
+from django.urls import Resolver404, resolve
+
+SAFE_METHODS = ("GET", "HEAD")
+
+# one override of settings.MIDDLEWARE at a time
+_loading = threading.Lock()
+
+
+def skipped_middleware():
+    return set(getattr(settings, "FAST_LANE", {}).get("SKIP_MIDDLEWARE", ()))
+
+
+class FastLaneHandler(WSGIHandler):
+    def middleware_paths(self):
+        skipped = skipped_middleware()
+        return [path for path in settings.MIDDLEWARE if path not in skipped]
+
+    def load_middleware(self, is_async=False):
+        """
+        Django's own loading over ``middleware_paths()``: ``settings.MIDDLEWARE`` is overridden
+        only while this handler loads, when the application is built and before any request.
+        """
+        with _loading, override_settings(MIDDLEWARE=self.middleware_paths()):
+            super().load_middleware(is_async)
+
+
+@lru_cache(maxsize=4096)
+def is_public(path):
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return False
+    view_class = getattr(match.func, "view_class", None)
+    if view_class is None:
+        return False
+    if hasattr(view_class, "fast_lane"):
+        return bool(view_class.fast_lane)
+    return getattr(view_class, "authentication_classes", None) is not None and not view_class.authentication_classes
+
+
+class FastLaneApplication:
+    def __init__(self):
+        self.handler = WSGIHandler()
+        self.fast_handler = FastLaneHandler()
+
+    def __call__(self, environ, start_response):
+        if environ.get("REQUEST_METHOD") in SAFE_METHODS and is_public(environ.get("PATH_INFO") or "/"):
+            return self.fast_handler(environ, start_response)
+        return self.handler(environ, start_response)
+
+
+def get_fast_lane_application():
+    django.setup(set_prefix=False)
+    return FastLaneApplication()
@@ -0,0 +1,130 @@
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import atexit
+import logging
+import queue
+import threading
+import time
+
+# django imports
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+logger = logging.getLogger(__name__)
+
+
+class EmailDispatcher:
+    """
+    Bounded queue of outgoing messages drained by a few daemon threads. Each thread takes up to
+    ``batch_size`` queued messages and sends them over one connection of ``backend``, retrying a
+    failed message with exponential backoff. When the queue is full the caller sends inline,
+    so a burst slows requests down instead of dropping mail.
+    """
+
+    def __init__(self, backend, workers=2, queue_size=1000, batch_size=50, retries=3, retry_delay=1.0):
+        self.backend = backend
+        self.workers = workers
+        self.batch_size = batch_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._run, name="email-dispatcher-%d" % number, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, message):
+        self._start()
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            logger.warning("Email queue is full, sending inline")
+            self.deliver([message])
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.deliver(batch)
+            finally:
+                for _message in batch:
+                    self.queue.task_done()
+
+    def deliver(self, messages):
+        connection = get_connection(self.backend, fail_silently=False)
+        try:
+            for message in messages:
+                self._send(connection, message)
+        finally:
+            connection.close()
+
+    def _send(self, connection, message):
+        # messages are sent one by one, so a failure never resends the ones already delivered
+        for attempt in range(self.retries + 1):
+            try:
+                connection.open()
+                connection.send_messages([message])
+                return
+            except Exception:
+                connection.close()
+                if attempt == self.retries:
+                    logger.exception("Giving up on email to %s", ", ".join(message.recipients()))
+                    return
+                time.sleep(self.retry_delay * 2 ** attempt)
+
+    def join(self, timeout=None):
+        """
+        Waits until every queued message has been handled, for at most ``timeout`` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            options = {key.lower(): value for key, value in getattr(settings, "ASYNC_EMAIL", {}).items()}
+            _dispatcher = EmailDispatcher(
+                getattr(settings, "ASYNC_EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend"),
+                **options
+            )
+            atexit.register(_dispatcher.join, timeout=getattr(settings, "EMAIL_TIMEOUT", None) or 10)
+        return _dispatcher
+
+
+class AsyncEmailBackend(BaseEmailBackend):
+    """
+    ``EMAIL_BACKEND`` that hands messages to the background dispatcher and returns at once;
+    ``ASYNC_EMAIL_BACKEND`` is the backend that actually delivers them.
+    """
+
+    def send_messages(self, email_messages):
+        if not email_messages:
+            return 0
+        dispatcher = get_dispatcher()
+        for message in email_messages:
+            dispatcher.submit(message)
+        return len(email_messages)
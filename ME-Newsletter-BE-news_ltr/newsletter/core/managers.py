@@ -1,6 +1,7 @@
 from __future__ import unicode_literals, absolute_import
 
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 
 
 class StatusMixinManager(models.Manager):
@@ -14,3 +15,21 @@ class StatusMixinManager(models.Manager):
 
     def active(self, *args, **kwargs):
         return super(StatusMixinManager, self).filter(is_active=True, is_deleted=False)
+
+
+class CounterManager(models.Manager):
+    """
+    Manager for rollup tables: ``increment`` adds to the counters of the row matching ``lookup``
+    with one UPDATE, creating the row the first time. ``values`` are stored as they are.
+    """
+    def increment(self, lookup, values=None, **deltas):
+        values = values or {}
+        changes = dict(values, **{field: F(field) + delta for field, delta in deltas.items()})
+        if self.filter(**lookup).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                self.create(**lookup, **values, **deltas)
+        except IntegrityError:
+            # another worker created the row in the meantime
+            self.filter(**lookup).update(**changes)
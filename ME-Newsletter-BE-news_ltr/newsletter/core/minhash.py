@@ -0,0 +1,81 @@
+"""
+MinHash signatures with LSH banding for near-duplicate text.
+
+A signature keeps, for each of ``PERMUTATIONS`` hash functions, the smallest hash over the
+text's word shingles; the share of equal positions of two signatures estimates the Jaccard
+similarity of their shingle sets. Signatures are cut into ``BANDS`` bands of ``ROWS`` rows and
+each band is hashed to a bucket: two texts share a bucket with high probability only when they
+are similar (above about ``(1 / BANDS) ** (1 / ROWS)``), so candidates come from bucket
+lookups instead of comparing against every other text.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import hashlib
+import re
+
+# third party imports
+import numpy as np
+
+PERMUTATIONS = 128
+BANDS = 32
+ROWS = PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+# fixed seed: signatures stored in the database must stay comparable across processes
+_random = np.random.RandomState(1)
+_A = _random.randint(1, (1 << 32) - 1, size=PERMUTATIONS, dtype=np.uint64)
+_B = _random.randint(0, (1 << 32) - 1, size=PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[position:position + size]) for position in range(len(words) - size + 1)}
+
+
+def _hash32(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+def signature(text):
+    """
+    ``PERMUTATIONS`` uint32 minimum hashes of the shingles of ``text``, or None when it has no words.
+    """
+    values = shingles(text)
+    if not values:
+        return None
+    hashes = np.fromiter((_hash32(value) for value in values), dtype=np.uint64, count=len(values))
+    # (a * x + b) mod p for every permutation and shingle at once; uint64 overflow is part of the hash
+    with np.errstate(over="ignore"):
+        permuted = ((np.outer(hashes, _A) + _B) % MERSENNE_PRIME) & MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def to_bytes(minhash):
+    return minhash.astype("<u4").tobytes()
+
+
+def from_bytes(value):
+    return np.frombuffer(bytes(value), dtype="<u4")
+
+
+def bands(minhash):
+    """
+    ``(band, bucket)`` pairs of a signature, buckets as signed 64-bit integers.
+    """
+    rows = to_bytes(minhash)
+    width = ROWS * 4
+    return [
+        (band, int.from_bytes(hashlib.blake2b(rows[band * width:(band + 1) * width], digest_size=8).digest(),
+                              "little", signed=True))
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first, second):
+    return float(np.count_nonzero(first == second)) / PERMUTATIONS
@@ -0,0 +1,108 @@
+"""
+orjson and MessagePack renderers and parsers for the API.
+
+``ORJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer`` (compact, UTF-8, with
+U+2028/U+2029 escaped), several times faster on large payloads. Values orjson does not encode the
+way DRF does, datetimes included, go through DRF's own encoder. Indented output, as the browsable
+API asks for, is left to ``JSONRenderer``, and so is data holding a float that orjson would write
+differently: NaN and infinities, which orjson turns into ``null`` where DRF refuses them, and
+those Python writes with an exponent (``1e+16`` rather than orjson's ``1e16``).
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import math
+
+import msgpack
+import orjson
+
+# django imports
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+_encoder = JSONEncoder()
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def encode_default(value):
+    return _encoder.default(value)
+
+
+def _orjson_float(value):
+    # repr() switches to an exponent below 1e-4 and from 1e16 on; orjson writes the rest alike
+    return math.isfinite(value) and (value == 0 or 1e-4 <= abs(value) < 1e16)
+
+
+def has_foreign_float(data):
+    """
+    Whether ``data`` holds a float that orjson does not write as ``json.dumps`` does.
+    """
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+        elif isinstance(value, float) and not _orjson_float(value):
+            return True
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None or has_foreign_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            rendered = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the standard library handles
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"\xe2\x80" in rendered:
+            rendered = rendered.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+        return rendered
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError("JSON parse error - %s" % exc)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Same data as the JSON responses, for clients sending ``Accept: application/msgpack``.
+    """
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError("MessagePack parse error - %s" % exc)
@@ -0,0 +1,187 @@
+"""
+Serializer base classes shared by the API apps.
+
+``ValuesListSerializer`` is the ``many=True`` serializer of the list serializers: given a
+queryset, it reads only the serialized columns with ``values_list()`` and builds each row with a
+function generated once per serializer class, instead of model instances walked field by field.
+The output is the same as ``ListSerializer``'s; serializers using other field types fall back to it.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import re
+from functools import lru_cache
+from operator import attrgetter
+
+# django imports
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.query import QuerySet
+from rest_framework import relations, serializers
+from rest_framework.settings import api_settings
+
+_DIRECTIVES = {
+    "d": ("day", "%02d"),
+    "m": ("month", "%02d"),
+    "Y": ("year", "%04d"),
+    "H": ("hour", "%02d"),
+    "M": ("minute", "%02d"),
+    "S": ("second", "%02d"),
+    "f": ("microsecond", "%06d"),
+}
+
+
+@lru_cache(maxsize=None)
+def compile_format(output_format):
+    """
+    ``(template, getter)`` doing ``strftime(output_format)`` with one ``%``, ``None`` when the
+    format uses directives other than ``%d %m %Y %H %M %S %f %%``.
+    """
+    template, fields = [], []
+    for literal, directive in re.findall(r"([^%]*)(?:%(.))?", output_format):
+        template.append(literal)
+        if not directive:
+            continue
+        if directive == "%":
+            template.append("%%")
+        elif directive in _DIRECTIVES:
+            field, spec = _DIRECTIVES[directive]
+            template.append(spec)
+            fields.append(field)
+        else:
+            return None
+    if not fields:
+        return None
+    return "".join(template), attrgetter(*fields)
+
+
+class DateTimeField(serializers.DateTimeField):
+    """
+    ``serializers.DateTimeField`` formatting ``DATETIME_FORMAT`` without ``strftime``.
+    """
+
+    def to_representation(self, value):
+        output_format = getattr(self, "format", api_settings.DATETIME_FORMAT)
+        compiled = compile_format(output_format) if output_format and not isinstance(value, str) else None
+        if not value or compiled is None:
+            return super().to_representation(value)
+        template, getter = compiled
+        return template % getter(self.enforce_timezone(value))
+
+
+class ModelSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.DateTimeField: DateTimeField,
+    }
+
+
+_COPIED = (
+    serializers.BooleanField, serializers.CharField, serializers.IntegerField, serializers.FloatField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+def _is_column(model, source):
+    try:
+        return model._meta.get_field(source).concrete
+    except FieldDoesNotExist:
+        return False
+
+
+def _file_url(field):
+    storage = field.parent.Meta.model._meta.get_field(field.source).storage
+    request = field.context.get("request")
+
+    def convert(name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+def _method(serializer, method_name, queryset):
+    method = getattr(serializer, method_name)
+    model, db = queryset.model, queryset.db
+    pk_name = model._meta.pk.attname
+
+    def convert(pk):
+        # deferred instance with only its primary key: enough for methods filtering on it
+        return method(model.from_db(db, [pk_name], [pk]))
+    return convert
+
+
+def compile_rows(serializer):
+    """
+    ``(columns, row, converters)`` for ``serializer``, ``None`` if one of its fields can't be read
+    from columns. ``row(values, converters)`` returns the serialized dict of one ``values_list`` tuple.
+    """
+    model = serializer.Meta.model
+    sources = getattr(serializer.Meta, "values_sources", {})
+    columns, items, specs = [], [], []
+
+    def index(column):
+        if column not in columns:
+            columns.append(column)
+        return columns.index(column)
+
+    for field in serializer._readable_fields:
+        name = field.field_name
+        if name in sources:
+            position, kind = index(sources[name]), None
+        elif isinstance(field, serializers.SerializerMethodField):
+            position, kind = index("pk"), ("method", field.method_name)
+        elif not _is_column(model, field.source):
+            return None
+        elif isinstance(field, serializers.FileField):
+            if not getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL):
+                return None
+            position, kind = index(field.source), ("file", name)
+        elif isinstance(field, serializers.DateTimeField):
+            position, kind = index(field.source), ("field", name)
+        elif isinstance(field, _COPIED):
+            position, kind = index(field.source), None
+        else:
+            return None
+        if kind is None:
+            items.append("%r: r[%d]" % (name, position))
+        else:
+            value = "c[%d](r[%d])" % (len(specs), position)
+            if kind[0] != "method":
+                value = "None if r[%d] is None else %s" % (position, value)
+            items.append("%r: %s" % (name, value))
+            specs.append(kind)
+
+    namespace = {}
+    exec("def row(r, c):\n    return {%s}\n" % ", ".join(items), namespace)
+    return columns, namespace["row"], specs
+
+
+_compiled = {}
+
+
+class ValuesListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        if isinstance(data, models.Manager):
+            data = data.all()
+        if not isinstance(data, QuerySet) or data._result_cache is not None:
+            return super().to_representation(data)
+
+        child = self.child
+        key = type(child)
+        if key not in _compiled:
+            _compiled[key] = compile_rows(child)
+        if _compiled[key] is None:
+            return super().to_representation(data)
+
+        columns, row, specs = _compiled[key]
+        converters = []
+        for kind, argument in specs:
+            if kind == "method":
+                converters.append(_method(child, argument, data))
+            elif kind == "file":
+                converters.append(_file_url(child.fields[argument]))
+            else:
+                converters.append(child.fields[argument].to_representation)
+        return [row(values, converters) for values in data.values_list(*columns)]
@@ -1,3 +1,412 @@
-from django.test import TestCase
+import decimal
+import gzip
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
 
-# Create your tests here.
+import brotli
+import msgpack
+import pytest
+import pytz
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend as LocMemBackend
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.fields import DateTimeField as StockDateTimeField
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import ListSerializer as StockListSerializer
+from rest_framework.test import APIRequestFactory
+
+from newsletter.core import compression
+from newsletter.core.cache import NotCached, ObjectCache, get_object_cache
+from newsletter.core.compression import CompressionMiddleware
+from newsletter.core.fastlane import FastLaneApplication, FastLaneHandler, is_public
+from newsletter.core.mail import EmailDispatcher
+from newsletter.core.renderers import ORJSONRenderer
+from newsletter.core.serializers import DateTimeField, ValuesListSerializer
+from newsletter.core.throttling import LocalCounter, RedisCounter, ScopedThrottle
+from newsletter.locations.models import Country, Region
+from newsletter.newsletterapp.api.v1.serializers import ListSerializer
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.api.v1.serializers import PracticalListSerializer
+from newsletter.updates.api.v1.serializers import UpdateListSerializer
+from newsletter.practicals.models import Practical
+from newsletter.updates.models import Update
+
+
+class FlakyBackend(LocMemBackend):
+    failures = 0
+
+    def send_messages(self, messages):
+        if FlakyBackend.failures:
+            FlakyBackend.failures -= 1
+            raise ConnectionError("provider unavailable")
+        return super().send_messages(messages)
+
+
+class TestEmailDispatcher:
+    def test_delivers_in_background(self):
+        dispatcher = EmailDispatcher("django.core.mail.backends.locmem.EmailBackend", workers=1)
+        for number in range(3):
+            dispatcher.submit(EmailMessage("Hello %d" % number, "Body", to=["a@example.com"]))
+        assert dispatcher.join(timeout=5)
+        assert sorted(message.subject for message in mail.outbox) == ["Hello 0", "Hello 1", "Hello 2"]
+
+    def test_retries_failed_messages(self):
+        FlakyBackend.failures = 2
+        dispatcher = EmailDispatcher("newsletter.core.tests.FlakyBackend", workers=1, retry_delay=0)
+        dispatcher.submit(EmailMessage("Hello", "Body", to=["a@example.com"]))
+        assert dispatcher.join(timeout=5)
+        assert len(mail.outbox) == 1
+
+    def test_full_queue_sends_inline(self):
+        dispatcher = EmailDispatcher("django.core.mail.backends.locmem.EmailBackend", workers=0, queue_size=1)
+        dispatcher.submit(EmailMessage("Queued", "Body", to=["a@example.com"]))
+        dispatcher.submit(EmailMessage("Inline", "Body", to=["a@example.com"]))
+        assert [message.subject for message in mail.outbox] == ["Inline"]
+
+
+@pytest.mark.django_db
+class TestBatch:
+    def test_detail_with_related_lists(self, client):
+        practical = Practical.objects.create(title="Visa rules")
+        Update.objects.create(title="Oil prices")
+        paths = ["practical-detail/%s/" % practical.slug, "/api/v1/update-recent-list/", "nowhere/"]
+        response = client.post("/api/v1/batch/", {"paths": paths}, content_type="application/json")
+        assert response.status_code == 200
+        results = response.json()["result"]
+        assert [result["path"] for result in results] == paths
+        assert [result["status"] for result in results] == [200, 200, 404]
+        assert results[0]["body"][0]["title"] == "Visa rules"
+        assert results[1]["body"] == client.get("/api/v1/update-recent-list/").json()
+
+    def test_get_and_bad_requests(self, client):
+        response = client.get("/api/v1/batch/", {"path": ["search/?q=", "batch/?path=home/"]})
+        assert [result["status"] for result in response.json()["result"]] == [400, 400]
+        # only views that opt in: no side effects on behalf of the caller
+        response = client.get("/api/v1/batch/", {"path": ["unsubscribe/abc/", "track/click/abc/", "subscribe/"]})
+        assert [result["status"] for result in response.json()["result"]] == [400, 400, 400]
+        assert client.get("/api/v1/batch/").status_code == 400
+        assert client.get("/api/v1/batch/", {"path": "https://example.com/"}).status_code == 400
+        assert client.get("/api/v1/batch/", {"path": ["home/"] * 21}).status_code == 400
+
+
+class TestRenderers:
+    def test_same_bytes_as_json_renderer(self):
+        data = {
+            "text": "caf\u00e9 \u2028 line",
+            "when": timezone.make_aware(datetime(2024, 5, 1, 12, 30, 15, 123456)),
+            "amount": decimal.Decimal("1.50"),
+            "uuid": uuid.UUID(int=1),
+            "label": gettext_lazy("Region"),
+            "nested": [{1: None, "ok": True, "float": 1.5}],
+            "big": 2 ** 70,
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+        assert ORJSONRenderer().render(data, "application/json; indent=2") == JSONRenderer().render(
+            data, "application/json; indent=2"
+        )
+        floats = {"floats": [0.0, -0.0, 1e-4, 1e-5, 2.5e-7, 0.1 + 0.2, 1e15, 1e16, -1.2345678901234568e17, 1e308]}
+        assert ORJSONRenderer().render(floats) == JSONRenderer().render(floats)
+        for value in (float("nan"), float("inf"), float("-inf")):
+            with pytest.raises(ValueError):
+                ORJSONRenderer().render({"nested": [{"value": value}]})
+
+    @pytest.mark.django_db
+    def test_content_negotiation(self, client):
+        Update.objects.create(title="Oil prices")
+        as_json = client.get("/api/v1/update-recent-list/")
+        as_msgpack = client.get("/api/v1/update-recent-list/", HTTP_ACCEPT="application/msgpack")
+        assert as_msgpack["Content-Type"] == "application/msgpack"
+        assert msgpack.unpackb(as_msgpack.content) == as_json.json()
+
+        response = client.post(
+            "/api/v1/batch/", msgpack.packb({"paths": ["update-recent-list/"]}), content_type="application/msgpack"
+        )
+        assert response.json()["result"][0]["body"] == as_json.json()
+
+    def test_datetime_field_matches_strftime(self, settings):
+        fast, stock = DateTimeField(), StockDateTimeField()
+        values = [
+            timezone.make_aware(datetime(2024, 2, 29, 23, 59, 59, 1)),
+            datetime(1999, 1, 2, 3, 4, 5),
+            pytz.timezone("Asia/Dubai").localize(datetime(2024, 1, 1, 2, 0)) + timedelta(minutes=1),
+        ]
+        for output_format in ("%d/%m/%Y %H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f 100%%", "%A %d", "iso-8601"):
+            settings.REST_FRAMEWORK = dict(settings.REST_FRAMEWORK, DATETIME_FORMAT=output_format)
+            for value in values:
+                assert fast.to_representation(value) == stock.to_representation(value)
+
+
+@pytest.mark.django_db
+def test_values_list_serializers_match_model_serializers(admin_user):
+    middle_east = Region.objects.get(code=Region.MIDDLE_EAST)
+    issue = NewsLetter.objects.create(title="Issue 1", image="newsletter/cover.png")
+    Update.objects.create(
+        title="Oil prices", content="<p>\u2028 caf\u00e9</p>", region=middle_east,
+        country=Country.objects.get(code="AE"), author=admin_user, newsletter=issue, image="updates/oil.jpg",
+    )
+    Update.objects.create(title="Elections", description=None, newsletter=issue)
+    Practical.objects.create(title="Visa rules", region=middle_east, newsletter=issue)
+    request = APIRequestFactory().get("/api/v1/update-list/")
+
+    for serializer_class, queryset in (
+        (UpdateListSerializer, Update.objects.active().order_by("-created")),
+        (PracticalListSerializer, Practical.objects.active()[:2]),
+        (ListSerializer, NewsLetter.objects.active()),
+    ):
+        for context in ({}, {"request": request}):
+            fast = serializer_class(queryset.all(), many=True, context=context)
+            assert isinstance(fast, ValuesListSerializer)
+            stock = StockListSerializer.to_representation(fast, list(queryset.all()))
+            assert ORJSONRenderer().render(fast.data) == ORJSONRenderer().render(stock)
+
+
+@pytest.mark.django_db
+class TestCompression:
+    def test_negotiates_encoding_and_size(self, client):
+        for number in range(5):
+            Update.objects.create(title="Update %d" % number, content="<p>%s</p>" % ("oil prices " * 100))
+        plain = client.get("/api/v1/update-recent-list/")
+        assert not plain.has_header("Content-Encoding") and "Accept-Encoding" in plain["Vary"]
+
+        as_br = client.get("/api/v1/update-recent-list/", HTTP_ACCEPT_ENCODING="gzip, deflate, br")
+        assert as_br["Content-Encoding"] == "br"
+        assert brotli.decompress(as_br.content) == plain.content
+        assert len(as_br.content) * 5 < len(plain.content)
+
+        as_gzip = client.get("/api/v1/update-recent-list/", HTTP_ACCEPT_ENCODING="br;q=0, gzip")
+        assert as_gzip["Content-Encoding"] == "gzip" and gzip.decompress(as_gzip.content) == plain.content
+
+        small = client.get("/api/v1/practical-recent-list/", HTTP_ACCEPT_ENCODING="br")
+        assert not small.has_header("Content-Encoding")
+
+    def test_cached_bodies_are_compressed_once(self, client, monkeypatch):
+        for number in range(4):
+            Update.objects.create(title="Update %d" % number, content="<p>%s</p>" % ("gas " * 200))
+        client.get("/api/v1/home/")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("compressed on a cache hit")
+        monkeypatch.setattr(compression, "compress", fail)
+        response = client.get("/api/v1/home/", HTTP_ACCEPT_ENCODING="br")
+        assert response["Content-Encoding"] == "br"
+        assert brotli.decompress(response.content) == client.get("/api/v1/home/").content
+
+    def test_strong_etags_keep_validating(self, client):
+        for number in range(10):
+            Update.objects.create(title="Update %d" % number, description="Fuel prices " * 20)
+        first = client.get("/api/v1/feeds/updates.rss", HTTP_ACCEPT_ENCODING="gzip")
+        assert first["Content-Encoding"] == "gzip" and first["ETag"].endswith('-gzip"')
+        again = client.get("/api/v1/feeds/updates.rss", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=first["ETag"])
+        assert again.status_code == 304 and again["ETag"] == first["ETag"]
+
+    def test_html_and_partial_responses_are_left_alone(self):
+        body = b"<p>%s</p>" % (b"csrf " * 500)
+
+        def html(request):
+            return HttpResponse(body, content_type="text/html; charset=utf-8")
+
+        def partial(request):
+            response = HttpResponse(body[:1000], status=206, content_type="application/json")
+            response["Content-Range"] = "bytes 0-999/%d" % len(body)
+            return response
+
+        for view in (html, partial):
+            response = CompressionMiddleware(view)(RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, br"))
+            assert not response.has_header("Content-Encoding") and response.content in (body, body[:1000])
+
+    def test_streams_are_flushed_per_chunk(self):
+        def view(request):
+            return StreamingHttpResponse(iter([b"data: 1\n\n", b"data: 2\n\n"]), content_type="text/event-stream")
+
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = CompressionMiddleware(view)(request)
+        assert response["Content-Encoding"] == "gzip"
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = iter(response.streaming_content)
+        assert decompressor.decompress(next(chunks)) == b"data: 1\n\n"
+        assert decompressor.decompress(next(chunks)) == b"data: 2\n\n"
+
+
+@pytest.mark.django_db
+class TestFastLane:
+    @pytest.fixture
+    def application(self):
+        # like the test client: keep the test's connection open between requests
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        yield FastLaneApplication()
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+
+    def call(self, handler, method, path):
+        environ = RequestFactory().generic(method, path).environ
+        started = []
+        body = b"".join(handler(environ, lambda status, headers: started.append((status, dict(headers)))))
+        return started[0][0], started[0][1], body
+
+    def test_routes_public_reads(self):
+        assert is_public("/api/v1/update-recent-list/")
+        assert is_public("/api/v1/feeds/updates.rss")
+        assert not is_public("/api/users/me/")
+        assert not is_public("/admin/")
+        assert not is_public("/api/v1/missing/")
+
+    def test_public_reads_skip_middleware(self, application):
+        Update.objects.create(title="Oil prices")
+        status, headers, body = self.call(application, "GET", "/api/v1/update-recent-list/")
+        assert status.startswith("200") and b"Oil prices" in body
+        # LocaleMiddleware adds Accept-Language to Vary on every response it sees
+        assert "Accept-Language" not in headers.get("Vary", "")
+        _status, headers, regular = self.call(application.handler, "GET", "/api/v1/update-recent-list/")
+        assert "Accept-Language" in headers["Vary"] and regular == body
+
+        status, headers, _body = self.call(application, "GET", "/admin/login/")
+        assert status.startswith("200") and "Accept-Language" in headers["Vary"]
+
+    def test_building_the_chain_restores_settings(self):
+        middleware = list(settings.MIDDLEWARE)
+        handler = FastLaneHandler()
+        assert settings.MIDDLEWARE == middleware
+        assert "django.contrib.sessions.middleware.SessionMiddleware" not in handler.middleware_paths()
+
+
+class TestThrottling:
+    def test_sliding_window_counts(self):
+        counter = LocalCounter()
+        assert [counter.hit("ip", 3, 60, now=600)[0] for _ in range(4)] == [True, True, True, False]
+        assert counter.hit("ip", 3, 60, now=630) == (False, 30)
+        # half of the previous window still counts: 1.5 requests of 3
+        assert [counter.hit("ip", 3, 60, now=690)[0] for _ in range(3)] == [True, True, False]
+        assert counter.hit("ip", 3, 60, now=690) == (False, pytest.approx(10))
+        assert counter.hit("ip", 3, 60, now=701)[0]
+        assert counter.hit("other", 3, 60, now=700)[0]
+
+    def test_expired_counters_are_dropped(self):
+        counter = LocalCounter()
+        for number in range(100):
+            counter.hit("client-%d" % number, 3, 60, now=600)
+        counter.hit("hourly", 3, 3600, now=600)
+        counter.hit("client-0", 3, 60, now=800)
+        assert sorted(counter._windows) == ["client-0", "hourly"]
+
+    def test_unreachable_redis_counts_locally(self):
+        counter = RedisCounter("redis://localhost:1/0")
+        assert [counter.hit("ip", 1, 60, now=600)[0] for _ in range(2)] == [True, False]
+
+    @pytest.mark.django_db
+    def test_subscribe_has_its_own_rate(self, client, monkeypatch):
+        monkeypatch.setitem(ScopedThrottle.THROTTLE_RATES, "subscribe", "2/hour")
+        for index in range(2):
+            response = client.post("/api/v1/subscribe/", {"email": "%d@example.com" % index, "region": "MiddleEast"})
+            assert response.status_code == 201
+        response = client.post("/api/v1/subscribe/", {"email": "2@example.com", "region": "MiddleEast"})
+        assert response.status_code == 429
+        assert 0 < int(response["Retry-After"]) <= 3600
+        assert client.get("/api/v1/update-recent-list/").status_code == 200
+
+
+class Counted:
+    def __init__(self, delay=0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self):
+        time.sleep(self.delay)
+        self.calls += 1
+        return self.calls
+
+
+class TestObjectCache:
+    def test_local_tier_and_invalidation(self):
+        objects, compute = ObjectCache(), Counted()
+        assert objects.get_or_set("posts", "recent", compute) == 1
+        cache.clear()
+        assert objects.get_or_set("posts", "recent", compute) == 1
+        objects.invalidate("posts")
+        assert objects.get_or_set("posts", "recent", compute) == 2
+
+    def test_workers_share_entries_and_versions(self):
+        first, second, compute = ObjectCache(version_ttl=60), ObjectCache(version_ttl=60), Counted()
+        assert first.get_or_set("posts", "recent", compute) == 1
+        assert second.get_or_set("posts", "recent", compute) == 1
+        first.invalidate("posts")
+        assert second.get_or_set("posts", "recent", compute) == 1
+        # what RedisObjectCache's listener does with the announcement
+        second.receive("posts", first.version("posts"))
+        assert second.get_or_set("posts", "recent", compute) == 2
+
+    def test_missing_key_is_computed_once(self):
+        objects, compute = ObjectCache(), Counted(delay=0.1)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(objects.get_or_set("posts", "recent", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == [1] * 5 and compute.calls == 1
+
+    def test_stale_entries_are_served_while_revalidating(self):
+        objects, compute = ObjectCache(timeout=0, stale=60), Counted(delay=0.05)
+        assert objects.get_or_set("posts", "recent", compute) == 1
+        assert objects.get_or_set("posts", "recent", compute) == 1
+        deadline = time.monotonic() + 5
+        while compute.calls < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        assert objects.get_or_set("posts", "recent", compute) == 2
+
+    def test_values_raised_as_not_cached_are_returned_uncached(self):
+        objects, calls = ObjectCache(), []
+
+        def compute():
+            calls.append(1)
+            raise NotCached(len(calls))
+        assert objects.get_or_set("posts", "missing", compute) == 1
+        assert objects.get_or_set("posts", "missing", compute) == 2
+
+    @pytest.mark.django_db
+    def test_error_responses_are_not_cached(self, client):
+        entries = len(get_object_cache().local)
+        assert client.get("/api/v1/update-list/", {"region": "middle-east", "page": 1}).status_code == 400
+        assert len(get_object_cache().local) == entries
+
+    @pytest.mark.django_db
+    def test_content_views_are_cached(self, client, django_capture_on_commit_callbacks):
+        update = Update.objects.create(title="Oil prices")
+        assert client.get("/api/v1/update-recent-list/").json()["result"][0]["title"] == "Oil prices"
+        with CaptureQueriesContext(connection) as context:
+            assert client.get("/api/v1/update-recent-list/").json()["result"][0]["title"] == "Oil prices"
+        assert not [query for query in context.captured_queries if query["sql"].startswith("SELECT")]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            update.title = "Gas prices"
+            update.save()
+        assert client.get("/api/v1/update-recent-list/").json()["result"][0]["title"] == "Gas prices"
+
+    @pytest.mark.django_db
+    def test_cache_keys_ignore_unused_params(self, client):
+        for number in range(11):
+            Practical.objects.create(title="Practical %d" % number)
+        first = client.get("/api/v1/practical-list/", {"page": 1})
+        assert "page=2" in first.json()["next"]
+        entries = len(get_object_cache().local)
+        tagged = client.get("/api/v1/practical-list/", {"page": 1, "utm_source": "mail", "_": "123"})
+        assert tagged.content == first.content and len(get_object_cache().local) == entries
+        assert client.get("/api/v1/practical-list/", {"page": 2}).json()["previous"]
+        assert client.get("/api/v1/practical-list/", HTTP_HOST="evil.example").status_code == 400
@@ -0,0 +1,157 @@
+"""
+DRF throttles counting requests with an approximate sliding window: the count of the current
+fixed window plus the previous window's count weighted by how much of it the sliding window
+still covers. That takes two counters per client and scope, whatever the rate, instead of the
+list of timestamps DRF's throttles read and rewrite through the cache on every request.
+
+``RedisCounter`` checks and increments both counters in one Lua script, so all workers share
+exact counts; while Redis is unreachable it falls back to the in-process ``LocalCounter``, which
+is also the counter of local and test settings.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import logging
+import math
+import threading
+import time
+from functools import lru_cache
+
+# django imports
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.throttling import AnonRateThrottle, ScopedRateThrottle, SimpleRateThrottle, UserRateThrottle
+
+logger = logging.getLogger(__name__)
+
+
+def sliding_window(previous, current, limit, window, elapsed):
+    """
+    ``(allowed, wait)`` for one more request, ``elapsed`` seconds into the current window.
+    """
+    weight = (window - elapsed) / window
+    if previous * weight + current < limit:
+        return True, 0
+    if current >= limit or not previous:
+        return False, window - elapsed
+    # the previous window's share drops below the remaining room after this long
+    return False, max(window * (1 - (limit - current) / previous) - elapsed, 0)
+
+
+class LocalCounter:
+    """
+    Counters of clients whose windows have both passed count as zero; they are dropped every
+    ``sweep_interval`` seconds, so one-off clients don't accumulate.
+    """
+
+    def __init__(self, sweep_interval=60):
+        self.sweep_interval = sweep_interval
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._swept = 0.0
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        index = int(now // window)
+        with self._lock:
+            if now - self._swept >= self.sweep_interval:
+                self._sweep(now)
+            start, previous, current, _window = self._windows.get(key, (index, 0, 0, window))
+            if start != index:
+                previous, current = (current if start == index - 1 else 0), 0
+            allowed, wait = sliding_window(previous, current, limit, window, now - index * window)
+            if allowed:
+                current += 1
+            self._windows[key] = (index, previous, current, window)
+        return allowed, wait
+
+    def _sweep(self, now):
+        self._windows = {
+            key: entry for key, entry in self._windows.items() if entry[0] >= int(now // entry[3]) - 1
+        }
+        self._swept = now
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+
+class RedisCounter:
+    SCRIPT = """
+local previous = tonumber(redis.call('GET', KEYS[1]) or '0')
+local current = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit, window, elapsed = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+if previous * (window - elapsed) / window + current < limit then
+    redis.call('INCR', KEYS[2])
+    redis.call('PEXPIRE', KEYS[2], math.ceil(window * 2000))
+    return {1, '0'}
+end
+if current >= limit or previous == 0 then
+    return {0, tostring(window - elapsed)}
+end
+return {0, tostring(math.max(window * (1 - (limit - current) / previous) - elapsed, 0))}
+"""
+
+    def __init__(self, url, prefix="throttle", socket_timeout=0.1):
+        import redis
+
+        self.client = redis.Redis.from_url(url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout)
+        self.script = self.client.register_script(self.SCRIPT)
+        self.prefix = prefix
+        self.fallback = LocalCounter()
+
+    def hit(self, key, limit, window, now=None):
+        import redis
+
+        now = time.time() if now is None else now
+        index = int(now // window)
+        keys = ["%s:%s:%d" % (self.prefix, key, index - 1), "%s:%s:%d" % (self.prefix, key, index)]
+        try:
+            allowed, wait = self.script(keys=keys, args=[limit, window, now - index * window])
+        except redis.RedisError:
+            logger.warning("Throttle counters unavailable, counting in this process", exc_info=True)
+            return self.fallback.hit(key, limit, window, now)
+        return bool(allowed), float(wait)
+
+
+@lru_cache(maxsize=None)
+def get_counter():
+    config = getattr(settings, "THROTTLE_COUNTER", {})
+    backend = import_string(config.get("BACKEND", "newsletter.core.throttling.LocalCounter"))
+    return backend(**config.get("OPTIONS", {}))
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self._wait = get_counter().hit(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return math.ceil(self._wait) if self._wait else None
+
+
+class AnonThrottle(SlidingWindowRateThrottle, AnonRateThrottle):
+    pass
+
+
+class UserThrottle(SlidingWindowRateThrottle, UserRateThrottle):
+    pass
+
+
+class ScopedThrottle(SlidingWindowRateThrottle, ScopedRateThrottle):
+    """
+    Limits views with a ``throttle_scope`` to ``DEFAULT_THROTTLE_RATES[scope]``, per user or IP.
+    """
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
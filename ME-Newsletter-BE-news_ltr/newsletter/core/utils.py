@@ -1,12 +1,17 @@
 from __future__ import unicode_literals, absolute_import
 
 # python imports
+import html
+import re
 from random import choice
 from string import digits, ascii_lowercase
 
 # django imports
+from django.utils.html import strip_tags
 from django.utils.text import slugify
 
+WHITESPACE_RE = re.compile(r"\s+")
+
 
 def upload_location(instance, filename):
     model = str(instance.__class__.__name__).lower()
@@ -52,4 +57,13 @@ def create_slug(instance, new_slug=None, append_string=None):
             slug = generate_random_string(length=5)
         return slug
     else:
-        return None
\ No newline at end of file
+        return None
+
+
+def html_to_text(value):
+    """
+    Plain text of rich-text (CKEditor) HTML, with entities decoded and whitespace collapsed.
+    """
+    if not value:
+        return ""
+    return WHITESPACE_RE.sub(" ", html.unescape(strip_tags(value))).strip()
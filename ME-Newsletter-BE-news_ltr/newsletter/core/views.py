@@ -1,12 +1,18 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework import status
-from django.db import connections
+from django.db import connections, transaction
 from django.db.utils import OperationalError
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
 import os
 
+from newsletter.core.batch import MAX_REQUESTS, BatchError, run_batch
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
@@ -74,4 +80,38 @@ def api_status(request):
         "version": "v1",
         "documentation": "/api/docs/",
         "timestamp": timezone.now().isoformat()
-    })
\ No newline at end of file
+    })
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class BatchView(APIView):
+    """
+    Several ``api/v1/`` GET requests in one round trip, answered from one database snapshot.
+    The paths come as repeated ``path`` query parameters or as ``{"paths": [...]}`` in a POST body.
+    """
+    authentication_classes = ()
+    permission_classes = ()
+
+    @extend_schema(
+        summary="Batch of GET requests",
+        description="Responses of up to %d api/v1/ paths, in order, as `{path, status, body}`" % MAX_REQUESTS,
+        parameters=[OpenApiParameter("path", OpenApiTypes.STR, required=True, description="Repeat once per path")],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        return self.batch(request, request.GET.getlist("path"))
+
+    @extend_schema(
+        summary="Batch of GET requests",
+        request=OpenApiTypes.OBJECT,
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+    )
+    def post(self, request):
+        return self.batch(request, request.data.get("paths") if isinstance(request.data, dict) else None)
+
+    def batch(self, request, paths):
+        try:
+            results = run_batch(request, paths)
+        except BatchError as error:
+            return Response({"result": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"result": results}, status=status.HTTP_200_OK)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class FeedsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'newsletter.feeds'
+
+    def ready(self):
+        import newsletter.feeds.signals  # noqa F401
@@ -0,0 +1,175 @@
+"""
+RSS 2.0, Atom and JSON Feed documents of newsletters, updates (optionally of one region) and
+practicals.
+
+A document is rendered and compressed once, then cached with its strong ETag until content
+changes: the signals replace ``VERSION_KEY``, which is part of every document key, so all feeds are
+invalidated with one write and rebuilt on their next request. ``VERSION_KEY`` also holds the time
+of that change, the ``Last-Modified`` of every feed: unlike the newest item's ``modified``, it
+never goes back when that item is removed.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import hashlib
+import json
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime
+
+# django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.text import Truncator
+
+from newsletter.core.compression import precompress
+from newsletter.core.utils import html_to_text
+from newsletter.locations.models import Region
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.models import Practical
+from newsletter.updates.models import Update
+
+# (version, time of the change it was set for)
+VERSION_KEY = "feeds:state"
+TIMEOUT = 60 * 60 * 24
+
+# kind -> (model, title, path of the items on the site)
+FEEDS = {
+    "newsletters": (NewsLetter, "Newsletters", "newsletters"),
+    "updates": (Update, "Updates", "updates"),
+    "practicals": (Practical, "Practicals", "practicals"),
+}
+FORMATS = {
+    "rss": (Rss201rev2Feed, "application/rss+xml; charset=utf-8"),
+    "atom": (Atom1Feed, "application/atom+xml; charset=utf-8"),
+    "json": (None, "application/feed+json; charset=utf-8"),
+}
+
+Document = namedtuple("Document", ["body", "etag", "last_modified", "content_type", "compressed"])
+
+
+def site_url(path=""):
+    return "%s/%s" % (settings.FEEDS["SITE_URL"].rstrip("/"), path)
+
+
+def feed_items(kind, region=None):
+    model = FEEDS[kind][0]
+    queryset = model.objects.active().select_related("region").order_by("-publish", "-id")
+    if region is not None:
+        queryset = queryset.filter(region=region)
+    return list(queryset[:settings.FEEDS["ITEMS"]])
+
+
+def summary(post):
+    return post.description or Truncator(html_to_text(post.content)).words(60)
+
+
+def render_xml(generator, kind, region, items, self_url):
+    model, title, path = FEEDS[kind]
+    feed = generator(
+        title="%s%s" % (title, " - %s" % region.name if region else ""),
+        link=site_url(path + "/"),
+        description="Latest %s" % title.lower(),
+        language=settings.LANGUAGE_CODE,
+        feed_url=self_url,
+    )
+    for post in items:
+        feed.add_item(
+            title=post.title,
+            link=site_url("%s/%s/" % (path, post.slug)),
+            unique_id=site_url("%s/%s/" % (path, post.slug)),
+            unique_id_is_permalink=True,
+            description=summary(post),
+            pubdate=post.publish,
+            updateddate=post.modified,
+            categories=[post.region.name] if post.region_id else None,
+        )
+    return feed.writeString("utf-8").encode()
+
+
+def render_json(kind, region, items, self_url):
+    model, title, path = FEEDS[kind]
+    document = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": "%s%s" % (title, " - %s" % region.name if region else ""),
+        "home_page_url": site_url(path + "/"),
+        "feed_url": self_url,
+        "language": settings.LANGUAGE_CODE,
+        "items": [
+            {
+                "id": site_url("%s/%s/" % (path, post.slug)),
+                "url": site_url("%s/%s/" % (path, post.slug)),
+                "title": post.title,
+                "summary": summary(post),
+                "content_html": post.content or "",
+                "date_published": post.publish.isoformat(),
+                "date_modified": post.modified.isoformat(),
+                "tags": [post.region.name] if post.region_id else [],
+            }
+            for post in items
+        ],
+    }
+    return json.dumps(document, ensure_ascii=False).encode()
+
+
+def build_feed(kind, fmt, region=None, self_url="", last_modified=None):
+    generator, content_type = FORMATS[fmt]
+    items = feed_items(kind, region)
+    if generator is None:
+        body = render_json(kind, region, items, self_url)
+    else:
+        body = render_xml(generator, kind, region, items, self_url)
+    return Document(
+        body=body,
+        etag='"%s"' % hashlib.sha1(body).hexdigest(),
+        last_modified=last_modified,
+        content_type=content_type,
+        compressed=precompress(body),
+    )
+
+
+def current_state():
+    """
+    ``(version, changed)`` of the content, ``changed`` in seconds since the epoch.
+    """
+    state = cache.get(VERSION_KEY)
+    if state is None:
+        state = (uuid.uuid4().hex, int(time.time()))
+        if not cache.add(VERSION_KEY, state, None):
+            state = cache.get(VERSION_KEY, state)
+    return tuple(state)
+
+
+def current_version():
+    return current_state()[0]
+
+
+def get_feed(kind, fmt, region_id=None, self_url=""):
+    """
+    ``None`` if the region is gone.
+    """
+    version, changed = current_state()
+    key = "feeds:%s:%s:%s:%s:%s" % (
+        version, kind, fmt, region_id or "", hashlib.sha1(self_url.encode()).hexdigest()
+    )
+    document = cache.get(key)
+    if document is None:
+        region = None
+        if region_id is not None:
+            region = Region.objects.filter(pk=region_id).first()
+            if region is None:
+                return None
+        last_modified = datetime.fromtimestamp(changed, timezone.utc)
+        document = build_feed(kind, fmt, region, self_url, last_modified=last_modified)
+        cache.set(key, tuple(document), TIMEOUT)
+    return Document(*document)
+
+
+def invalidate_feeds():
+    # a second later at least: Last-Modified has whole seconds, and If-Modified-Since must see the change
+    previous = cache.get(VERSION_KEY)
+    changed = int(time.time()) if previous is None else max(int(time.time()), previous[1] + 1)
+    cache.set(VERSION_KEY, (uuid.uuid4().hex, changed), None)
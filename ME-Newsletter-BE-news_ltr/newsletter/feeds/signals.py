@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from newsletter.feeds.feeds import invalidate_feeds
+from newsletter.locations.models import Region
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.models import Practical
+from newsletter.updates.models import Update
+
+
+def invalidate_feeds_on_change(sender, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(invalidate_feeds)
+
+
+# regions too: their names are the feed titles and item categories
+for model in (NewsLetter, Update, Practical, Region):
+    post_save.connect(invalidate_feeds_on_change, sender=model, dispatch_uid="feeds-save-%s" % model.__name__)
+    post_delete.connect(invalidate_feeds_on_change, sender=model, dispatch_uid="feeds-delete-%s" % model.__name__)
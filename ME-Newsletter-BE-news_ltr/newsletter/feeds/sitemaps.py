@@ -0,0 +1,166 @@
+"""
+Sitemap index of newsletters, updates and practicals, split into one segment per model and
+publish year (and into pages of ``PAGE_SIZE`` URLs within a busy year).
+
+The index comes from one grouped query per model, plus one per page of the years with more than
+``PAGE_SIZE`` URLs, and is cached like the feeds until the next content change. A segment is
+produced by keyset iteration over ``CHUNK_SIZE`` rows at a time, gzipped as it is written, and
+cached under its signature (its first id, URL count and newest ``modified``), so a change only
+rebuilds the segments it touched.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import hashlib
+import zlib
+from collections import namedtuple
+from datetime import datetime
+
+# django imports
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+from django.utils.html import escape
+
+from newsletter.feeds.feeds import FEEDS, TIMEOUT, current_version, site_url
+
+PAGE_SIZE = 50000
+CHUNK_SIZE = 2000
+
+# after: the id before the first one of the segment
+Segment = namedtuple("Segment", ["kind", "year", "page", "count", "lastmod", "after"])
+
+URLSET_OPEN = '<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = "</urlset>\n"
+
+
+def segment_name(segment):
+    name = "%s-%d" % (segment.kind, segment.year)
+    return name if segment.page == 0 else "%s-%d" % (name, segment.page + 1)
+
+
+def signature(segment):
+    return hashlib.sha1(("%s:%d:%d:%d:%d:%s" % (
+        segment.kind, segment.year, segment.page, segment.after, segment.count, segment.lastmod.isoformat()
+    )).encode()).hexdigest()
+
+
+def published_in(kind, year):
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime(year, 1, 1), tz)
+    end = timezone.make_aware(datetime(year + 1, 1, 1), tz)
+    return FEEDS[kind][0].objects.active().filter(publish__gte=start, publish__lt=end).order_by("id")
+
+
+def build_segments():
+    segments = []
+    for kind in sorted(FEEDS):
+        rows = (
+            FEEDS[kind][0].objects.active()
+            .annotate(year=ExtractYear("publish"))
+            .values("year")
+            .annotate(count=Count("id"), lastmod=Max("modified"))
+            .order_by("year")
+        )
+        for row in rows:
+            if row["count"] <= PAGE_SIZE:
+                segments.append(Segment(kind, row["year"], 0, row["count"], row["lastmod"], 0))
+                continue
+            # per page, so a change in one page leaves the signatures of the others alone
+            queryset, after = published_in(kind, row["year"]), 0
+            for page in range((row["count"] + PAGE_SIZE - 1) // PAGE_SIZE):
+                stats = queryset.filter(id__gt=after)[:PAGE_SIZE].aggregate(
+                    count=Count("id"), lastmod=Max("modified"), last=Max("id")
+                )
+                if not stats["count"]:
+                    break
+                segments.append(Segment(kind, row["year"], page, stats["count"], stats["lastmod"], after))
+                after = stats["last"]
+    return segments
+
+
+def get_segments():
+    key = "sitemaps:%s:index" % current_version()
+    segments = cache.get(key)
+    if segments is None:
+        segments = build_segments()
+        cache.set(key, [tuple(segment) for segment in segments], TIMEOUT)
+    return [Segment(*segment) for segment in segments]
+
+
+def find_segment(name):
+    for segment in get_segments():
+        if segment_name(segment) == name:
+            return segment
+    return None
+
+
+def _w3c(value):
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def render_index(segments, location):
+    """
+    ``location(name)`` is the absolute URL of a segment.
+    """
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    ]
+    for segment in segments:
+        parts.append("<sitemap><loc>%s</loc><lastmod>%s</lastmod></sitemap>\n" % (
+            escape(location(segment_name(segment))), _w3c(segment.lastmod)
+        ))
+    parts.append("</sitemapindex>\n")
+    return "".join(parts).encode()
+
+
+def iter_urls(segment):
+    """
+    ``(slug, modified)`` of a segment, fetched by id in chunks instead of with one queryset.
+    """
+    queryset = published_in(segment.kind, segment.year)
+    last_id = segment.after
+    remaining = segment.count
+    while remaining > 0:
+        rows = list(queryset.filter(id__gt=last_id).values_list("id", "slug", "modified")[:min(CHUNK_SIZE, remaining)])
+        if not rows:
+            break
+        for _id, slug, modified in rows:
+            yield slug, modified
+        last_id = rows[-1][0]
+        remaining -= len(rows)
+
+
+def render_segment(segment):
+    """
+    Gzipped sitemap of the segment, compressed chunk by chunk as the rows arrive.
+    """
+    path = FEEDS[segment.kind][2]
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    parts = [compressor.compress(URLSET_OPEN.encode())]
+    chunk = []
+    for slug, modified in iter_urls(segment):
+        chunk.append("<url><loc>%s</loc><lastmod>%s</lastmod></url>\n" % (
+            escape(site_url("%s/%s/" % (path, slug))), _w3c(modified)
+        ))
+        if len(chunk) == CHUNK_SIZE:
+            parts.append(compressor.compress("".join(chunk).encode()))
+            chunk = []
+    parts.append(compressor.compress(("".join(chunk) + URLSET_CLOSE).encode()))
+    parts.append(compressor.flush())
+    return b"".join(parts)
+
+
+def get_segment_body(segment):
+    """
+    ``(etag, gzipped body)``; unchanged segments come from the cache.
+    """
+    etag = signature(segment)
+    key = "sitemaps:segment:%s" % etag
+    body = cache.get(key)
+    if body is None:
+        body = render_segment(segment)
+        cache.set(key, body, TIMEOUT)
+    return '"%s"' % etag, body
@@ -0,0 +1,144 @@
+import gzip
+from datetime import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import parse_http_date
+
+from newsletter.feeds import sitemaps
+
+from newsletter.locations.models import Region
+from newsletter.practicals.models import Practical
+from newsletter.updates.models import Update
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_feed_formats(client):
+    Practical.objects.create(title="Visa rules", slug="visa-rules", description="How to apply")
+    Practical.objects.create(title="Hidden", is_active=False)
+
+    rss = client.get("/api/v1/feeds/practicals.rss")
+    assert rss.status_code == 200
+    assert rss["Content-Type"].startswith("application/rss+xml")
+    assert b"<title>Visa rules</title>" in rss.content and b"Hidden" not in rss.content
+    assert b"/practicals/visa-rules/" in rss.content
+
+    assert client.get("/api/v1/feeds/practicals.atom")["Content-Type"].startswith("application/atom+xml")
+    items = client.get("/api/v1/feeds/practicals.json").json()["items"]
+    assert [(item["title"], item["summary"]) for item in items] == [("Visa rules", "How to apply")]
+
+    assert client.get("/api/v1/feeds/users.rss").status_code == 404
+    assert client.get("/api/v1/feeds/practicals.pdf").status_code == 404
+
+
+def test_region_feed(client):
+    middle_east = Region.objects.get(code=Region.MIDDLE_EAST)
+    Update.objects.create(title="Oil prices", region=middle_east)
+    Update.objects.create(title="Elections abroad", region=Region.objects.get(code=Region.AROUND_THE_WORLD))
+
+    items = client.get("/api/v1/feeds/updates/middle-east.json").json()["items"]
+    assert [(item["title"], item["tags"]) for item in items] == [("Oil prices", ["MiddleEast"])]
+    assert client.get("/api/v1/feeds/updates/atlantis.rss").status_code == 404
+
+
+def test_conditional_requests_and_invalidation(client, django_capture_on_commit_callbacks):
+    update = Update.objects.create(title="Oil prices")
+    first = client.get("/api/v1/feeds/updates.rss")
+    assert first["ETag"].startswith('"') and first.has_header("Last-Modified")
+
+    with CaptureQueriesContext(connection) as context:
+        assert client.get("/api/v1/feeds/updates.rss", HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+    assert not [query for query in context.captured_queries if query["sql"].startswith("SELECT")]
+    not_modified = client.get("/api/v1/feeds/updates.rss", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert not_modified.status_code == 304
+
+    with django_capture_on_commit_callbacks(execute=True):
+        update.title = "Gas prices"
+        update.save()
+    second = client.get("/api/v1/feeds/updates.rss", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert second.status_code == 200
+    assert second["ETag"] != first["ETag"] and b"Gas prices" in second.content
+
+
+def test_last_modified_never_goes_back(client, django_capture_on_commit_callbacks):
+    Update.objects.create(title="Oil prices")
+    newest = Update.objects.create(title="Gas prices")
+    first = client.get("/api/v1/feeds/updates.rss")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        newest.remove()
+    second = client.get("/api/v1/feeds/updates.rss", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+    assert second.status_code == 200 and b"Gas prices" not in second.content
+    assert parse_http_date(second["Last-Modified"]) >= parse_http_date(first["Last-Modified"])
+
+
+def test_cached_region_feed_needs_no_query(client):
+    client.get("/api/v1/feeds/updates/middle-east.json")
+    with CaptureQueriesContext(connection) as context:
+        assert client.get("/api/v1/feeds/updates/middle-east.json").status_code == 200
+    assert not [query for query in context.captured_queries if query["sql"].startswith("SELECT")]
+
+
+def published(year):
+    return timezone.make_aware(datetime(year, 6, 1))
+
+
+def test_sitemap_segments(client, monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr(sitemaps, "PAGE_SIZE", 2)
+    monkeypatch.setattr(sitemaps, "CHUNK_SIZE", 1)
+    for number in range(3):
+        Update.objects.create(title="Old %d" % number, slug="old-%d" % number, publish=published(2021))
+    recent = Update.objects.create(title="New", slug="new", publish=published(2022))
+    Practical.objects.create(title="Visa rules", slug="visa-rules", publish=published(2022))
+
+    index = client.get("/api/v1/sitemap.xml").content.decode()
+    for name in ("practicals-2022", "updates-2021", "updates-2021-2", "updates-2022"):
+        assert "/api/v1/sitemaps/%s.xml</loc>" % name in index
+
+    response = client.get("/api/v1/sitemaps/updates-2021.xml", HTTP_ACCEPT_ENCODING="gzip")
+    assert response["Content-Encoding"] == "gzip"
+    page = gzip.decompress(response.content).decode()
+    assert "/updates/old-0/" in page and "/updates/old-1/" in page and "old-2" not in page
+    assert "/updates/old-2/" in client.get("/api/v1/sitemaps/updates-2021-2.xml").content.decode()
+    assert client.get("/api/v1/sitemaps/updates-1999.xml").status_code == 404
+
+    # only the segment of the changed post is rebuilt
+    with django_capture_on_commit_callbacks(execute=True):
+        recent.title = "Newer"
+        recent.save()
+    rendered = []
+    monkeypatch.setattr(sitemaps, "render_segment", lambda segment: rendered.append(segment.year) or b"")
+    client.get("/api/v1/sitemaps/updates-2021.xml", HTTP_ACCEPT_ENCODING="gzip")
+    client.get("/api/v1/sitemaps/updates-2022.xml", HTTP_ACCEPT_ENCODING="gzip")
+    assert rendered == [2022]
+
+
+def test_sitemap_pages_and_variants(client, monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr(sitemaps, "PAGE_SIZE", 2)
+    old = [Update.objects.create(title="Old %d" % number, publish=published(2021)) for number in range(3)]
+    second_page = client.get("/api/v1/sitemaps/updates-2021-2.xml")
+    gzipped = client.get("/api/v1/sitemaps/updates-2021-2.xml", HTTP_ACCEPT_ENCODING="gzip")
+    assert gzipped["ETag"] != second_page["ETag"]
+    not_modified = client.get(
+        "/api/v1/sitemaps/updates-2021-2.xml", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=gzipped["ETag"]
+    )
+    assert not_modified.status_code == 304 and not_modified["ETag"] == gzipped["ETag"]
+
+    # a change on the first page of the year leaves the second one alone
+    with django_capture_on_commit_callbacks(execute=True):
+        old[0].title = "Older"
+        old[0].save()
+    assert client.get(
+        "/api/v1/sitemaps/updates-2021-2.xml", HTTP_IF_NONE_MATCH=second_page["ETag"]
+    ).status_code == 304
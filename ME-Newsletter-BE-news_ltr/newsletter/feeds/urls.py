@@ -0,0 +1,10 @@
+from django.urls import path
+
+from newsletter.feeds.views import FeedView, SitemapIndexView, SitemapSegmentView
+
+urlpatterns = [
+    path("feeds/<slug:kind>.<slug:fmt>", FeedView.as_view(), name="feed"),
+    path("feeds/updates/<slug:region>.<slug:fmt>", FeedView.as_view(), {"kind": "updates"}, name="region-feed"),
+    path("sitemap.xml", SitemapIndexView.as_view(), name="sitemap-index"),
+    path("sitemaps/<slug:name>.xml", SitemapSegmentView.as_view(), name="sitemap-segment"),
+]
@@ -0,0 +1,87 @@
+import gzip
+
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views import View
+
+from newsletter.core.compression import attach
+from newsletter.feeds.feeds import FEEDS, FORMATS, get_feed
+from newsletter.feeds.sitemaps import find_segment, get_segment_body, get_segments, render_index
+from newsletter.locations.models import Region
+
+
+class FeedView(View):
+    """
+    ``feeds/<kind>.<format>`` and ``feeds/updates/<region>.<format>``, answered with 304 when the
+    client's ``If-None-Match`` or ``If-Modified-Since`` still matches.
+    """
+    fast_lane = True
+    max_age = 60
+
+    def get(self, request, kind, fmt, region=None):
+        if kind not in FEEDS or fmt not in FORMATS:
+            raise Http404("Unknown feed")
+        region_id = None
+        if region is not None:
+            # from the per-process lookup table, so a cached feed costs no query
+            region_id = Region.objects.resolve(region)
+            if region_id is None:
+                raise Http404("Unknown region")
+
+        document = get_feed(kind, fmt, region_id, self_url=request.build_absolute_uri(request.path))
+        if document is None:
+            raise Http404("Unknown region")
+        last_modified = int(document.last_modified.timestamp()) if document.last_modified else None
+        response = get_conditional_response(request, etag=document.etag, last_modified=last_modified)
+        if response is None:
+            response = attach(HttpResponse(document.body, content_type=document.content_type), document.compressed)
+        response["ETag"] = document.etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=self.max_age)
+        return response
+
+
+class SitemapIndexView(View):
+    fast_lane = True
+    max_age = 60 * 60
+
+    def get(self, request):
+        body = render_index(
+            get_segments(),
+            lambda name: request.build_absolute_uri(reverse("sitemap-segment", kwargs={"name": name})),
+        )
+        response = HttpResponse(body, content_type="application/xml; charset=utf-8")
+        patch_cache_control(response, public=True, max_age=self.max_age)
+        return response
+
+
+class SitemapSegmentView(View):
+    """
+    Segments are stored gzipped and sent as they are to clients accepting gzip.
+    """
+    fast_lane = True
+    max_age = 60 * 60
+
+    def get(self, request, name):
+        segment = find_segment(name)
+        if segment is None:
+            raise Http404("Unknown sitemap")
+
+        etag, body = get_segment_body(segment)
+        # CompressionMiddleware takes the "-gzip" suffix off If-None-Match and puts it back on a 304
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            if "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", ""):
+                response = HttpResponse(body, content_type="application/xml; charset=utf-8")
+                response["Content-Encoding"] = "gzip"
+                # each variant needs its own strong ETag
+                etag = etag[:-1] + '-gzip"'
+            else:
+                response = HttpResponse(gzip.decompress(body), content_type="application/xml; charset=utf-8")
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Accept-Encoding",))
+        patch_cache_control(response, public=True, max_age=self.max_age)
+        return response
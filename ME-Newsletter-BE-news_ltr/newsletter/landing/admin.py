@@ -1,5 +1,33 @@
 from django.contrib import admin
-from newsletter.landing.models import SubscribeEmail
+from newsletter.landing.exports import export_response
+from newsletter.landing.models import SubscribeEmail, SubscriberSegment
 
-# Register your models here.
-admin.site.register(SubscribeEmail)
\ No newline at end of file
+
+class SubscribeEmailAdmin(admin.ModelAdmin):
+    list_display = ["email", "region", "country", "status"]
+    list_filter = ["status", "region", "country"]
+    list_select_related = ["region", "country"]
+    search_fields = ["email"]
+    actions = ["export_csv", "export_ndjson"]
+
+    @admin.action(description="Export selected subscribers as CSV (gzip)")
+    def export_csv(self, request, queryset):
+        return export_response(queryset, "csv")
+
+    @admin.action(description="Export selected subscribers as NDJSON (gzip)")
+    def export_ndjson(self, request, queryset):
+        return export_response(queryset, "ndjson")
+
+
+class SubscriberSegmentAdmin(admin.ModelAdmin):
+    list_display = ["region_name", "country_name", "status", "count"]
+    list_filter = ["status"]
+    readonly_fields = ["region_name", "country_name", "status", "count"]
+    exclude = ["region", "country"]
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.register(SubscribeEmail, SubscribeEmailAdmin)
+admin.site.register(SubscriberSegment, SubscriberSegmentAdmin)
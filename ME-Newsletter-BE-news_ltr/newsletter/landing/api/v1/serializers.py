@@ -1,7 +1,12 @@
-from rest_framework.serializers import ModelSerializer
+from newsletter.core.serializers import ModelSerializer
 from newsletter.landing.models import SubscribeEmail
+from newsletter.locations.fields import LocationField
+from newsletter.locations.models import Country, Region
 
 class SubscribeEmailSerializer(ModelSerializer):
+    region = LocationField(queryset=Region.objects.all(), required=False, allow_null=True)
+    country = LocationField(queryset=Country.objects.all(), required=False, allow_null=True)
+
     class Meta:
         model = SubscribeEmail
-        fields = ["email"]
\ No newline at end of file
+        fields = ["email", "region", "country"]
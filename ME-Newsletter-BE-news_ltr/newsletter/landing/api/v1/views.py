@@ -1,14 +1,26 @@
+from django.conf import settings
+from django.core import signing
+from django.core.mail import send_mail
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
 from rest_framework.views import APIView
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
+from drf_spectacular.types import OpenApiTypes
 
 from newsletter.landing.models import SubscribeEmail
 from newsletter.landing.api.v1.serializers import SubscribeEmailSerializer
+from newsletter.landing.exports import FORMATS, export_response
+from newsletter.landing.tokens import CONFIRM, UNSUBSCRIBE, read_token, token_path
 
 class SubscribeEmailView(APIView):
     permission_classes = ()
     authentication_classes = ()
+    throttle_scope = "subscribe"
 
     @extend_schema(
         summary="Subscribe to newsletter",
@@ -39,7 +51,101 @@ class SubscribeEmailView(APIView):
     def post(self, request):
         serilizer = SubscribeEmailSerializer(data=request.data)
         if serilizer.is_valid(raise_exception=True):
-            serilizer.save()
+            if getattr(settings, "SUBSCRIBE_DOUBLE_OPT_IN", True):
+                subscriber = serilizer.save(status=SubscribeEmail.PENDING)
+                # no mail for a subscription that is rolled back
+                transaction.on_commit(lambda: self.send_confirmation(request, subscriber))
+            else:
+                serilizer.save()
             return Response("Email subscribed successfully", status=status.HTTP_201_CREATED)
         return Response(serilizer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def send_confirmation(self, request, subscriber):
+        context = {
+            "confirm_url": request.build_absolute_uri(token_path(subscriber, CONFIRM)),
+            "unsubscribe_url": request.build_absolute_uri(token_path(subscriber, UNSUBSCRIBE)),
+        }
+        subject = " ".join(render_to_string("landing/email/confirm_subject.txt", context).splitlines())
+        message = render_to_string("landing/email/confirm_message.txt", context)
+        send_mail(subject, message, None, [subscriber.email])
+
+
+class SubscriptionTokenView(APIView):
+    """
+    Applies the status change carried by a signed token. The token is verified without
+    touching the database, and while it is current the change is a single conditional UPDATE.
+    """
+    permission_classes = ()
+    authentication_classes = ()
+    action = None
+    sources = ()
+    target = None
+    message = None
+
+    def apply(self, token):
+        try:
+            pk, region_id, country_id, subscriber_status = read_token(token, self.action)
+        except signing.SignatureExpired:
+            return Response({"result": "Link has expired"}, status=status.HTTP_400_BAD_REQUEST)
+        except signing.BadSignature:
+            return Response({"result": "Invalid link"}, status=status.HTTP_400_BAD_REQUEST)
+        if not SubscribeEmail.transition(pk, region_id, country_id, subscriber_status, self.sources, self.target):
+            return Response({"result": "Subscription not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"result": self.message}, status=status.HTTP_200_OK)
+
+
+class SubscribeConfirmView(SubscriptionTokenView):
+    action = CONFIRM
+    sources = (SubscribeEmail.PENDING,)
+    target = SubscribeEmail.ACTIVE
+    message = "Subscription confirmed"
+
+    @extend_schema(summary="Confirm a newsletter subscription", responses={200: OpenApiTypes.OBJECT})
+    def get(self, request, token):
+        return self.apply(token)
+
+
+class UnsubscribeView(SubscriptionTokenView):
+    action = UNSUBSCRIBE
+    sources = (SubscribeEmail.ACTIVE, SubscribeEmail.PENDING, SubscribeEmail.BOUNCED)
+    target = SubscribeEmail.UNSUBSCRIBED
+    message = "Unsubscribed successfully"
+
+    @extend_schema(summary="Unsubscribe from the newsletter", responses={200: OpenApiTypes.OBJECT})
+    def get(self, request, token):
+        return self.apply(token)
+
+    # RFC 8058 one-click unsubscribe (List-Unsubscribe-Post)
+    @extend_schema(summary="One-click unsubscribe", responses={200: OpenApiTypes.OBJECT})
+    def post(self, request, token):
+        return self.apply(token)
+
+
+# the export is generated while the response streams, after the request transaction would have ended
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class SubscribeEmailExportView(APIView):
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        summary="Export subscribers",
+        description="Streams the subscriber list as gzip-compressed CSV or NDJSON",
+        parameters=[
+            OpenApiParameter(
+                "export_format", OpenApiTypes.STR, enum=list(FORMATS), description="csv (default) or ndjson"
+            ),
+            OpenApiParameter("modified_since", OpenApiTypes.DATETIME, description="Only subscribers modified since"),
+            OpenApiParameter("gzip", OpenApiTypes.BOOL, description="Compress the output (default true)"),
+        ],
+        responses={200: OpenApiTypes.BINARY, 400: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        export_format = request.GET.get("export_format", "csv")
+        if export_format not in FORMATS:
+            return Response({"result": "Unknown export format"}, status=status.HTTP_400_BAD_REQUEST)
+        modified_since = request.GET.get("modified_since")
+        if modified_since:
+            modified_since = parse_datetime(modified_since)
+            if modified_since is None:
+                return Response({"result": "Invalid modified_since"}, status=status.HTTP_400_BAD_REQUEST)
+        compress = request.GET.get("gzip", "1").lower() not in ("0", "false", "no")
+        return export_response(SubscribeEmail.objects.all(), export_format, modified_since or None, compress)
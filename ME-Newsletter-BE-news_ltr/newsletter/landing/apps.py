@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LandingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'newsletter.landing'
+
+    def ready(self):
+        import newsletter.landing.signals  # noqa F401
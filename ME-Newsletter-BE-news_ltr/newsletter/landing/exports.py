@@ -0,0 +1,104 @@
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import csv
+import json
+import zlib
+
+# django imports
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_FIELDS = ["id", "email", "region", "country", "status", "created", "modified"]
+# regions and countries are exported by name
+EXPORT_COLUMNS = ["id", "email", "region__name", "country__name", "status", "created", "modified"]
+# rows fetched per round trip from the server-side cursor
+CHUNK_SIZE = 2000
+# lines joined into one block before compressing/sending
+BLOCK_SIZE = 64 * 1024
+
+
+class _Echo:
+    """
+    File-like object handing back what csv.writer writes, so rows can be yielded one by one.
+    """
+    def write(self, value):
+        return value
+
+
+def _format(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def subscriber_rows(queryset, modified_since=None):
+    """
+    Iterates subscribers as tuples through a server-side cursor, ordered by ``(modified, id)``
+    so an incremental export can resume from the last ``modified`` it has seen.
+    """
+    if modified_since is not None:
+        queryset = queryset.filter(modified__gte=modified_since)
+    return queryset.order_by("modified", "id").values_list(*EXPORT_COLUMNS).iterator(chunk_size=CHUNK_SIZE)
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow([_format(value) for value in row])
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, (_format(value) for value in row)))) + "\n"
+
+
+FORMATS = {
+    "csv": (csv_lines, "text/csv"),
+    "ndjson": (ndjson_lines, "application/x-ndjson"),
+}
+
+
+def blocks(lines, size=BLOCK_SIZE):
+    buffer, length = [], 0
+    for line in lines:
+        buffer.append(line)
+        length += len(line)
+        if length >= size:
+            yield "".join(buffer).encode()
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer).encode()
+
+
+def gzip_stream(chunks, level=6):
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_subscribers(queryset, export_format="csv", modified_since=None, compress=True):
+    """
+    Returns an iterator of bytes exporting ``queryset``. Nothing is queried until it is consumed,
+    and memory use does not depend on the number of subscribers.
+    """
+    lines, _content_type = FORMATS[export_format]
+    chunks = blocks(lines(subscriber_rows(queryset, modified_since)))
+    return gzip_stream(chunks) if compress else chunks
+
+
+def export_response(queryset, export_format="csv", modified_since=None, compress=True):
+    _lines, content_type = FORMATS[export_format]
+    filename = "subscribers-%s.%s" % (timezone.now().strftime("%Y%m%d%H%M%S"), export_format)
+    if compress:
+        content_type, filename = "application/gzip", filename + ".gz"
+    response = StreamingHttpResponse(
+        export_subscribers(queryset, export_format, modified_since, compress), content_type=content_type
+    )
+    response["Content-Disposition"] = 'attachment; filename="%s"' % filename
+    return response
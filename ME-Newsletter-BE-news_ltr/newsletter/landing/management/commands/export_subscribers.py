@@ -0,0 +1,36 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from newsletter.landing.exports import FORMATS, export_subscribers
+from newsletter.landing.models import SubscribeEmail
+
+
+class Command(BaseCommand):
+    help = "Stream the subscriber list as CSV or NDJSON, optionally gzip-compressed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", dest="export_format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--modified-since", help="ISO 8601 datetime, only export subscribers modified since")
+        parser.add_argument("--gzip", action="store_true", help="Compress the output with gzip")
+        parser.add_argument("-o", "--output", default="-", help="Output file, '-' for stdout")
+
+    def handle(self, *args, **options):
+        modified_since = options["modified_since"]
+        if modified_since:
+            modified_since = parse_datetime(modified_since)
+            if modified_since is None:
+                raise CommandError("--modified-since must be an ISO 8601 datetime")
+        chunks = export_subscribers(
+            SubscribeEmail.objects.all(), options["export_format"], modified_since or None, options["gzip"]
+        )
+        if options["output"] == "-":
+            output = sys.stdout.buffer
+            for chunk in chunks:
+                output.write(chunk)
+            output.flush()
+        else:
+            with open(options["output"], "wb") as output:
+                for chunk in chunks:
+                    output.write(chunk)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from newsletter.landing.models import SubscribeEmail, SubscriberSegment
+
+
+class Command(BaseCommand):
+    help = "Recount subscriber segments, e.g. after bulk updates that bypassed the model signals"
+
+    def handle(self, *args, **options):
+        SubscriberSegment.objects.rebuild(SubscribeEmail.objects.all())
+        self.stdout.write(
+            self.style.SUCCESS("Rebuilt %d subscriber segments" % SubscriberSegment.objects.count())
+        )
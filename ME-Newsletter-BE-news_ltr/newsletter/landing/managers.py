@@ -0,0 +1,81 @@
+from __future__ import unicode_literals, absolute_import
+
+from django.db import models, transaction
+from django.db.models import Q, Sum
+
+from newsletter.core.managers import CounterManager
+from newsletter.locations.managers import UNKNOWN_ID
+from newsletter.locations.models import Country, Region
+
+
+def _location_ids(region, country):
+    # codes or names, as the post filters take them
+    region_id = Region.objects.resolve(region, default=UNKNOWN_ID) if region else None
+    country_id = Country.objects.resolve(country, default=UNKNOWN_ID) if country else None
+    return region_id, country_id
+
+
+class SubscribeEmailManager(models.Manager):
+    def segment(self, region=None, country=None, status="active"):
+        """
+        Subscribers of a segment, ``region`` and ``country`` given by code or name. A subscriber
+        without a region/country preference belongs to every region/country segment. Served by
+        the composite segment indexes.
+        """
+        region_id, country_id = _location_ids(region, country)
+        queryset = self.get_queryset().filter(status=status)
+        if region_id:
+            queryset = queryset.filter(Q(region_id=region_id) | Q(region__isnull=True))
+        if country_id:
+            queryset = queryset.filter(Q(country_id=country_id) | Q(country__isnull=True))
+        return queryset
+
+
+class SubscriberSegmentManager(CounterManager):
+    def _key(self, region_id, country_id, status):
+        # NULL never equals NULL in a unique constraint, so "no preference" is stored as 0
+        no_preference = self.model.NO_PREFERENCE
+        return {"region": region_id or no_preference, "country": country_id or no_preference, "status": status}
+
+    def adjust(self, region_id, country_id, status, delta):
+        self.increment(self._key(region_id, country_id, status), count=delta)
+
+    def move(self, old, new):
+        """
+        Moves one subscriber from the ``(region_id, country_id, status)`` segment ``old`` to ``new``.
+        """
+        if old == new:
+            return
+        if old is not None:
+            self.adjust(*old, delta=-1)
+        if new is not None:
+            self.adjust(*new, delta=1)
+
+    def size(self, region=None, country=None, status="active"):
+        """
+        Number of subscribers in a segment, same semantics as ``SubscribeEmailManager.segment``.
+        """
+        region_id, country_id = _location_ids(region, country)
+        queryset = self.filter(status=status)
+        if region_id:
+            queryset = queryset.filter(region__in=[region_id, self.model.NO_PREFERENCE])
+        if country_id:
+            queryset = queryset.filter(country__in=[country_id, self.model.NO_PREFERENCE])
+        return queryset.aggregate(total=Sum("count"))["total"] or 0
+
+    def rebuild(self, subscribers):
+        """
+        Recounts every segment from ``subscribers``, for rows changed with ``QuerySet.update`` or
+        by deleting a region or country.
+        """
+        rows = (
+            subscribers.order_by()
+            .values("region", "country", "status")
+            .annotate(total=models.Count("id"))
+        )
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(
+                self.model(count=row["total"], **self._key(row["region"], row["country"], row["status"]))
+                for row in rows
+            )
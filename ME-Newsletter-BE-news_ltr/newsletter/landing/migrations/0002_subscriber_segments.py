@@ -0,0 +1,62 @@
+# Generated by Django 3.2.11 on 2026-10-19 18:46
+
+from django.db import migrations, models
+
+
+def count_existing_subscribers(apps, schema_editor):
+    SubscribeEmail = apps.get_model("landing", "SubscribeEmail")
+    SubscriberSegment = apps.get_model("landing", "SubscriberSegment")
+    total = SubscribeEmail.objects.count()
+    if total:
+        SubscriberSegment.objects.create(region="", country="", status="active", count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriberSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(blank=True, default='', max_length=100, verbose_name='Region')),
+                ('country', models.CharField(blank=True, default='', max_length=100, verbose_name='Country')),
+                ('status', models.CharField(choices=[('active', 'Active'), ('unsubscribed', 'Unsubscribed'), ('bounced', 'Bounced')], max_length=20, verbose_name='Status')),
+                ('count', models.IntegerField(default=0, verbose_name='Subscribers')),
+            ],
+            options={
+                'verbose_name': 'Subscriber Segment',
+            },
+        ),
+        migrations.AddField(
+            model_name='subscribeemail',
+            name='country',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='Country'),
+        ),
+        migrations.AddField(
+            model_name='subscribeemail',
+            name='region',
+            field=models.CharField(blank=True, choices=[('MiddleEast', 'MiddleEast'), ('Around The World', 'Around The World')], max_length=100, null=True, verbose_name='Region'),
+        ),
+        migrations.AddField(
+            model_name='subscribeemail',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('unsubscribed', 'Unsubscribed'), ('bounced', 'Bounced')], default='active', max_length=20, verbose_name='Status'),
+        ),
+        migrations.AddIndex(
+            model_name='subscribeemail',
+            index=models.Index(fields=['status', 'region', 'country', 'email'], name='subscriber_region_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscribeemail',
+            index=models.Index(fields=['status', 'country', 'email'], name='subscriber_country_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='subscribersegment',
+            unique_together={('status', 'region', 'country')},
+        ),
+        migrations.RunPython(count_existing_subscribers, migrations.RunPython.noop),
+    ]
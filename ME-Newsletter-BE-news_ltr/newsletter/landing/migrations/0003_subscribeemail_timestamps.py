@@ -0,0 +1,29 @@
+# Generated by Django 3.2.11 on 2026-10-19 18:47
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0002_subscriber_segments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscribeemail',
+            name='created',
+            field=model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created'),
+        ),
+        migrations.AddField(
+            model_name='subscribeemail',
+            name='modified',
+            field=model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified'),
+        ),
+        migrations.AddIndex(
+            model_name='subscribeemail',
+            index=models.Index(fields=['modified', 'id'], name='subscriber_modified_idx'),
+        ),
+    ]
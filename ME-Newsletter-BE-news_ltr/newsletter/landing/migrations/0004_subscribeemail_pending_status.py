@@ -0,0 +1,23 @@
+# Generated by Django 3.2.11 on 2026-10-19 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0003_subscribeemail_timestamps'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='subscribeemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending confirmation'), ('active', 'Active'), ('unsubscribed', 'Unsubscribed'), ('bounced', 'Bounced')], default='active', max_length=20, verbose_name='Status'),
+        ),
+        migrations.AlterField(
+            model_name='subscribersegment',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending confirmation'), ('active', 'Active'), ('unsubscribed', 'Unsubscribed'), ('bounced', 'Bounced')], max_length=20, verbose_name='Status'),
+        ),
+    ]
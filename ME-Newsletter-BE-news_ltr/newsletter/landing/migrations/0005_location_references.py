@@ -0,0 +1,23 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_seed_locations'),
+        ('landing', '0004_subscribeemail_pending_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscribeemail',
+            name='region_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subscribers', to='locations.region', verbose_name='Region'),
+        ),
+        migrations.AddField(
+            model_name='subscribeemail',
+            name='country_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subscribers', to='locations.country', verbose_name='Country'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from newsletter.locations.normalize import map_locations, unmap_locations
+
+
+def forwards(apps, schema_editor):
+    map_locations(apps, "landing.SubscribeEmail")
+
+
+def backwards(apps, schema_editor):
+    unmap_locations(apps, "landing.SubscribeEmail")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0005_location_references'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,89 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def clear_segments(apps, schema_editor):
+    # keyed by the values being replaced: recounted below, or by rebuild_subscriber_segments after a rollback
+    apps.get_model("landing", "SubscriberSegment").objects.all().delete()
+
+
+def count_segments(apps, schema_editor):
+    SubscribeEmail = apps.get_model("landing", "SubscribeEmail")
+    SubscriberSegment = apps.get_model("landing", "SubscriberSegment")
+    rows = SubscribeEmail.objects.order_by().values("region", "country", "status").annotate(total=Count("id"))
+    SubscriberSegment.objects.bulk_create(
+        SubscriberSegment(region=row["region"] or 0, country=row["country"] or 0, status=row["status"], count=row["total"])
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('landing', '0006_map_locations'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='subscribeemail',
+            name='subscriber_region_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='subscribeemail',
+            name='subscriber_country_idx',
+        ),
+        migrations.RemoveField(
+            model_name='subscribeemail',
+            name='region',
+        ),
+        migrations.RemoveField(
+            model_name='subscribeemail',
+            name='country',
+        ),
+        migrations.RenameField(
+            model_name='subscribeemail',
+            old_name='region_ref',
+            new_name='region',
+        ),
+        migrations.RenameField(
+            model_name='subscribeemail',
+            old_name='country_ref',
+            new_name='country',
+        ),
+        migrations.AddIndex(
+            model_name='subscribeemail',
+            index=models.Index(fields=['status', 'region', 'country', 'email'], name='subscriber_region_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscribeemail',
+            index=models.Index(fields=['status', 'country', 'email'], name='subscriber_country_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='subscribersegment',
+            unique_together=set(),
+        ),
+        migrations.RunPython(clear_segments, clear_segments),
+        migrations.RemoveField(
+            model_name='subscribersegment',
+            name='region',
+        ),
+        migrations.RemoveField(
+            model_name='subscribersegment',
+            name='country',
+        ),
+        migrations.AddField(
+            model_name='subscribersegment',
+            name='region',
+            field=models.PositiveIntegerField(default=0, verbose_name='Region id'),
+        ),
+        migrations.AddField(
+            model_name='subscribersegment',
+            name='country',
+            field=models.PositiveIntegerField(default=0, verbose_name='Country id'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='subscribersegment',
+            unique_together={('status', 'region', 'country')},
+        ),
+        migrations.RunPython(count_segments, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,109 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+from model_utils import FieldTracker
+from model_utils.models import TimeStampedModel
+
 from newsletter.core.behaviors import EmailMixin
-# Create your models here.
-class SubscribeEmail(EmailMixin):
+from newsletter.landing.managers import SubscribeEmailManager, SubscriberSegmentManager
+from newsletter.locations.models import Country, Region
+
+
+class SubscribeEmail(EmailMixin, TimeStampedModel):
     """
     Subscribe email model
     """
+    PENDING = "pending"
+    ACTIVE = "active"
+    UNSUBSCRIBED = "unsubscribed"
+    BOUNCED = "bounced"
+    STATUS_CHOICES = (
+        (PENDING, "Pending confirmation"),
+        (ACTIVE, "Active"),
+        (UNSUBSCRIBED, "Unsubscribed"),
+        (BOUNCED, "Bounced"),
+    )
+    region = models.ForeignKey(
+        Region, verbose_name=_("Region"), on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="subscribers",
+    )
+    country = models.ForeignKey(
+        Country, verbose_name=_("Country"), on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="subscribers",
+    )
+    status = models.CharField(_("Status"), choices=STATUS_CHOICES, max_length=20, default=ACTIVE)
+
+    objects = SubscribeEmailManager()
+    tracker = FieldTracker(fields=["region", "country", "status"])
+
+    @property
+    def segment(self):
+        return (self.region_id, self.country_id, self.status)
+
+    @classmethod
+    def transition(cls, pk, region_id, country_id, status, sources, target):
+        """
+        Moves subscriber ``pk`` from one of the ``sources`` statuses to ``target``. ``region_id``,
+        ``country_id`` and ``status`` are the values the caller last saw, e.g. from a signed token.
+
+        While they are current this is a single-row conditional UPDATE, without reading the row.
+        Otherwise, e.g. when the link is clicked again or the preferences changed since the token
+        was made, it falls back to a locked read and a regular save, so repeating a transition is
+        a no-op. The segment counts change in the same transaction. Returns ``False`` if the
+        subscriber does not exist.
+        """
+        with transaction.atomic():
+            if status in sources:
+                updated = cls.objects.filter(
+                    pk=pk, region_id=region_id, country_id=country_id, status=status
+                ).update(status=target, modified=timezone.now())
+                if updated:
+                    SubscriberSegment.objects.move((region_id, country_id, status), (region_id, country_id, target))
+                    return True
+            subscriber = cls.objects.select_for_update().filter(pk=pk).first()
+            if subscriber is None:
+                return False
+            if subscriber.status in sources:
+                subscriber.status = target
+                subscriber.save()
+        return True
+
     class Meta:
-        verbose_name = "SUbscribe Email"
\ No newline at end of file
+        verbose_name = "SUbscribe Email"
+        indexes = [
+            # email is included so that sends and counts are index-only scans
+            models.Index(fields=["status", "region", "country", "email"], name="subscriber_region_idx"),
+            models.Index(fields=["status", "country", "email"], name="subscriber_country_idx"),
+            # incremental exports walk subscribers in (modified, id) order
+            models.Index(fields=["modified", "id"], name="subscriber_modified_idx"),
+        ]
+
+
+class SubscriberSegment(models.Model):
+    """
+    Number of subscribers per region, country and status, maintained on every subscriber change.
+    Regions and countries are stored by id, ``NO_PREFERENCE`` for subscribers without one.
+    """
+    NO_PREFERENCE = 0
+
+    region = models.PositiveIntegerField(_("Region id"), default=NO_PREFERENCE)
+    country = models.PositiveIntegerField(_("Country id"), default=NO_PREFERENCE)
+    status = models.CharField(_("Status"), choices=SubscribeEmail.STATUS_CHOICES, max_length=20)
+    count = models.IntegerField(_("Subscribers"), default=0)
+
+    objects = SubscriberSegmentManager()
+
+    def __str__(self):
+        return "%s / %s / %s" % (self.region_name or "-", self.country_name or "-", self.status)
+
+    @property
+    def region_name(self):
+        return Region.objects.filter(pk=self.region).values_list("name", flat=True).first()
+
+    @property
+    def country_name(self):
+        return Country.objects.filter(pk=self.country).values_list("name", flat=True).first()
+
+    class Meta:
+        verbose_name = "Subscriber Segment"
+        unique_together = ("status", "region", "country")
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from newsletter.landing.models import SubscribeEmail, SubscriberSegment
+
+
+@receiver(post_save, sender=SubscribeEmail)
+def update_segment_on_save(sender, instance, created, **kwargs):
+    if created:
+        SubscriberSegment.objects.adjust(*instance.segment, delta=1)
+    elif instance.tracker.changed():
+        previous = tuple(instance.tracker.previous(field) for field in ("region", "country", "status"))
+        SubscriberSegment.objects.move(previous, instance.segment)
+
+
+@receiver(post_delete, sender=SubscribeEmail)
+def update_segment_on_delete(sender, instance, **kwargs):
+    SubscriberSegment.objects.adjust(*instance.segment, delta=-1)
@@ -1,3 +1,174 @@
-from django.test import TestCase
+import gzip
+import json
+from datetime import timedelta
 
-# Create your tests here.
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from newsletter.landing.exports import EXPORT_FIELDS
+from newsletter.landing.models import SubscribeEmail, SubscriberSegment
+from newsletter.landing.tokens import CONFIRM, UNSUBSCRIBE, make_token, token_path
+from newsletter.locations.models import Country, Region
+
+pytestmark = pytest.mark.django_db
+
+
+def region(name):
+    return Region.objects.get(name=name)
+
+
+def country(code):
+    return Country.objects.get(code=code)
+
+
+class TestSubscriberSegments:
+    def test_counts_follow_subscriber_changes(self):
+        subscriber = SubscribeEmail.objects.create(
+            email="a@example.com", region=region("MiddleEast"), country=country("AE")
+        )
+        SubscribeEmail.objects.create(email="b@example.com", region=region("MiddleEast"))
+        assert SubscriberSegment.objects.size(region="MiddleEast", country="AE") == 2
+        assert SubscriberSegment.objects.size(region="MiddleEast", country="Oman") == 1
+
+        subscriber.status = SubscribeEmail.UNSUBSCRIBED
+        subscriber.save()
+        assert SubscriberSegment.objects.size(region="MiddleEast", country="AE") == 1
+        assert SubscriberSegment.objects.size(status=SubscribeEmail.UNSUBSCRIBED) == 1
+
+        subscriber.delete()
+        assert SubscriberSegment.objects.size(status=SubscribeEmail.UNSUBSCRIBED) == 0
+
+    def test_counts_match_segment_queries(self):
+        SubscribeEmail.objects.create(email="a@example.com", region=region("MiddleEast"), country=country("AE"))
+        SubscribeEmail.objects.create(email="b@example.com", region=region("Around The World"))
+        SubscribeEmail.objects.create(email="c@example.com")
+        for region_value, country_value in [(None, None), ("MiddleEast", None), ("middle-east", "AE"), (None, "Oman")]:
+            assert SubscriberSegment.objects.size(region_value, country_value) == (
+                SubscribeEmail.objects.segment(region_value, country_value).count()
+            )
+
+    @pytest.mark.django_db(transaction=True, serialized_rollback=True)
+    def test_migration_maps_free_text_and_recounts(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([("landing", "0005_location_references")])
+        apps = executor.loader.project_state([("landing", "0005_location_references")]).apps
+        for number, (region_value, country_value) in enumerate([("MiddleEast", "UAE"), ("Middle East", None)]):
+            apps.get_model("landing", "SubscribeEmail").objects.create(
+                email="%d@example.com" % number, region=region_value, country=country_value
+            )
+            apps.get_model("landing", "SubscriberSegment").objects.create(
+                region=region_value, country=country_value or "", status="active", count=1
+            )
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        assert SubscriberSegment.objects.size(region="middle-east") == 2
+        assert SubscriberSegment.objects.size(region="middle-east", country="AE") == 2
+        assert SubscriberSegment.objects.size(country="SA") == 1
+
+    def test_rebuild(self):
+        SubscribeEmail.objects.create(email="a@example.com", country=country("AE"))
+        SubscribeEmail.objects.filter(email="a@example.com").update(status=SubscribeEmail.BOUNCED)
+        SubscriberSegment.objects.rebuild(SubscribeEmail.objects.all())
+        assert SubscriberSegment.objects.size() == 0
+        assert SubscriberSegment.objects.size(status=SubscribeEmail.BOUNCED) == 1
+
+
+class TestSubscriptionTokens:
+    def test_subscribe_sends_confirmation(self, client, mailoutbox, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            response = client.post("/api/v1/subscribe/", {"email": "a@example.com", "region": "MiddleEast"})
+        assert response.status_code == 201
+        assert len(callbacks) == 1
+        assert SubscribeEmail.objects.get().status == SubscribeEmail.PENDING
+        assert SubscriberSegment.objects.size(region="MiddleEast") == 0
+        assert len(mailoutbox) == 1
+        assert "/api/v1/subscribe/confirm/" in mailoutbox[0].body
+
+    def test_confirm_and_unsubscribe(self, client):
+        subscriber = SubscribeEmail.objects.create(
+            email="a@example.com", region=region("MiddleEast"), status="pending"
+        )
+        confirm_path = token_path(subscriber, CONFIRM)
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(confirm_path).status_code == 200
+        assert not [query for query in context.captured_queries if query["sql"].startswith("SELECT")]
+        assert SubscriberSegment.objects.size(region="MiddleEast") == 1
+        # idempotent
+        assert client.get(confirm_path).status_code == 200
+        assert SubscriberSegment.objects.size(region="MiddleEast") == 1
+
+        assert client.post(token_path(subscriber, UNSUBSCRIBE)).status_code == 200
+        subscriber.refresh_from_db()
+        assert subscriber.status == SubscribeEmail.UNSUBSCRIBED
+        assert SubscriberSegment.objects.size(region="MiddleEast") == 0
+
+    def test_repeated_unsubscribe_is_one_update_and_one_read(self, client):
+        subscriber = SubscribeEmail.objects.create(email="a@example.com", region=region("MiddleEast"))
+        path = token_path(subscriber, UNSUBSCRIBE)
+        assert client.get(path).status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(path).status_code == 200
+        statements = [query["sql"].split(" ", 1)[0] for query in context.captured_queries]
+        assert statements.count("UPDATE") == 1 and statements.count("SELECT") == 1
+        assert SubscriberSegment.objects.size(region="MiddleEast", status=SubscribeEmail.UNSUBSCRIBED) == 1
+
+    def test_changed_preferences_fall_back_to_save(self, client):
+        subscriber = SubscribeEmail.objects.create(email="a@example.com", region=region("MiddleEast"))
+        path = token_path(subscriber, UNSUBSCRIBE)
+        subscriber.region = region("Around The World")
+        subscriber.save()
+        assert client.get(path).status_code == 200
+        assert SubscriberSegment.objects.size() == 0
+        assert SubscriberSegment.objects.size(region="Around The World", status=SubscribeEmail.UNSUBSCRIBED) == 1
+
+    def test_subscribe_takes_region_and_country_codes_or_names(self, client):
+        response = client.post(
+            "/api/v1/subscribe/", {"email": "a@example.com", "region": "middle east", "country": "ae"}
+        )
+        assert response.status_code == 201
+        subscriber = SubscribeEmail.objects.get()
+        assert (subscriber.region.code, subscriber.country.code) == (Region.MIDDLE_EAST, "AE")
+        response = client.post("/api/v1/subscribe/", {"email": "b@example.com", "region": "Atlantis"})
+        assert response.status_code == 400 and "region" in response.json()
+
+    def test_rejects_tampered_and_foreign_tokens(self, client):
+        subscriber = SubscribeEmail.objects.create(email="a@example.com", status="pending")
+        confirm_token = make_token(subscriber, CONFIRM)
+        assert client.get("/api/v1/unsubscribe/%s/" % confirm_token).status_code == 400
+        assert client.get("/api/v1/subscribe/confirm/%sx/" % confirm_token).status_code == 400
+
+
+class TestSubscriberExport:
+    def test_api_requires_admin(self, client):
+        assert client.get("/api/v1/subscribe/export/").status_code in (401, 403)
+
+    def test_api_streams_gzip_csv(self, admin_client):
+        SubscribeEmail.objects.create(email="a@example.com", region=region("MiddleEast"))
+        response = admin_client.get("/api/v1/subscribe/export/")
+        assert response.status_code == 200
+        assert response.streaming
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+        assert lines[0] == ",".join(EXPORT_FIELDS)
+        assert lines[1].split(",")[1:4] == ["a@example.com", "MiddleEast", ""]
+
+    def test_api_modified_since(self, admin_client):
+        SubscribeEmail.objects.create(email="old@example.com")
+        SubscribeEmail.objects.filter(email="old@example.com").update(modified=timezone.now() - timedelta(days=2))
+        SubscribeEmail.objects.create(email="new@example.com")
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+        response = admin_client.get(
+            "/api/v1/subscribe/export/", {"export_format": "ndjson", "gzip": "0", "modified_since": since}
+        )
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        assert [row["email"] for row in rows] == ["new@example.com"]
+
+    def test_command(self, tmp_path):
+        SubscribeEmail.objects.create(email="a@example.com")
+        output = tmp_path / "subscribers.csv.gz"
+        call_command("export_subscribers", "--gzip", "-o", str(output))
+        assert "a@example.com" in gzip.decompress(output.read_bytes()).decode()
@@ -0,0 +1,46 @@
+from __future__ import unicode_literals, absolute_import
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+
+CONFIRM = "confirm"
+UNSUBSCRIBE = "unsubscribe"
+
+MAX_AGE = {
+    CONFIRM: getattr(settings, "SUBSCRIBE_CONFIRM_MAX_AGE", 60 * 60 * 24 * 7),
+    UNSUBSCRIBE: getattr(settings, "UNSUBSCRIBE_MAX_AGE", 60 * 60 * 24 * 365),
+}
+
+URL_NAMES = {
+    CONFIRM: "subscribe-confirm",
+    UNSUBSCRIBE: "unsubscribe",
+}
+
+
+def _salt(action):
+    # a separate salt per action, so a confirm token can never be replayed as an unsubscribe
+    return "newsletter.landing.tokens.%s" % action
+
+
+def make_token(subscriber, action):
+    """
+    HMAC-signed, timestamped token carrying everything needed to apply ``action`` without a lookup.
+    """
+    return signing.dumps(
+        [subscriber.pk, subscriber.region_id, subscriber.country_id, subscriber.status],
+        salt=_salt(action), compress=True,
+    )
+
+
+def read_token(token, action):
+    """
+    Returns ``(pk, region_id, country_id, status)``. Raises ``signing.BadSignature`` (or its subclass
+    ``signing.SignatureExpired``) for tampered, foreign or expired tokens.
+    """
+    pk, region_id, country_id, status = signing.loads(token, salt=_salt(action), max_age=MAX_AGE[action])
+    return pk, region_id, country_id, status
+
+
+def token_path(subscriber, action):
+    return reverse(URL_NAMES[action], kwargs={"token": make_token(subscriber, action)})
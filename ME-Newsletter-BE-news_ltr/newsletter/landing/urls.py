@@ -3,5 +3,8 @@ from django.urls import path
 from newsletter.landing.api.v1 import views
 
 urlpatterns = [
-    path("subscribe/", views.SubscribeEmailView.as_view(), name = "subscribe email")
-]
\ No newline at end of file
+    path("subscribe/", views.SubscribeEmailView.as_view(), name = "subscribe email"),
+    path("subscribe/export/", views.SubscribeEmailExportView.as_view(), name="subscribe-export"),
+    path("subscribe/confirm/<str:token>/", views.SubscribeConfirmView.as_view(), name="subscribe-confirm"),
+    path("unsubscribe/<str:token>/", views.UnsubscribeView.as_view(), name="unsubscribe"),
+]
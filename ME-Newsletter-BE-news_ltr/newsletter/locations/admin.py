@@ -0,0 +1,16 @@
+from django.contrib import admin
+from newsletter.locations.models import Country, Region
+
+
+class RegionAdmin(admin.ModelAdmin):
+    list_display = ["name", "code"]
+    search_fields = ["name", "code"]
+
+
+class CountryAdmin(admin.ModelAdmin):
+    list_display = ["name", "code"]
+    search_fields = ["name", "code"]
+
+
+admin.site.register(Region, RegionAdmin)
+admin.site.register(Country, CountryAdmin)
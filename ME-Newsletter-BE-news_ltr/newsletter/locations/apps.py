@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class LocationsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'newsletter.locations'
+
+    def ready(self):
+        import newsletter.locations.signals  # noqa F401
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+
+class LocationField(serializers.RelatedField):
+    """
+    Region or country given by code or name, in any case or spacing, and shown by name.
+    """
+    default_error_messages = {
+        "does_not_exist": "Unknown {model_name} \"{value}\".",
+        "incorrect_type": "Expected a code or name, received {data_type}.",
+    }
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        queryset = self.get_queryset()
+        location_id = queryset.model.objects.resolve(data)
+        if location_id is None:
+            self.fail("does_not_exist", model_name=queryset.model._meta.verbose_name.lower(), value=data)
+        return queryset.get(pk=location_id)
+
+    def to_representation(self, value):
+        return value.name
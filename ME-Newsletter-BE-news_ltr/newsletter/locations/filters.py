@@ -0,0 +1,20 @@
+from django_filters import rest_framework as filters
+from django_filters.constants import EMPTY_VALUES
+
+from newsletter.locations.managers import UNKNOWN_ID
+
+
+class LocationFilter(filters.CharFilter):
+    """
+    Filters a region or country foreign key by code or name, compared as an id.
+    """
+
+    def __init__(self, *args, location_model=None, **kwargs):
+        self.location_model = location_model
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs, value):
+        if value in EMPTY_VALUES:
+            return qs
+        location_id = self.location_model.objects.resolve(value, default=UNKNOWN_ID)
+        return qs.filter(**{"%s_id" % self.field_name: location_id})
@@ -0,0 +1,68 @@
+from __future__ import unicode_literals, absolute_import
+
+import re
+import threading
+import time
+
+from django.db import models
+
+from newsletter.core.managers import StatusMixinManager
+
+KEY_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+# id that matches no row, for filtering on values that resolve to nothing
+UNKNOWN_ID = -1
+# a miss reloads the table at most this often, so unknown values in requests cannot make every
+# request read it; this process's own changes clear it at once
+RELOAD_INTERVAL = 60
+
+_lookups = {}
+_lock = threading.Lock()
+
+
+def lookup_key(value):
+    return KEY_RE.sub("", (value or "").lower())
+
+
+class LocationManager(models.Manager):
+    """
+    Resolves codes and names (in any case or spacing) to ids from a per-process table, so
+    filters compare integer foreign keys. A miss reloads the table if it is older than
+    ``RELOAD_INTERVAL`` seconds, which picks up rows added by other processes; this process's
+    changes clear it through signals.
+    """
+
+    def _table(self):
+        table = {}
+        for pk, code, name in self.values_list("pk", "code", "name"):
+            table.setdefault(lookup_key(name), pk)
+            if code:
+                table[lookup_key(code)] = pk
+        return table
+
+    def resolve(self, value, default=None):
+        key = lookup_key(value)
+        if not key:
+            return default
+        label = self.model._meta.label
+        table, loaded = _lookups.get(label, (None, 0))
+        if table is None or (key not in table and time.monotonic() - loaded >= RELOAD_INTERVAL):
+            with _lock:
+                table, loaded = _lookups.get(label, (None, 0))
+                if table is None or (key not in table and time.monotonic() - loaded >= RELOAD_INTERVAL):
+                    table = self._table()
+                    _lookups[label] = (table, time.monotonic())
+        return table.get(key, default)
+
+    def clear_lookup(self):
+        _lookups.pop(self.model._meta.label, None)
+
+
+class LocatedPostManager(StatusMixinManager):
+    """
+    ``StatusMixinManager`` for posts with a region and country, joining both small tables so
+    serializers never query them row by row.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("region", "country")
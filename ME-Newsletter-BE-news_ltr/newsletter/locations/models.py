@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from newsletter.locations.managers import LocationManager
+
+
+class Region(models.Model):
+    """
+    Editorial region a post belongs to, e.g. the Middle East or the rest of the world.
+    """
+    MIDDLE_EAST = "middle-east"
+    AROUND_THE_WORLD = "around-the-world"
+
+    code = models.SlugField(_("code"), max_length=50, unique=True)
+    name = models.CharField(_("name"), max_length=100, unique=True)
+
+    objects = LocationManager()
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Region"
+        ordering = ["name"]
+
+
+class Country(models.Model):
+    """
+    Country by its ISO 3166-1 alpha-2 code. Names migrated from free text that matched no ISO
+    country are kept without a code until an editor fixes them.
+    """
+    code = models.CharField(_("ISO code"), max_length=2, unique=True, null=True, blank=True)
+    name = models.CharField(_("name"), max_length=100, unique=True)
+
+    objects = LocationManager()
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Country"
+        verbose_name_plural = "Countries"
+        ordering = ["name"]
@@ -0,0 +1,99 @@
+"""
+Mapping of the free-text region and country values of posts onto ``Region`` and ``Country``,
+shared by the data migrations of the post apps. Works on historical models only.
+"""
+from __future__ import unicode_literals, absolute_import
+
+from django.utils.text import slugify
+
+from newsletter.locations.managers import lookup_key
+
+REGION_ALIASES = {
+    "me": "middle-east",
+    "mena": "middle-east",
+    "gcc": "middle-east",
+    "gulf": "middle-east",
+    "world": "around-the-world",
+    "global": "around-the-world",
+    "international": "around-the-world",
+}
+COUNTRY_ALIASES = {
+    "uae": "AE",
+    "emirates": "AE",
+    "dubai": "AE",
+    "abudhabi": "AE",
+    "ksa": "SA",
+    "saudi": "SA",
+    "kingdomofsaudiarabia": "SA",
+    "uk": "GB",
+    "britain": "GB",
+    "greatbritain": "GB",
+    "england": "GB",
+    "us": "US",
+    "usa": "US",
+    "unitedstatesofamerica": "US",
+    "america": "US",
+    "turkiye": "TR",
+    "palestinianterritories": "PS",
+}
+
+
+def _table(location_model):
+    table = {}
+    for pk, code, name in location_model.objects.values_list("pk", "code", "name"):
+        table.setdefault(lookup_key(name), pk)
+        if code:
+            table[lookup_key(code)] = pk
+    return table
+
+
+def _resolve(value, table, aliases, location_model, make_code):
+    key = lookup_key(value)
+    if not key:
+        return None
+    pk = table.get(key) or table.get(lookup_key(aliases.get(key)))
+    if pk is None:
+        # kept as written so no post loses its value; editors can merge it later
+        pk = location_model.objects.create(name=value.strip()[:100], code=make_code(value, location_model)).pk
+        table[key] = pk
+    return pk
+
+
+def _region_code(value, region_model):
+    base = code = slugify(value)[:45] or "region"
+    suffix = 1
+    while region_model.objects.filter(code=code).exists():
+        suffix += 1
+        code = "%s-%d" % (base, suffix)
+    return code
+
+
+def _country_code(value, country_model):
+    return None
+
+
+def map_locations(apps, model_label):
+    """
+    Sets ``region_ref``/``country_ref`` of every row of ``model_label`` from its ``region``/``country``
+    text, with one UPDATE per distinct value.
+    """
+    model = apps.get_model(model_label)
+    for text_field, location_label, aliases, make_code in (
+        ("region", "locations.Region", REGION_ALIASES, _region_code),
+        ("country", "locations.Country", COUNTRY_ALIASES, _country_code),
+    ):
+        location_model = apps.get_model(location_label)
+        table = _table(location_model)
+        values = model.objects.exclude(**{text_field: None}).values_list(text_field, flat=True).distinct()
+        for value in list(values):
+            pk = _resolve(value, table, aliases, location_model, make_code)
+            if pk is not None:
+                model.objects.filter(**{text_field: value}).update(**{text_field + "_ref": pk})
+
+
+def unmap_locations(apps, model_label):
+    model = apps.get_model(model_label)
+    for text_field, location_label in (("region", "locations.Region"), ("country", "locations.Country")):
+        location_model = apps.get_model(location_label)
+        for pk, name in location_model.objects.values_list("pk", "name"):
+            model.objects.filter(**{text_field + "_ref": pk}).update(**{text_field: name})
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+
+from newsletter.locations.models import Country, Region
+
+
+def clear_lookup(sender, **kwargs):
+    sender.objects.clear_lookup()
+
+
+for model in (Region, Country):
+    post_save.connect(clear_lookup, sender=model, dispatch_uid="location-lookup-save-%s" % model.__name__)
+    post_delete.connect(clear_lookup, sender=model, dispatch_uid="location-lookup-delete-%s" % model.__name__)
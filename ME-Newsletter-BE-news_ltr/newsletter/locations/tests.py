@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test.utils import CaptureQueriesContext
+
+from newsletter.locations.models import Country, Region
+
+pytestmark = pytest.mark.django_db
+
+
+def test_resolve_codes_and_names():
+    uae = Country.objects.get(code="AE")
+    assert Country.objects.resolve("ae") == uae.pk
+    assert Country.objects.resolve("United  Arab emirates") == uae.pk
+    assert Country.objects.resolve("Atlantis") is None
+    assert Region.objects.resolve("Middle East") == Region.objects.get(code=Region.MIDDLE_EAST).pk
+
+    atlantis = Country.objects.create(name="Atlantis")
+    assert Country.objects.resolve("atlantis") == atlantis.pk
+    atlantis.delete()
+    assert Country.objects.resolve("atlantis", default=0) == 0
+
+
+def test_misses_do_not_reload_the_table_every_time():
+    Country.objects.clear_lookup()
+    Country.objects.resolve("ae")
+    with CaptureQueriesContext(connection) as context:
+        for number in range(10):
+            assert Country.objects.resolve("nowhere-%d" % number) is None
+    assert not context.captured_queries
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_migration_maps_free_text():
+    executor = MigrationExecutor(connection)
+    executor.migrate([("updates", "0009_location_references"), ("practicals", "0005_practical_newsletter"),
+                      ("search", "0004_related_items")])
+    apps = executor.loader.project_state([("updates", "0009_location_references")]).apps
+    Update = apps.get_model("updates", "Update")
+    for number, (region, country) in enumerate([
+        ("MiddleEast", "UAE"), ("Middle East", "Saudi Arabia"), ("Around The World", "Narnia"), (None, "ksa"),
+    ]):
+        Update.objects.create(title="Update %d" % number, slug="update-%d" % number, region=region, country=country)
+
+    executor = MigrationExecutor(connection)
+    executor.migrate(executor.loader.graph.leaf_nodes())
+    apps = executor.loader.project_state(executor.loader.graph.leaf_nodes()).apps
+    rows = apps.get_model("updates", "Update").objects.order_by("title").values_list(
+        "region__code", "country__code", "country__name"
+    )
+    assert list(rows) == [
+        ("middle-east", "AE", "United Arab Emirates"),
+        ("middle-east", "SA", "Saudi Arabia"),
+        ("around-the-world", None, "Narnia"),
+        (None, "SA", "Saudi Arabia"),
+    ]
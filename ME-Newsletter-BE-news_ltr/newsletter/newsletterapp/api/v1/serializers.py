@@ -1,5 +1,8 @@
-from rest_framework.serializers import ModelSerializer, SerializerMethodField
+from rest_framework.serializers import SerializerMethodField
 
+from newsletter.core.serializers import ModelSerializer, ValuesListSerializer
+from newsletter.locations.managers import UNKNOWN_ID
+from newsletter.locations.models import Region
 from newsletter.newsletterapp.models import NewsLetter
 from newsletter.updates.models import Update
 from newsletter.practicals.models import Practical
@@ -14,9 +17,12 @@ class ListSerializer(ModelSerializer):
     class Meta:
         model = NewsLetter
         fields = ["title", "slug", "image", "description", "publish", "time_to_read", 'updates', 'practicals', "around_the_world"]
+        list_serializer_class = ValuesListSerializer
 
     def get_updates(self, obj):
-        updates = Update.objects.filter(newsletter=obj, region="MiddleEast")
+        updates = Update.objects.filter(
+            newsletter=obj, region_id=Region.objects.resolve(Region.MIDDLE_EAST, default=UNKNOWN_ID)
+        )
         return UpdateListSerializer(updates, many=True).data
     
     def get_practicals(self, obj):
@@ -24,7 +30,9 @@ class ListSerializer(ModelSerializer):
         return PracticalListSerializer(practicals, many=True).data
     
     def get_around_the_world(self,obj):
-        around_the_world = Update.objects.filter(newsletter=obj, region="Around The World")
+        around_the_world = Update.objects.filter(
+            newsletter=obj, region_id=Region.objects.resolve(Region.AROUND_THE_WORLD, default=UNKNOWN_ID)
+        )
         return UpdateListSerializer(around_the_world, many=True).data
     
 
@@ -38,7 +46,9 @@ class DetailSerializer(ModelSerializer):
         fields = ["title", "slug", "image", "description", "publish", "time_to_read", 'updates', 'practicals', 'around_the_world']
 
     def get_updates(self, obj):
-        updates = Update.objects.filter(newsletter=obj, region="MiddleEast")
+        updates = Update.objects.filter(
+            newsletter=obj, region_id=Region.objects.resolve(Region.MIDDLE_EAST, default=UNKNOWN_ID)
+        )
         return UpdateListSerializer(updates, many=True).data
     
     def get_practicals(self, obj):
@@ -46,5 +56,7 @@ class DetailSerializer(ModelSerializer):
         return PracticalListSerializer(practicals, many=True).data
 
     def get_around_the_world(self,obj):
-        around_the_world = Update.objects.filter(newsletter=obj, region="Around The World")
+        around_the_world = Update.objects.filter(
+            newsletter=obj, region_id=Region.objects.resolve(Region.AROUND_THE_WORLD, default=UNKNOWN_ID)
+        )
         return UpdateListSerializer(around_the_world, many=True).data
\ No newline at end of file
@@ -4,6 +4,10 @@ from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
 
+from newsletter.core.cache import cached_get
+from newsletter.core.compression import attach
+from newsletter.newsletterapp.corpus import published_corpus
+from newsletter.newsletterapp.home import get_home_entry
 from newsletter.newsletterapp.models import NewsLetter
 from newsletter.newsletterapp.api.v1.serializers import ListSerializer, DetailSerializer
     
@@ -12,6 +16,7 @@ from newsletter.newsletterapp.api.v1.serializers import ListSerializer, DetailSe
 class NewsLetterListView(APIView):
     authentication_classes = ()
     permission_classes = ()
+    batchable = True
 
     @extend_schema(
         summary="List all newsletters",
@@ -38,7 +43,11 @@ class NewsLetterListView(APIView):
             )
         ]
     )
+    @cached_get()
     def get(self,request):
+        corpus = published_corpus.get()
+        if corpus is not None:
+            return Response({"result": corpus.with_content(corpus.newsletters)}, status=status.HTTP_200_OK)
         queryset=NewsLetter.objects.active().all()
         serializer = ListSerializer(queryset, many=True)
         return Response({"result":serializer.data}, status=status.HTTP_200_OK)
@@ -46,8 +55,13 @@ class NewsLetterListView(APIView):
 class NewsLetterRecentListView(APIView):
     authentication_classes = ()
     permission_classes = ()
+    batchable = True
 
+    @cached_get()
     def get(self,request):
+        corpus = published_corpus.get()
+        if corpus is not None:
+            return Response({"result": corpus.with_content(corpus.newsletters[:4])}, status=status.HTTP_200_OK)
         queryset=NewsLetter.objects.active().order_by("-created")[:4]
         serializer = ListSerializer(queryset, many=True)
         return Response({"result":serializer.data}, status=status.HTTP_200_OK)        
@@ -55,9 +69,15 @@ class NewsLetterRecentListView(APIView):
 class NewstLetterDetailView(APIView):
     authentication_classes = ()
     permission_classes = ()
+    batchable = True
 
+    @cached_get()
     def get(self, request, slug):
         if slug:
+            corpus = published_corpus.get()
+            if corpus is not None:
+                newsletters = corpus.with_content(corpus.newsletters_by_slug(slug))
+                return Response({"result": newsletters}, status=status.HTTP_200_OK)
             queryset=NewsLetter.objects.active().filter(slug=slug)
             serilaizer = DetailSerializer(queryset, many=True)
             return Response({"result":serilaizer.data}, status=status.HTTP_200_OK)
@@ -66,7 +86,27 @@ class NewstLetterDetailView(APIView):
 class PreviousNewsLetterView(APIView):
     authentication_classes = ()
     permission_classes = ()
+    batchable = True
+    @cached_get()
     def get(self,request):
+        corpus = published_corpus.get()
+        if corpus is not None:
+            return Response({"result": corpus.with_content(corpus.newsletters[1:])}, status=status.HTTP_200_OK)
         queryset=NewsLetter.objects.active().order_by("-created")[1:]
         serializer = ListSerializer(queryset, many=True)
-        return Response({"result":serializer.data}, status=status.HTTP_200_OK)        
\ No newline at end of file
+        return Response({"result":serializer.data}, status=status.HTTP_200_OK)
+
+
+class HomeView(APIView):
+    authentication_classes = ()
+    permission_classes = ()
+    batchable = True
+
+    @extend_schema(
+        summary="Home page",
+        description="Recent newsletters, updates and practicals in one cached response",
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        document, compressed = get_home_entry()
+        return attach(Response({"result": document}, status=status.HTTP_200_OK), compressed)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class NewsLetterAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'newsletter.newsletterapp'
+
+    def ready(self):
+        import newsletter.newsletterapp.signals  # noqa F401
@@ -0,0 +1,204 @@
+"""
+Immutable per-worker snapshot of the published corpus: the list representations of the active
+newsletters, updates and practicals, indexed by slug, newsletter and region, so the read
+endpoints answer from memory instead of the database.
+
+A snapshot is tagged with the version of the object cache's ``content`` namespace, which the post
+and location signals replace after every commit and ``RedisObjectCache`` broadcasts to the other
+workers and nodes. The first read seeing a new version builds the next snapshot and swaps it in;
+meanwhile the other threads read from the database, since what they build is cached under the new
+version.
+
+The ``content`` of an update, the bulk of a row, is kept once per update rather than in every list
+holding the update; ``Corpus.with_content()`` puts it back into the rows a response returns.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict
+from types import MappingProxyType
+
+from newsletter.core.cache import CONTENT, bypassed, get_object_cache
+from newsletter.newsletterapp.api.v1.serializers import ListSerializer
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.api.v1.serializers import PracticalListSerializer
+from newsletter.practicals.models import Practical
+from newsletter.updates.api.v1.serializers import UpdateListSerializer
+from newsletter.updates.models import Update
+
+logger = logging.getLogger(__name__)
+
+
+def footprint(value, seen=None):
+    """
+    Bytes held by ``value`` and everything it contains, each object counted once.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (dict, MappingProxyType)):
+        size += sum(footprint(key, seen) + footprint(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(footprint(item, seen) for item in value)
+    return size
+
+
+def _freeze(index):
+    return MappingProxyType({key: tuple(items) for key, items in index.items()})
+
+
+# lists of updates in the newsletter representation
+NESTED_UPDATES = ("updates", "around_the_world")
+
+
+def _without_content(update):
+    # the key stays, so the fields keep their order
+    return dict(update, content=None)
+
+
+def _strip_newsletter(newsletter):
+    return dict(newsletter, **{
+        field: [_without_content(update) for update in newsletter[field]] for field in NESTED_UPDATES
+    })
+
+
+class Corpus:
+    """
+    One snapshot. ``newsletters``, ``updates`` and ``practicals`` are newest first; ``issues``
+    are the ids of every newsletter by ``-publish``, the pages of the updates list.
+    """
+
+    def __init__(self, version, newsletters, updates, update_keys, practicals, issues, load_seconds=0.0):
+        self.version = version
+        contents = {update["id"]: update["content"] for update in updates}
+        for newsletter in newsletters:
+            for field in NESTED_UPDATES:
+                contents.update((update["id"], update["content"]) for update in newsletter[field])
+        self._contents = MappingProxyType(contents)
+        self.newsletters = tuple(_strip_newsletter(newsletter) for newsletter in newsletters)
+        self.practicals = tuple(practicals)
+        self.issues = tuple(issues)
+        # updates missing from update_keys were added between the two queries of the load
+        self.updates = tuple(_without_content(update) for update in updates if update["id"] in update_keys)
+
+        by_slug = defaultdict(list)
+        for newsletter in self.newsletters:
+            by_slug[newsletter["slug"]].append(newsletter)
+        by_issue, by_region = defaultdict(list), defaultdict(list)
+        # updates have no default ordering: by id, as the table is read
+        for update in sorted(self.updates, key=lambda update: update["id"]):
+            newsletter_id, region_id, _publish = update_keys[update["id"]]
+            by_issue[newsletter_id, region_id].append(update)
+        for update in sorted(self.updates, key=lambda update: update_keys[update["id"]][2], reverse=True):
+            by_region[update_keys[update["id"]][1]].append(update)
+        self._by_slug = _freeze(by_slug)
+        self._by_issue = _freeze(by_issue)
+        self._by_region = _freeze(by_region)
+
+        self.stats = MappingProxyType({
+            "version": version,
+            "newsletters": len(self.newsletters),
+            "updates": len(self.updates),
+            "practicals": len(self.practicals),
+            "bytes": footprint(vars(self)),
+            "load_seconds": round(load_seconds, 3),
+        })
+
+    def with_content(self, rows):
+        """
+        Copies of this snapshot's updates, or newsletters with their nested updates, with the
+        ``content`` of each update.
+        """
+        def fill(update):
+            return dict(update, content=self._contents.get(update["id"]))
+
+        filled = []
+        for row in rows:
+            if "content" in row:
+                row = fill(row)
+            for field in NESTED_UPDATES:
+                if field in row:
+                    row = dict(row, **{field: [fill(update) for update in row[field]]})
+            filled.append(row)
+        return filled
+
+    def newsletters_by_slug(self, slug):
+        return self._by_slug.get(slug, ())
+
+    def updates_of(self, newsletter_id, region_id):
+        """
+        Updates of one newsletter in one region, by id.
+        """
+        return self._by_issue.get((newsletter_id, region_id), ())
+
+    def updates_in(self, region_id):
+        """
+        Updates of a region by ``-publish``.
+        """
+        return self._by_region.get(region_id, ())
+
+
+def load_corpus(version):
+    started = time.monotonic()
+    updates = Update.objects.active().order_by("-created", "-modified")
+    rows = updates.values_list("pk", "newsletter_id", "region_id", "publish")
+    update_keys = {pk: (newsletter_id, region_id, publish) for pk, newsletter_id, region_id, publish in rows}
+    return Corpus(
+        version,
+        newsletters=ListSerializer(NewsLetter.objects.active().order_by("-created", "-modified"), many=True).data,
+        updates=UpdateListSerializer(updates, many=True).data,
+        update_keys=update_keys,
+        practicals=PracticalListSerializer(
+            Practical.objects.active().order_by("-created", "-modified"), many=True
+        ).data,
+        # every newsletter, as the pages always were
+        issues=tuple(NewsLetter.objects.order_by("-publish").values_list("pk", flat=True)),
+        load_seconds=time.monotonic() - started,
+    )
+
+
+class PublishedCorpus:
+    """
+    The worker's current ``Corpus``.
+    """
+
+    def __init__(self):
+        self._corpus = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        The snapshot of the current content version; ``None`` where reads must go to the
+        database, like inside ``batch.snapshot()`` or while another thread loads the snapshot
+        of a new version.
+        """
+        if bypassed():
+            return None
+        version = get_object_cache().version(CONTENT)
+        corpus = self._corpus
+        if corpus is not None and corpus.version == version:
+            return corpus
+        # only the first load makes readers wait; an older snapshot must not be served, as
+        # responses built from it would be cached under the new version
+        if not self._lock.acquire(blocking=corpus is None):
+            return None
+        try:
+            if self._corpus is None or self._corpus.version != version:
+                self._corpus = load_corpus(version)
+                logger.info("Loaded published corpus %s", dict(self._corpus.stats))
+            return self._corpus
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        with self._lock:
+            self._corpus = None
+
+
+published_corpus = PublishedCorpus()
@@ -0,0 +1,55 @@
+"""
+The home page document: recent newsletters, updates and practicals in one cached dict.
+
+It is built on the first request after a content change and served from the object cache until
+the next one; the timeout only bounds staleness after bulk ``update()`` calls, which send no
+signals. The cache also holds the response body compressed once, for ``CompressionMiddleware``.
+"""
+from __future__ import unicode_literals, absolute_import
+
+from newsletter.core.cache import CONTENT, get_object_cache
+from newsletter.core.compression import precompress
+from newsletter.core.renderers import ORJSONRenderer
+from newsletter.newsletterapp.api.v1.serializers import ListSerializer
+from newsletter.newsletterapp.corpus import published_corpus
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.api.v1.serializers import PracticalListSerializer
+from newsletter.practicals.models import Practical
+from newsletter.updates.api.v1.serializers import UpdateListSerializer
+from newsletter.updates.models import Update
+
+TIMEOUT = 60 * 60
+
+
+def build_home():
+    """
+    Same sections as the ``*-recent-list/`` endpoints.
+    """
+    corpus = published_corpus.get()
+    if corpus is not None:
+        return {
+            "newsletters": corpus.with_content(corpus.newsletters[:4]),
+            "updates": corpus.with_content(corpus.updates[:4]),
+            "practicals": list(corpus.practicals[:2]),
+        }
+    return {
+        "newsletters": ListSerializer(NewsLetter.objects.active().order_by("-created")[:4], many=True).data,
+        "updates": UpdateListSerializer(Update.objects.active().order_by("-created")[:4], many=True).data,
+        "practicals": PracticalListSerializer(Practical.objects.active().order_by("-created")[:2], many=True).data,
+    }
+
+
+def get_home_entry():
+    """
+    ``(document, compressed body of {"result": document})``.
+    """
+
+    def build():
+        document = build_home()
+        return document, precompress(ORJSONRenderer().render({"result": document}))
+
+    return get_object_cache().get_or_set(CONTENT, "home", build, TIMEOUT)
+
+
+def get_home():
+    return get_home_entry()[0]
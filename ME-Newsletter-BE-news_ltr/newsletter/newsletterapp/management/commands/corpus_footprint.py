@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from newsletter.newsletterapp.corpus import published_corpus
+
+
+class Command(BaseCommand):
+    help = "Load the published corpus snapshot and report its size and memory footprint"
+
+    def handle(self, *args, **options):
+        stats = published_corpus.get().stats
+        self.stdout.write(
+            "%(newsletters)d newsletters, %(updates)d updates, %(practicals)d practicals" % stats
+        )
+        self.stdout.write(self.style.SUCCESS(
+            "%.1f MiB per worker, loaded in %.3fs" % (stats["bytes"] / 2 ** 20, stats["load_seconds"])
+        ))
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from newsletter.locations.normalize import map_locations, unmap_locations
+
+
+def forwards(apps, schema_editor):
+    map_locations(apps, "newsletterapp.NewsLetter")
+
+
+def backwards(apps, schema_editor):
+    unmap_locations(apps, "newsletterapp.NewsLetter")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletterapp', '0009_location_references'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
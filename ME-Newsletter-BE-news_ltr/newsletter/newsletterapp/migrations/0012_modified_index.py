@@ -0,0 +1,21 @@
+# Generated by Django 3.2.11 on 2026-10-19 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('newsletterapp', '0011_location_foreign_keys'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='newsletter',
+            options={'ordering': ['-created', '-modified'], 'verbose_name': 'News Letter'},
+        ),
+        migrations.AddIndex(
+            model_name='newsletter',
+            index=models.Index(fields=['modified', 'id'], name='newsletter_modified_idx'),
+        ),
+    ]
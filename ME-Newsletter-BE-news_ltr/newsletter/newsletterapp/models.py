@@ -1,18 +1,31 @@
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
+from model_utils import FieldTracker
 
 from newsletter.core.behaviors import PostMixin
+from newsletter.locations.managers import LocatedPostManager
+from newsletter.locations.models import Country, Region
 
 
 class NewsLetter(PostMixin):
     """
     News Letter Model
     """
-    region = models.CharField(_("Region"), max_length=100 ,null=True, blank=True)
-    country = models.CharField(_("Country"), max_length=100 ,null=True, blank=True)
+    region = models.ForeignKey(
+        Region, verbose_name=_("Region"), on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="newsletters",
+    )
+    country = models.ForeignKey(
+        Country, verbose_name=_("Country"), on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="newsletters",
+    )
+
+    objects = LocatedPostManager()
+    tracker = FieldTracker(fields=["is_active", "is_deleted"])
 
     def __str__(self):
         return self.title
         
-    class Mets:
-        verbose_name = "News Letter"
\ No newline at end of file
+    class Meta(PostMixin.Meta):
+        verbose_name = "News Letter"
+        indexes = [models.Index(fields=["modified", "id"], name="newsletter_modified_idx")]
\ No newline at end of file
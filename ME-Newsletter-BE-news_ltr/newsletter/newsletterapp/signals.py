@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from newsletter.core.cache import CONTENT, get_object_cache
+from newsletter.locations.models import Country, Region
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.models import Practical
+from newsletter.updates.models import Update
+
+
+def invalidate_content():
+    get_object_cache().invalidate(CONTENT)
+
+
+def invalidate_content_on_change(sender, raw=False, **kwargs):
+    if not raw:
+        transaction.on_commit(invalidate_content)
+
+
+# locations too: their names are part of the serialized posts
+for model in (NewsLetter, Update, Practical, Region, Country):
+    post_save.connect(invalidate_content_on_change, sender=model, dispatch_uid="content-save-%s" % model.__name__)
+    post_delete.connect(invalidate_content_on_change, sender=model, dispatch_uid="content-delete-%s" % model.__name__)
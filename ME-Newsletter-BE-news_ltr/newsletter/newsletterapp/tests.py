@@ -1,3 +1,116 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from newsletter.core.cache import CONTENT, bypass, get_object_cache
+from newsletter.locations.models import Region
+from newsletter.newsletterapp.corpus import published_corpus
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.models import Practical
+from newsletter.updates.models import Update
+
+pytestmark = pytest.mark.django_db
+
+
+def test_home_matches_recent_lists_and_is_cached(client):
+    NewsLetter.objects.create(title="Issue 1")
+    Update.objects.create(title="Oil prices")
+    Practical.objects.create(title="Visa rules")
+
+    home = client.get("/api/v1/home/").json()["result"]
+    assert home["newsletters"] == client.get("/api/v1/news-letter-recent-list/").json()["result"]
+    assert home["updates"] == client.get("/api/v1/update-recent-list/").json()["result"]
+    assert home["practicals"] == client.get("/api/v1/practical-recent-list/").json()["result"]
+
+    with CaptureQueriesContext(connection) as context:
+        assert client.get("/api/v1/home/").json()["result"] == home
+    assert not [query for query in context.captured_queries if query["sql"].startswith("SELECT")]
+
+
+def test_home_is_rebuilt_after_changes(client, django_capture_on_commit_callbacks):
+    update = Update.objects.create(title="Oil prices")
+    assert client.get("/api/v1/home/").json()["result"]["updates"][0]["title"] == "Oil prices"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        update.title = "Gas prices"
+        update.save()
+    assert client.get("/api/v1/home/").json()["result"]["updates"][0]["title"] == "Gas prices"
+
+
+CORPUS_PATHS = [
+    "/api/v1/news-letter-list/",
+    "/api/v1/news-letter-recent-list/",
+    "/api/v1/news-letter-detail/issue-1/",
+    "/api/v1/news-letter-detail/missing/",
+    "/api/v1/prev-news-letter-list/",
+    "/api/v1/update-recent-list/",
+    "/api/v1/update-list/",
+    "/api/v1/update-list/?region=middle-east&page=1",
+    "/api/v1/update-list/?region=around-the-world&page=2",
+    "/api/v1/update-list/?region=middle-east&page=3",
+    "/api/v1/update-list/?region=middle-east&page=0",
+    "/api/v1/practical-recent-list/",
+    "/api/v1/home/",
+]
+
+
+@pytest.fixture
+def corpus_posts():
+    middle_east = Region.objects.get(code=Region.MIDDLE_EAST)
+    around_the_world = Region.objects.get(code=Region.AROUND_THE_WORLD)
+    now = timezone.now()
+    first = NewsLetter.objects.create(title="Issue 1", slug="issue-1", publish=now - timedelta(days=7))
+    second = NewsLetter.objects.create(title="Issue 2", slug="issue-2", publish=now)
+    NewsLetter.objects.create(title="Draft", slug="draft", is_active=False, publish=now - timedelta(days=14))
+    for number, issue in enumerate([first, second, first, second]):
+        Update.objects.create(
+            title="Update %d" % number, newsletter=issue, publish=now - timedelta(days=number),
+            region=middle_east if number % 2 else around_the_world,
+        )
+    Update.objects.create(title="Hidden", newsletter=second, region=middle_east, is_active=False)
+    Practical.objects.create(title="Visa rules", newsletter=first, region=middle_east)
+
+
+def test_corpus_serves_the_same_responses(client, corpus_posts):
+    with bypass():
+        expected = {path: (client.get(path).status_code, client.get(path).json()) for path in CORPUS_PATHS}
+    for path in CORPUS_PATHS:
+        response = client.get(path)
+        assert (response.status_code, response.json()) == expected[path], path
+
+
+def test_corpus_reads_without_queries_and_reloads(client, corpus_posts, django_capture_on_commit_callbacks):
+    client.get("/api/v1/home/")
+    with CaptureQueriesContext(connection) as context:
+        for path in CORPUS_PATHS:
+            client.get(path)
+    assert not [query for query in context.captured_queries if query["sql"].startswith("SELECT")]
+    # the HTML is held once per update, not in every list showing it
+    assert all(update["content"] is None for update in published_corpus.get().updates)
+
+    previous = published_corpus.get()
+    with django_capture_on_commit_callbacks(execute=True):
+        Update.objects.filter(title="Update 3").get().remove()
+    recent = client.get("/api/v1/update-recent-list/").json()["result"]
+    assert [update["title"] for update in recent] == ["Update 2", "Update 1", "Update 0"]
+    assert published_corpus.get() is not previous
+    assert previous.stats["updates"] == 4 and published_corpus.get().stats["updates"] == 3
+
+
+def test_no_stale_corpus_while_the_next_one_loads(client, corpus_posts):
+    previous = published_corpus.get()
+    get_object_cache().invalidate(CONTENT)
+    with published_corpus._lock:
+        # what another thread loading the new version looks like
+        assert published_corpus.get() is None
+    assert published_corpus.get().version != previous.version
+
+
+def test_corpus_footprint_command(capsys, corpus_posts):
+    call_command("corpus_footprint")
+    output = capsys.readouterr().out
+    assert "2 newsletters, 4 updates, 1 practicals" in output and "MiB per worker" in output
@@ -1,13 +1,28 @@
-from rest_framework.serializers import ModelSerializer, Serializer
+from rest_framework.serializers import Serializer, SerializerMethodField, StringRelatedField
 
+from newsletter.core.serializers import ModelSerializer, ValuesListSerializer
 from newsletter.practicals.models import Practical
+from newsletter.search.api.v1.serializers import RelatedItemSerializer
+from newsletter.search.models import RelatedItem, SearchEntry
 
 class PracticalListSerializer(ModelSerializer):
+    region = StringRelatedField()
+
     class Meta:
         model = Practical
         fields = ["slug","title", "description", "image", "region", "author", "publish", "time_to_read"]
+        list_serializer_class = ValuesListSerializer
+        values_sources = {"region": "region__name"}
 
 class PracticalDetailSerializer(ModelSerializer):
+    region = StringRelatedField()
+    country = StringRelatedField()
+    related = SerializerMethodField()
+
     class Meta:
         model = Practical
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+    def get_related(self, obj):
+        related = RelatedItem.objects.for_object(SearchEntry.PRACTICAL, obj.pk)
+        return RelatedItemSerializer(related, many=True).data
@@ -3,17 +3,25 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 
+from newsletter.core.cache import cached_get
+from newsletter.newsletterapp.corpus import published_corpus
 from newsletter.practicals.models import Practical
+from newsletter.practicals.api.v1.filters import PracticalFilter
 from newsletter.practicals.api.v1.serializers import PracticalListSerializer, PracticalDetailSerializer
 
 class PracticalListView(APIView, PageNumberPagination):
     permission_classes = ()
     authentication_classes = ()
+    batchable = True
     queryset = Practical.objects.active()
     page_size = 10
 
+    @cached_get(params=("region", "country", "year", "page"))
     def get(self, request):
-        articals = self.queryset.all()
+        filterset = PracticalFilter(request.GET, queryset=self.queryset.all())
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        articals = filterset.qs
         results = self.paginate_queryset(articals, request, view=self)
         serializer = PracticalListSerializer(results, many=True)
         return self.get_paginated_response(serializer.data)
@@ -21,9 +29,14 @@ class PracticalListView(APIView, PageNumberPagination):
 class PracticalRecentView(APIView):
     permission_classes = ()
     authentication_classes = ()
+    batchable = True
     queryset = Practical.objects.active()
 
+    @cached_get()
     def get(self, request):
+        corpus = published_corpus.get()
+        if corpus is not None:
+            return Response({"result": list(corpus.practicals[:2])}, status=status.HTTP_200_OK)
         queryset = self.queryset.order_by("-created")[:2]
         serializer = PracticalListSerializer(queryset, many=True)
         return Response({"result":serializer.data}, status=status.HTTP_200_OK)
@@ -32,8 +45,10 @@ class PracticalRecentView(APIView):
 class PracticalDetailView(APIView):
     permission_classes = ()
     authentication_classes = ()
+    batchable = True
     queryset = Practical.objects.all()
 
+    @cached_get()
     def get(self, request, slug):
         queryset = self.queryset.filter(slug=slug)
         serializer = PracticalDetailSerializer(queryset, many=True)
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_seed_locations'),
+        ('practicals', '0005_practical_newsletter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='practical',
+            name='region_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='practicals', to='locations.region', verbose_name='Region'),
+        ),
+        migrations.AddField(
+            model_name='practical',
+            name='country_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='practicals', to='locations.country', verbose_name='Country'),
+        ),
+    ]
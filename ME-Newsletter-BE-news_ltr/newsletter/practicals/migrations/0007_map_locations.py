@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from newsletter.locations.normalize import map_locations, unmap_locations
+
+
+def forwards(apps, schema_editor):
+    map_locations(apps, "practicals.Practical")
+
+
+def backwards(apps, schema_editor):
+    unmap_locations(apps, "practicals.Practical")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practicals', '0006_location_references'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practicals', '0007_map_locations'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='practical',
+            name='region',
+        ),
+        migrations.RemoveField(
+            model_name='practical',
+            name='country',
+        ),
+        migrations.RenameField(
+            model_name='practical',
+            old_name='region_ref',
+            new_name='region',
+        ),
+        migrations.RenameField(
+            model_name='practical',
+            old_name='country_ref',
+            new_name='country',
+        ),
+    ]
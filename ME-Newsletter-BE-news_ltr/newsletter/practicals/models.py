@@ -1,17 +1,31 @@
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
+from model_utils import FieldTracker
 
 from newsletter.core.behaviors import PostMixin
 from newsletter.newsletterapp.models import NewsLetter
+from newsletter.locations.managers import LocatedPostManager
+from newsletter.locations.models import Country, Region
 
 
 class Practical(PostMixin):   
     newsletter = models.ForeignKey(NewsLetter, on_delete=models.CASCADE ,blank=True, null=True)
-    region = models.CharField(_("Region"), max_length=100 ,null=True, blank=True)
-    country = models.CharField(_("Country"), max_length=100 ,null=True, blank=True)
+    region = models.ForeignKey(
+        Region, verbose_name=_("Region"), on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="practicals",
+    )
+    country = models.ForeignKey(
+        Country, verbose_name=_("Country"), on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="practicals",
+    )
+
+    objects = LocatedPostManager()
+
+    tracker = FieldTracker(fields=["region", "country", "publish", "is_active", "is_deleted"])
 
     def __str__(self):
         return self.title
         
     class Meta:
-        verbose_name = "Practical"
\ No newline at end of file
+        verbose_name = "Practical"
+        indexes = [models.Index(fields=["modified", "id"], name="practical_modified_idx")]
\ No newline at end of file
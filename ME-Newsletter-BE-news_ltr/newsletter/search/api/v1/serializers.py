@@ -0,0 +1,45 @@
+from django.utils.html import escape
+from rest_framework.serializers import (
+    CharField, DateTimeField, FloatField, IntegerField, Serializer, SerializerMethodField,
+)
+
+from newsletter.search.backends import HIGHLIGHT_START, HIGHLIGHT_STOP
+
+
+def highlight_html(value):
+    """
+    Escapes indexed text and turns the backend's match markers into ``<mark>`` tags.
+    """
+    return escape(value or "").replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+
+class SearchHitSerializer(Serializer):
+    type = CharField(source="kind")
+    id = IntegerField(source="object_id")
+    title = CharField()
+    slug = CharField()
+    publish = DateTimeField()
+    title_highlight = SerializerMethodField()
+    snippet = SerializerMethodField()
+
+    def get_title_highlight(self, obj):
+        return highlight_html(obj["title_highlight"])
+
+    def get_snippet(self, obj):
+        return highlight_html(obj["snippet"])
+
+
+class SuggestionSerializer(Serializer):
+    type = CharField(source="kind")
+    id = IntegerField(source="object_id")
+    title = CharField()
+    slug = CharField()
+
+
+class RelatedItemSerializer(Serializer):
+    type = CharField(source="target.kind")
+    id = IntegerField(source="target.object_id")
+    title = CharField(source="target.title")
+    slug = CharField(source="target.slug")
+    publish = DateTimeField(source="target.publish")
+    score = FloatField()
@@ -0,0 +1,116 @@
+import base64
+import binascii
+import json
+
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
+
+from newsletter.search.api.v1.serializers import SearchHitSerializer, SuggestionSerializer
+from newsletter.search.autocomplete import autocomplete_index
+from newsletter.search.backends import get_backend
+from newsletter.search.facets import DIMENSIONS, FACETED_MODELS, facet_counts
+from newsletter.search.models import SearchEntry
+
+MAX_LIMIT = 50
+MAX_SUGGESTIONS = 20
+
+
+def encode_cursor(hit):
+    return base64.urlsafe_b64encode(json.dumps([hit["rank"], hit["id"]]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    rank, entry_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return float(rank), int(entry_id)
+
+
+class SearchView(APIView):
+    permission_classes = ()
+    authentication_classes = ()
+    batchable = True
+
+    @extend_schema(
+        summary="Search newsletters, updates and practicals",
+        description="Ranked full-text search with highlighted titles and snippets, paginated with `next` cursors",
+        parameters=[
+            OpenApiParameter("q", OpenApiTypes.STR, required=True),
+            OpenApiParameter("type", OpenApiTypes.STR, description="Comma separated: newsletter, update, practical"),
+            OpenApiParameter("cursor", OpenApiTypes.STR, description="`next` value of the previous page"),
+            OpenApiParameter("limit", OpenApiTypes.INT, description="Hits per page, at most %d" % MAX_LIMIT),
+        ],
+        responses={200: SearchHitSerializer(many=True), 400: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        query = request.GET.get("q", "").strip()
+        if not query:
+            return Response({"result": "q is not given"}, status=status.HTTP_400_BAD_REQUEST)
+        kinds = [kind for kind in request.GET.get("type", "").split(",") if kind]
+        if set(kinds) - {kind for kind, _label in SearchEntry.KIND_CHOICES}:
+            return Response({"result": "Unknown type"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.GET.get("limit", 20)), MAX_LIMIT))
+            after = decode_cursor(request.GET["cursor"]) if request.GET.get("cursor") else None
+        except (ValueError, TypeError, binascii.Error):
+            return Response({"result": "Invalid limit or cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+        hits = get_backend().search(query, kinds=kinds, after=after, limit=limit + 1)
+        next_cursor = encode_cursor(hits[limit - 1]) if len(hits) > limit else None
+        return Response(
+            {"results": SearchHitSerializer(hits[:limit], many=True).data, "next": next_cursor},
+            status=status.HTTP_200_OK,
+        )
+
+
+class FacetView(APIView):
+    permission_classes = ()
+    authentication_classes = ()
+    batchable = True
+
+    @extend_schema(
+        summary="Filter facets for updates or practicals",
+        description="Counts per region, country and year, each restricted by the other selected filters",
+        parameters=[
+            OpenApiParameter("type", OpenApiTypes.STR, required=True, enum=sorted(FACETED_MODELS)),
+            OpenApiParameter("region", OpenApiTypes.STR, description="Region code or name"),
+            OpenApiParameter("country", OpenApiTypes.STR, description="ISO country code or name"),
+            OpenApiParameter("year", OpenApiTypes.INT),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        kind = request.GET.get("type")
+        if kind not in FACETED_MODELS:
+            return Response({"result": "type must be one of %s" % ", ".join(sorted(FACETED_MODELS))},
+                            status=status.HTTP_400_BAD_REQUEST)
+        selected = {dimension: request.GET.get(dimension) for dimension in DIMENSIONS}
+        return Response({"result": facet_counts(kind, selected)}, status=status.HTTP_200_OK)
+
+
+class AutocompleteView(APIView):
+    permission_classes = ()
+    authentication_classes = ()
+    batchable = True
+
+    @extend_schema(
+        summary="Title suggestions",
+        description="Active posts with a title word or slug starting with `q`, served from memory",
+        parameters=[
+            OpenApiParameter("q", OpenApiTypes.STR, required=True),
+            OpenApiParameter("type", OpenApiTypes.STR, description="Comma separated: newsletter, update, practical"),
+            OpenApiParameter("limit", OpenApiTypes.INT, description="At most %d" % MAX_SUGGESTIONS),
+        ],
+        responses={200: SuggestionSerializer(many=True), 400: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        kinds = [kind for kind in request.GET.get("type", "").split(",") if kind]
+        if set(kinds) - {kind for kind, _label in SearchEntry.KIND_CHOICES}:
+            return Response({"result": "Unknown type"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.GET.get("limit", 8)), MAX_SUGGESTIONS))
+        except ValueError:
+            return Response({"result": "Invalid limit"}, status=status.HTTP_400_BAD_REQUEST)
+        suggestions = autocomplete_index.lookup(request.GET.get("q", ""), limit=limit, kinds=kinds)
+        return Response({"result": SuggestionSerializer(suggestions, many=True).data}, status=status.HTTP_200_OK)
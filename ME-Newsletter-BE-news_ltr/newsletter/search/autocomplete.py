@@ -0,0 +1,191 @@
+"""
+Per-worker prefix index over the titles and slugs of active posts, answering autocomplete
+lookups with a binary search instead of ``title__istartswith`` queries.
+
+The index is a sorted list of keys (the lowercased title, every word-suffix of the title and
+the slug) pointing at the post. Changes made by this worker swap in an updated copy; a
+version counter in the shared cache tells the other workers to reload, which they check at
+most every ``CHECK_INTERVAL`` seconds.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import namedtuple
+
+# django imports
+from django.core.cache import cache
+
+from newsletter.search.models import SearchEntry
+
+VERSION_KEY = "search:autocomplete:version"
+CHECK_INTERVAL = 1.0
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+Suggestion = namedtuple("Suggestion", ["kind", "object_id", "title", "slug", "publish"])
+
+
+def normalize(value):
+    return " ".join(WORD_RE.findall((value or "").lower()))
+
+
+def index_keys(suggestion):
+    words = normalize(suggestion.title).split(" ")
+    keys = {" ".join(words[position:]) for position in range(len(words))}
+    keys.add(normalize(suggestion.slug))
+    keys.discard("")
+    return keys
+
+
+class PrefixIndex:
+    """
+    Immutable: ``added()`` and ``without()`` return a new index, so lookups running meanwhile
+    keep reading the old one.
+    """
+
+    def __init__(self, suggestions=()):
+        self._suggestions = {}
+        pairs = []
+        for suggestion in suggestions:
+            self._suggestions[suggestion[:2]] = suggestion
+            pairs.extend((key, suggestion[:2]) for key in index_keys(suggestion))
+        pairs.sort()
+        # parallel arrays: bisect runs over plain strings
+        self._keys = [key for key, _ident in pairs]
+        self._idents = [ident for _key, ident in pairs]
+
+    def _copy(self):
+        index = PrefixIndex()
+        index._keys, index._idents, index._suggestions = list(self._keys), list(self._idents), dict(self._suggestions)
+        return index
+
+    def __len__(self):
+        return len(self._suggestions)
+
+    def added(self, suggestion):
+        index = self.without(suggestion[:2])
+        if index is self:
+            index = self._copy()
+        index._suggestions[suggestion[:2]] = suggestion
+        for key in index_keys(suggestion):
+            position = bisect_left(index._keys, key)
+            index._keys.insert(position, key)
+            index._idents.insert(position, suggestion[:2])
+        return index
+
+    def without(self, ident):
+        if ident not in self._suggestions:
+            return self
+        index = self._copy()
+        suggestion = index._suggestions.pop(ident)
+        for key in index_keys(suggestion):
+            position = bisect_left(index._keys, key)
+            while position < len(index._keys) and index._keys[position] == key:
+                if index._idents[position] == ident:
+                    del index._keys[position], index._idents[position]
+                    break
+                position += 1
+        return index
+
+    def lookup(self, prefix, limit=10, kinds=None):
+        """
+        Suggestions with a title word or slug starting with ``prefix``; titles starting with it
+        come first, then the most recently published.
+        """
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        found = {}
+        position = bisect_left(self._keys, prefix)
+        # candidates are capped so a one-letter prefix stays cheap
+        while position < len(self._keys) and len(found) < limit * 5:
+            key = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            suggestion = self._suggestions[self._idents[position]]
+            if not kinds or suggestion.kind in kinds:
+                found.setdefault(suggestion[:2], suggestion)
+            position += 1
+        return sorted(
+            found.values(),
+            key=lambda suggestion: (
+                not normalize(suggestion.title).startswith(prefix),
+                -suggestion.publish.timestamp(),
+            ),
+        )[:limit]
+
+
+class AutocompleteIndex:
+    """
+    The worker's ``PrefixIndex``, kept current with the shared version counter.
+    """
+
+    def __init__(self):
+        self._index = None
+        self._version = None
+        self._checked = 0
+        self._lock = threading.Lock()
+
+    def _shared_version(self):
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, 1, None)
+            version = cache.get(VERSION_KEY, 1)
+        return version
+
+    def _load(self):
+        version = self._shared_version()
+        suggestions = (
+            Suggestion(*row)
+            for row in SearchEntry.objects.values_list("kind", "object_id", "title", "slug", "publish").iterator()
+        )
+        self._index, self._version, self._checked = PrefixIndex(suggestions), version, time.monotonic()
+
+    def get(self):
+        with self._lock:
+            if self._index is None:
+                self._load()
+            elif time.monotonic() - self._checked >= CHECK_INTERVAL:
+                self._checked = time.monotonic()
+                if self._shared_version() != self._version:
+                    self._load()
+            return self._index
+
+    def _bump(self):
+        try:
+            return cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 1, None)
+            return None
+
+    def changed(self, apply=None):
+        """
+        Records a change to the indexed posts; ``apply`` returns this worker's updated index.
+        """
+        version = self._bump()
+        with self._lock:
+            if self._index is None:
+                return
+            if apply is not None and version is not None and version == self._version + 1:
+                # nobody else changed anything since our last load
+                self._index = apply(self._index)
+                self._version = version
+            else:
+                self._index = None
+
+    def clear(self):
+        with self._lock:
+            self._index = None
+
+    def lookup(self, prefix, limit=10, kinds=None):
+        return self.get().lookup(prefix, limit, kinds)
+
+
+autocomplete_index = AutocompleteIndex()
+
+
+def entry_suggestion(entry):
+    return Suggestion(entry.kind, entry.object_id, entry.title, entry.slug, entry.publish)
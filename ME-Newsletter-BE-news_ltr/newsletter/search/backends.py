@@ -0,0 +1,159 @@
+"""
+Ranked full-text queries over ``SearchEntry``, one implementation per database.
+
+Hits are ordered by ``(rank DESC, id ASC)`` and paginated on that key: the next page starts
+after the last ``(rank, id)`` seen, so deep pages cost the same as the first one.
+Highlights come back with ``HIGHLIGHT_START``/``HIGHLIGHT_STOP`` markers around matches.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import operator
+import re
+from functools import reduce
+
+# django imports
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+
+from newsletter.search.models import SearchEntry
+
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+TABLE = SearchEntry._meta.db_table
+COLUMNS = ["id", "kind", "object_id", "title", "slug", "publish", "rank", "title_highlight", "snippet"]
+
+
+def _filters(kinds, after, alias):
+    clauses, params = [], []
+    if kinds:
+        clauses.append("%s.kind IN (%s)" % (alias, ", ".join(["%s"] * len(kinds))))
+        params.extend(kinds)
+    if after is not None:
+        rank, entry_id = after
+        clauses.append("(%(a)s.rank < %%s OR (%(a)s.rank = %%s AND %(a)s.id > %%s))" % {"a": alias})
+        params.extend([rank, rank, entry_id])
+    return "".join(" AND " + clause for clause in clauses), params
+
+
+def _fetch(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [dict(zip(COLUMNS, row)) for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    config = "english"
+
+    def search(self, query, kinds=None, after=None, limit=20):
+        where, params = _filters(kinds, after, "ranked")
+        options = 'StartSel="%s", StopSel="%s"' % (HIGHLIGHT_START, HIGHLIGHT_STOP)
+        # headlines are costly, so they are only computed for the rows of the page
+        sql = (
+            "WITH ranked AS ("
+            " SELECT e.id, e.kind, ts_rank_cd(e.document, q)::float8 AS rank, q"
+            " FROM {table} e, websearch_to_tsquery(%s, %s) q"
+            " WHERE e.document @@ q"
+            "), page AS ("
+            " SELECT ranked.id, ranked.rank, ranked.q FROM ranked WHERE TRUE{where}"
+            " ORDER BY ranked.rank DESC, ranked.id ASC LIMIT %s"
+            ")"
+            " SELECT e.id, e.kind, e.object_id, e.title, e.slug, e.publish, page.rank,"
+            " ts_headline(%s, e.title, page.q, %s),"
+            " ts_headline(%s, e.body, page.q, %s)"
+            " FROM page JOIN {table} e ON e.id = page.id"
+            " ORDER BY page.rank DESC, page.id ASC"
+        ).format(table=TABLE, where=where)
+        return _fetch(
+            sql,
+            [self.config, query]
+            + params
+            + [limit]
+            + [self.config, options + ", HighlightAll=true", self.config, options + ", MaxFragments=2"],
+        )
+
+
+class SqliteSearchBackend:
+    fts_table = TABLE + "_fts"
+
+    def match_expression(self, query):
+        # every word must match; quoting keeps FTS5 operators in user input literal
+        words = WORD_RE.findall(query)
+        return " ".join('"%s"' % word for word in words)
+
+    def search(self, query, kinds=None, after=None, limit=20):
+        expression = self.match_expression(query)
+        if not expression:
+            return []
+        where, params = _filters(kinds, after, "ranked")
+        sql = (
+            "SELECT ranked.id, ranked.kind, ranked.object_id, ranked.title, ranked.slug, ranked.publish,"
+            " ranked.rank, ranked.title_highlight, ranked.snippet FROM ("
+            " SELECT e.id, e.kind, e.object_id, e.title, e.slug, e.publish,"
+            " -bm25({fts}, 10.0, 1.0) AS rank,"
+            " highlight({fts}, 0, %s, %s) AS title_highlight,"
+            " snippet({fts}, 1, %s, %s, '...', 32) AS snippet"
+            " FROM {fts} JOIN {table} e ON e.id = {fts}.rowid"
+            " WHERE {fts} MATCH %s"
+            ") ranked WHERE 1{where}"
+            " ORDER BY ranked.rank DESC, ranked.id ASC LIMIT %s"
+        ).format(fts=self.fts_table, table=TABLE, where=where)
+        markers = [HIGHLIGHT_START, HIGHLIGHT_STOP]
+        return _fetch(sql, markers + markers + [expression] + params + [limit])
+
+
+class PlainSearchBackend:
+    """
+    Fallback for the other databases, without a full-text index: every word must occur in the
+    title or body, and entries rank by how many of the words their title contains. Snippets are
+    cut around the first match.
+    """
+    snippet_length = 200
+
+    def search(self, query, kinds=None, after=None, limit=20):
+        words = WORD_RE.findall(query)
+        if not words:
+            return []
+        queryset = SearchEntry.objects.all()
+        for word in words:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(body__icontains=word))
+        queryset = queryset.annotate(rank=reduce(operator.add, (
+            Case(When(title__icontains=word, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+            for word in words
+        )))
+        if kinds:
+            queryset = queryset.filter(kind__in=kinds)
+        if after is not None:
+            rank, entry_id = after
+            queryset = queryset.filter(Q(rank__lt=rank) | Q(rank=rank, id__gt=entry_id))
+        pattern = re.compile("|".join(re.escape(word) for word in words), re.IGNORECASE)
+        hits = []
+        for row in queryset.order_by("-rank", "id").values(*COLUMNS[:7], "body")[:limit]:
+            body = row.pop("body")
+            hits.append(dict(
+                row, title_highlight=self.highlight(pattern, row["title"]), snippet=self.snippet(pattern, body)
+            ))
+        return hits
+
+    def highlight(self, pattern, text):
+        return pattern.sub(lambda match: HIGHLIGHT_START + match.group() + HIGHLIGHT_STOP, text)
+
+    def snippet(self, pattern, body):
+        match = pattern.search(body)
+        start = max((match.start() if match else 0) - self.snippet_length // 2, 0)
+        text = body[start:start + self.snippet_length]
+        return ("..." if start else "") + self.highlight(pattern, text) + (
+            "..." if start + self.snippet_length < len(body) else ""
+        )
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SqliteSearchBackend,
+}
+
+
+def get_backend():
+    return BACKENDS.get(connection.vendor, PlainSearchBackend)()
@@ -0,0 +1,124 @@
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+from collections import Counter
+
+# django imports
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+from newsletter.locations.managers import UNKNOWN_ID
+from newsletter.locations.models import Country, Region
+from newsletter.practicals.models import Practical
+from newsletter.search.models import FacetCount, SearchEntry
+from newsletter.updates.models import Update
+
+FACETED_MODELS = {
+    SearchEntry.UPDATE: Update,
+    SearchEntry.PRACTICAL: Practical,
+}
+FACETED_KINDS = {model: kind for kind, model in FACETED_MODELS.items()}
+DIMENSIONS = ("region", "country", "year")
+LOCATIONS = {"region": Region, "country": Country}
+
+
+def facet_key(kind, region_id, country_id, publish, is_active, is_deleted):
+    """
+    Rollup row a post counts towards, ``None`` for posts that are not listed.
+    """
+    if not is_active or is_deleted or publish is None:
+        return None
+    return (kind, region_id or 0, country_id or 0, timezone.localtime(publish).year)
+
+
+def current_key(instance):
+    return facet_key(
+        FACETED_KINDS[instance.__class__],
+        instance.region_id,
+        instance.country_id,
+        instance.publish,
+        instance.is_active,
+        instance.is_deleted,
+    )
+
+
+def previous_key(instance):
+    previous = instance.tracker.previous
+    return facet_key(
+        FACETED_KINDS[instance.__class__],
+        previous("region"),
+        previous("country"),
+        previous("publish"),
+        previous("is_active"),
+        previous("is_deleted"),
+    )
+
+
+def _selected_ids(selected):
+    """
+    Region and country codes or names resolved to ids, the year as a number; values that match
+    nothing become ``UNKNOWN_ID``.
+    """
+    ids = {}
+    for dimension, value in (selected or {}).items():
+        if not value:
+            continue
+        if dimension in LOCATIONS:
+            ids[dimension] = LOCATIONS[dimension].objects.resolve(value, default=UNKNOWN_ID)
+        else:
+            ids[dimension] = int(value) if str(value).isdigit() else UNKNOWN_ID
+    return ids
+
+
+def facet_counts(kind, selected=None):
+    """
+    Counts per value of each dimension for the posts matching the other selected dimensions,
+    read from the rollup table. ``selected`` maps dimension names to codes, names or years.
+    """
+    selected = _selected_ids(selected)
+    counts = {dimension: Counter() for dimension in DIMENSIONS}
+    rows = FacetCount.objects.filter(kind=kind, count__gt=0).values_list(*DIMENSIONS, "count")
+    for region, country, year, count in rows:
+        values = {"region": region, "country": country, "year": year}
+        for dimension in DIMENSIONS:
+            if all(values[other] == selected[other] for other in selected if other != dimension):
+                counts[dimension][values[dimension]] += count
+
+    labels = {"year": {year: (str(year), str(year)) for year in counts["year"]}}
+    for dimension, model in LOCATIONS.items():
+        labels[dimension] = {
+            pk: (code or name, name)
+            for pk, code, name in model.objects.filter(pk__in=list(counts[dimension])).values_list("pk", "code", "name")
+        }
+    return {
+        dimension: sorted(
+            (
+                {"value": labels[dimension][key][0], "label": labels[dimension][key][1], "count": count}
+                for key, count in counts[dimension].items()
+                if key in labels[dimension]
+            ),
+            key=lambda facet: facet["label"],
+        )
+        for dimension in DIMENSIONS
+    }
+
+
+def rebuild_facets():
+    with transaction.atomic():
+        FacetCount.objects.all().delete()
+        for kind, model in FACETED_MODELS.items():
+            rows = (
+                model.objects.active()
+                .order_by()
+                .values("region", "country", year=ExtractYear("publish"))
+                .annotate(total=Count("id"))
+            )
+            totals = Counter()
+            for row in rows:
+                totals[(row["region"] or 0, row["country"] or 0, row["year"])] += row["total"]
+            FacetCount.objects.bulk_create(
+                FacetCount(kind=kind, region=region, country=country, year=year, count=total)
+                for (region, country, year), total in totals.items()
+            )
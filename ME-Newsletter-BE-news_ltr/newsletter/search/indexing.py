@@ -0,0 +1,66 @@
+from __future__ import unicode_literals, absolute_import
+
+from django.db import transaction
+
+from newsletter.core.utils import html_to_text
+from newsletter.search.autocomplete import autocomplete_index
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.models import Practical
+from newsletter.search.models import SearchEntry
+from newsletter.updates.models import Update
+
+MODELS = {
+    SearchEntry.NEWSLETTER: NewsLetter,
+    SearchEntry.UPDATE: Update,
+    SearchEntry.PRACTICAL: Practical,
+}
+KINDS = {model: kind for kind, model in MODELS.items()}
+
+
+def is_searchable(instance):
+    return instance.is_active and not instance.is_deleted
+
+
+def entry_fields(instance):
+    return {
+        "title": instance.title,
+        "slug": instance.slug,
+        "body": " ".join(filter(None, [instance.description, html_to_text(instance.content)])),
+        "publish": instance.publish,
+    }
+
+
+def index_instance(instance):
+    """
+    Adds, refreshes or (for inactive and soft-deleted posts) removes the entry of ``instance``.
+    """
+    kind = KINDS[instance.__class__]
+    if not is_searchable(instance):
+        SearchEntry.objects.filter(kind=kind, object_id=instance.pk).delete()
+        return
+    SearchEntry.objects.update_or_create(kind=kind, object_id=instance.pk, defaults=entry_fields(instance))
+
+
+def remove_instance(instance):
+    SearchEntry.objects.filter(kind=KINDS[instance.__class__], object_id=instance.pk).delete()
+
+
+def reindex(kinds=None, batch_size=500):
+    """
+    Rebuilds the entries of ``kinds`` (all by default) from scratch; returns how many were written.
+    """
+    total = 0
+    with transaction.atomic():
+        for kind in kinds or MODELS:
+            SearchEntry.objects.filter(kind=kind).delete()
+            batch = []
+            for instance in MODELS[kind].objects.active().order_by("pk").iterator(chunk_size=batch_size):
+                batch.append(SearchEntry(kind=kind, object_id=instance.pk, **entry_fields(instance)))
+                if len(batch) >= batch_size:
+                    SearchEntry.objects.bulk_create(batch)
+                    total, batch = total + len(batch), []
+            SearchEntry.objects.bulk_create(batch)
+            total += len(batch)
+        # bulk writes send no signals, so every worker reloads its autocomplete index
+        transaction.on_commit(autocomplete_index.changed)
+    return total
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from newsletter.search.similarity import compute_related
+
+
+class Command(BaseCommand):
+    help = "Precompute related updates and practicals by TF-IDF cosine similarity"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="Only compute new posts and the lists they enter, instead of every post",
+        )
+        parser.add_argument("--top-k", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--min-score", type=float, default=0.05)
+
+    def handle(self, *args, **options):
+        total = compute_related(
+            k=options["top_k"],
+            batch_size=options["batch_size"],
+            min_score=options["min_score"],
+            incremental=options["incremental"],
+        )
+        self.stdout.write(self.style.SUCCESS("Computed related items of %d posts" % total))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from newsletter.search.facets import rebuild_facets
+from newsletter.search.models import FacetCount
+
+
+class Command(BaseCommand):
+    help = "Recount the region/country/year facets of updates and practicals"
+
+    def handle(self, *args, **options):
+        rebuild_facets()
+        self.stdout.write(self.style.SUCCESS("Rebuilt %d facet counts" % FacetCount.objects.count()))
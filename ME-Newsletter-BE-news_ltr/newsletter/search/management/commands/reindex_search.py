@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from newsletter.search.indexing import MODELS, reindex
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index from the active newsletters, updates and practicals"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kinds", nargs="*", help="Only reindex these types: %s" % ", ".join(sorted(MODELS)))
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        unknown = set(options["kinds"]) - set(MODELS)
+        if unknown:
+            raise CommandError("Unknown types: %s" % ", ".join(sorted(unknown)))
+        total = reindex(options["kinds"] or None, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS("Indexed %d entries" % total))
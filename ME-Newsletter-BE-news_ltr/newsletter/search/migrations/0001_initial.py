@@ -0,0 +1,31 @@
+# Generated by Django 3.2.11 on 2026-10-19 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('newsletter', 'News Letter'), ('update', 'Update'), ('practical', 'Practical')], max_length=20, verbose_name='kind')),
+                ('object_id', models.BigIntegerField(verbose_name='object id')),
+                ('title', models.CharField(max_length=255, verbose_name='title')),
+                ('slug', models.CharField(blank=True, max_length=255, null=True, verbose_name='slug')),
+                ('body', models.TextField(blank=True, default='', verbose_name='body')),
+                ('publish', models.DateTimeField(verbose_name='publish datetime')),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,121 @@
+import html
+import re
+
+from django.db import migrations
+from django.utils.html import strip_tags
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def html_to_text(value):
+    # newsletter.core.utils.html_to_text as of this migration
+    if not value:
+        return ""
+    return WHITESPACE_RE.sub(" ", html.unescape(strip_tags(value))).strip()
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE search_searchentry ADD COLUMN document tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_searchentry_document_idx ON search_searchentry USING GIN (document)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS search_searchentry_document_idx",
+    "ALTER TABLE search_searchentry DROP COLUMN IF EXISTS document",
+]
+
+# external-content FTS5 table, kept in sync with search_searchentry by triggers
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE search_searchentry_fts USING fts5(
+        title, body, content='search_searchentry', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER search_searchentry_ai AFTER INSERT ON search_searchentry BEGIN
+        INSERT INTO search_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchentry_ad AFTER DELETE ON search_searchentry BEGIN
+        INSERT INTO search_searchentry_fts(search_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchentry_au AFTER UPDATE ON search_searchentry BEGIN
+        INSERT INTO search_searchentry_fts(search_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS search_searchentry_au",
+    "DROP TRIGGER IF EXISTS search_searchentry_ad",
+    "DROP TRIGGER IF EXISTS search_searchentry_ai",
+    "DROP TABLE IF EXISTS search_searchentry_fts",
+]
+
+STATEMENTS = {
+    "postgresql": (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+    "sqlite": (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def _execute(schema_editor, direction):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements:
+        for statement in statements[direction]:
+            schema_editor.execute(statement)
+
+
+def create_index(apps, schema_editor):
+    _execute(schema_editor, 0)
+
+
+def drop_index(apps, schema_editor):
+    _execute(schema_editor, 1)
+
+
+def index_existing_posts(apps, schema_editor):
+    SearchEntry = apps.get_model("search", "SearchEntry")
+    models = {
+        "newsletter": apps.get_model("newsletterapp", "NewsLetter"),
+        "update": apps.get_model("updates", "Update"),
+        "practical": apps.get_model("practicals", "Practical"),
+    }
+    for kind, model in models.items():
+        SearchEntry.objects.bulk_create(
+            [
+                SearchEntry(
+                    kind=kind,
+                    object_id=post.pk,
+                    title=post.title,
+                    slug=post.slug,
+                    body=" ".join(filter(None, [post.description, html_to_text(post.content)])),
+                    publish=post.publish,
+                )
+                for post in model._default_manager.filter(is_active=True, is_deleted=False).iterator()
+            ],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('newsletterapp', '0008_auto_20230215_0958'),
+        ('updates', '0007_alter_update_region'),
+        ('practicals', '0005_practical_newsletter'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(index_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.2.11 on 2026-10-19 18:55
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+
+def count_existing_posts(apps, schema_editor):
+    FacetCount = apps.get_model("search", "FacetCount")
+    for kind, model_name in (("update", "updates.Update"), ("practical", "practicals.Practical")):
+        rows = (
+            apps.get_model(model_name)._default_manager.filter(is_active=True, is_deleted=False)
+            .order_by()
+            .values("region", "country", year=ExtractYear("publish"))
+            .annotate(total=Count("id"))
+        )
+        totals = Counter()
+        for row in rows:
+            totals[(row["region"] or "", row["country"] or "", row["year"])] += row["total"]
+        FacetCount.objects.bulk_create(
+            FacetCount(kind=kind, region=region, country=country, year=year, count=total)
+            for (region, country, year), total in totals.items()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('newsletter', 'News Letter'), ('update', 'Update'), ('practical', 'Practical')], max_length=20, verbose_name='kind')),
+                ('region', models.CharField(blank=True, default='', max_length=100, verbose_name='Region')),
+                ('country', models.CharField(blank=True, default='', max_length=100, verbose_name='Country')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='year')),
+                ('count', models.IntegerField(default=0, verbose_name='count')),
+            ],
+            options={
+                'verbose_name': 'Facet Count',
+                'unique_together': {('kind', 'region', 'country', 'year')},
+            },
+        ),
+        migrations.RunPython(count_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.11 on 2026-10-19 18:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0003_facet_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='rank')),
+                ('score', models.FloatField(verbose_name='score')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_items', to='search.searchentry')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='search.searchentry')),
+            ],
+            options={
+                'verbose_name': 'Related Item',
+                'unique_together': {('source', 'rank')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 3.2.11 on 2026-10-19 19:04
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+
+def clear_counts(apps, schema_editor):
+    apps.get_model("search", "FacetCount").objects.all().delete()
+
+
+def count_existing_posts(apps, schema_editor):
+    FacetCount = apps.get_model("search", "FacetCount")
+    for kind, model_name in (("update", "updates.Update"), ("practical", "practicals.Practical")):
+        rows = (
+            apps.get_model(model_name)._default_manager.filter(is_active=True, is_deleted=False)
+            .order_by()
+            .values("region", "country", year=ExtractYear("publish"))
+            .annotate(total=Count("id"))
+        )
+        totals = Counter()
+        for row in rows:
+            totals[(row["region"] or 0, row["country"] or 0, row["year"])] += row["total"]
+        FacetCount.objects.bulk_create(
+            FacetCount(kind=kind, region=region, country=country, year=year, count=total)
+            for (region, country, year), total in totals.items()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0004_related_items'),
+        ('updates', '0011_location_foreign_keys'),
+        ('practicals', '0008_location_foreign_keys'),
+    ]
+
+    operations = [
+        # the counts are keyed by location ids now, so they are recounted from the posts
+        migrations.RunPython(clear_counts, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='facetcount',
+            name='country',
+            field=models.PositiveIntegerField(default=0, verbose_name='Country'),
+        ),
+        migrations.AlterField(
+            model_name='facetcount',
+            name='region',
+            field=models.PositiveIntegerField(default=0, verbose_name='Region'),
+        ),
+        migrations.RunPython(count_existing_posts, clear_counts),
+    ]
@@ -0,0 +1,93 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from newsletter.core.managers import CounterManager
+
+
+class SearchEntry(models.Model):
+    """
+    Plain-text copy of an active newsletter, update or practical. The full-text index over it is
+    database specific and created by migration 0002: a tsvector column with a GIN index on
+    PostgreSQL, an FTS5 table kept in sync by triggers on SQLite.
+    """
+    NEWSLETTER = "newsletter"
+    UPDATE = "update"
+    PRACTICAL = "practical"
+    KIND_CHOICES = (
+        (NEWSLETTER, "News Letter"),
+        (UPDATE, "Update"),
+        (PRACTICAL, "Practical"),
+    )
+    kind = models.CharField(_("kind"), choices=KIND_CHOICES, max_length=20)
+    object_id = models.BigIntegerField(_("object id"))
+    title = models.CharField(_("title"), max_length=255)
+    slug = models.CharField(_("slug"), max_length=255, null=True, blank=True)
+    body = models.TextField(_("body"), blank=True, default="")
+    publish = models.DateTimeField(_("publish datetime"))
+
+    def __str__(self):
+        return self.title
+
+    class Meta:
+        verbose_name = "Search Entry"
+        verbose_name_plural = "Search Entries"
+        unique_together = ("kind", "object_id")
+
+
+class RelatedItemManager(models.Manager):
+    def for_object(self, kind, object_id):
+        return (
+            self.filter(source__kind=kind, source__object_id=object_id)
+            .select_related("target")
+            .order_by("rank")
+        )
+
+
+class RelatedItem(models.Model):
+    """
+    Precomputed nearest neighbour of a search entry by TF-IDF cosine similarity, written by the
+    ``compute_related`` command. Rows go away with either entry.
+    """
+    source = models.ForeignKey(SearchEntry, on_delete=models.CASCADE, related_name="related_items")
+    target = models.ForeignKey(SearchEntry, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField(_("rank"))
+    score = models.FloatField(_("score"))
+
+    objects = RelatedItemManager()
+
+    class Meta:
+        verbose_name = "Related Item"
+        unique_together = ("source", "rank")
+
+
+class FacetCountManager(CounterManager):
+    def adjust(self, key, delta):
+        kind, region, country, year = key
+        self.increment({"kind": kind, "region": region, "country": country, "year": year}, count=delta)
+
+    def move(self, old, new):
+        if old == new:
+            return
+        if old is not None:
+            self.adjust(old, -1)
+        if new is not None:
+            self.adjust(new, 1)
+
+
+class FacetCount(models.Model):
+    """
+    Number of active posts per type, region, country and publish year, adjusted on every save
+    so filter sidebars never run GROUP BY over the content tables.
+    """
+    kind = models.CharField(_("kind"), choices=SearchEntry.KIND_CHOICES, max_length=20)
+    # ids of the locations rows, 0 for posts without one
+    region = models.PositiveIntegerField(_("Region"), default=0)
+    country = models.PositiveIntegerField(_("Country"), default=0)
+    year = models.PositiveSmallIntegerField(_("year"))
+    count = models.IntegerField(_("count"), default=0)
+
+    objects = FacetCountManager()
+
+    class Meta:
+        verbose_name = "Facet Count"
+        unique_together = ("kind", "region", "country", "year")
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from newsletter.search.autocomplete import autocomplete_index, entry_suggestion
+from newsletter.search.facets import FACETED_MODELS, current_key, previous_key
+from newsletter.search.indexing import MODELS, index_instance, remove_instance
+from newsletter.search.models import FacetCount, SearchEntry
+
+
+def index_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_instance(instance)
+
+
+def remove_on_delete(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+for model in MODELS.values():
+    post_save.connect(index_on_save, sender=model, dispatch_uid="search-index-%s" % model.__name__)
+    post_delete.connect(remove_on_delete, sender=model, dispatch_uid="search-remove-%s" % model.__name__)
+
+
+def update_facets_on_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        FacetCount.objects.move(None if created else previous_key(instance), current_key(instance))
+
+
+def update_facets_on_delete(sender, instance, **kwargs):
+    FacetCount.objects.move(current_key(instance), None)
+
+
+for model in FACETED_MODELS.values():
+    post_save.connect(update_facets_on_save, sender=model, dispatch_uid="facets-save-%s" % model.__name__)
+    post_delete.connect(update_facets_on_delete, sender=model, dispatch_uid="facets-delete-%s" % model.__name__)
+
+
+def autocomplete_on_entry_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        suggestion = entry_suggestion(instance)
+        transaction.on_commit(lambda: autocomplete_index.changed(lambda index: index.added(suggestion)))
+
+
+def autocomplete_on_entry_delete(sender, instance, **kwargs):
+    ident = (instance.kind, instance.object_id)
+    transaction.on_commit(lambda: autocomplete_index.changed(lambda index: index.without(ident)))
+
+
+post_save.connect(autocomplete_on_entry_save, sender=SearchEntry, dispatch_uid="autocomplete-save")
+post_delete.connect(autocomplete_on_entry_delete, sender=SearchEntry, dispatch_uid="autocomplete-delete")
@@ -0,0 +1,137 @@
+"""
+Related updates and practicals by TF-IDF cosine similarity over the search entries.
+
+Every entry becomes an L2-normalised TF-IDF row of a sparse matrix, so one sparse product of a
+batch of rows with the whole matrix gives the cosine similarities of that batch; the top ``k``
+of each row are kept in ``RelatedItem``. An incremental run recomputes the entries without
+neighbours (new posts, and posts nothing resembled yet) plus the old entries whose lists a new
+post would enter; a full run also picks up edited posts and vocabulary drift.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import re
+from collections import Counter
+
+# third party imports
+import numpy as np
+from scipy import sparse
+
+# django imports
+from django.db import transaction
+
+from newsletter.search.models import RelatedItem, SearchEntry
+
+KINDS = (SearchEntry.UPDATE, SearchEntry.PRACTICAL)
+TOKEN_RE = re.compile(r"[^\W\d_]{2,}", re.UNICODE)
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the their this "
+    "to was were will with which who not can also more than into about after over".split()
+)
+TITLE_WEIGHT = 2
+
+
+def tokens(title, body):
+    text = " ".join([title] * TITLE_WEIGHT + [body or ""]).lower()
+    return [word for word in TOKEN_RE.findall(text) if word not in STOP_WORDS]
+
+
+def tfidf_matrix(documents):
+    """
+    Sparse CSR matrix with one L2-normalised row per document (a list of tokens), using
+    sublinear term frequencies and smoothed inverse document frequencies.
+    """
+    vocabulary = {}
+    indptr, indices, counts = [0], [], []
+    for document in documents:
+        for word, count in Counter(document).items():
+            indices.append(vocabulary.setdefault(word, len(vocabulary)))
+            counts.append(count)
+        indptr.append(len(indices))
+    matrix = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr)),
+        shape=(len(documents), len(vocabulary)),
+    )
+    matrix.data = 1.0 + np.log(matrix.data)
+    document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1.0 + len(documents)) / (1.0 + document_frequency)) + 1.0
+    matrix = matrix @ sparse.diags(idf)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix)
+
+
+def similarities(matrix, rows):
+    """
+    Dense ``len(rows) x n`` array of cosine similarities, zero on each row's own column.
+    """
+    result = (matrix[rows] @ matrix.T).toarray()
+    result[np.arange(len(rows)), rows] = 0.0
+    return result
+
+
+def top_neighbours(matrix, rows, k, min_score):
+    """
+    Yields ``(row, [(column, score), ...])`` with the ``k`` most similar other rows of each row;
+    rows sharing nothing with it (score 0) are never neighbours, whatever ``min_score``.
+    """
+    batch_scores = similarities(matrix, rows)
+    count = min(k, batch_scores.shape[1])
+    best = np.argpartition(-batch_scores, count - 1, axis=1)[:, :count]
+    for position, row in enumerate(rows):
+        scores = batch_scores[position, best[position]]
+        order = np.argsort(-scores, kind="stable")
+        yield row, [
+            (int(column), float(score))
+            for column, score in zip(best[position][order], scores[order])
+            if column != row and score > 0 and score >= min_score
+        ]
+
+
+def _batches(rows, batch_size):
+    for start in range(0, len(rows), batch_size):
+        yield np.asarray(rows[start:start + batch_size])
+
+
+def compute_related(k=5, batch_size=500, min_score=0.05, incremental=False):
+    """
+    Writes the ``k`` nearest neighbours of updates and practicals; returns how many entries
+    were recomputed.
+    """
+    entries = list(
+        SearchEntry.objects.filter(kind__in=KINDS).order_by("pk").values_list("pk", "title", "body")
+    )
+    if not entries:
+        return 0
+    ids = np.asarray([pk for pk, _title, _body in entries])
+    matrix = tfidf_matrix([tokens(title, body) for _pk, title, body in entries])
+    positions = {pk: position for position, pk in enumerate(ids.tolist())}
+
+    if incremental:
+        current = {}
+        for source_id, score in RelatedItem.objects.filter(source__kind__in=KINDS).values_list("source", "score"):
+            current.setdefault(source_id, []).append(score)
+        # the score an entry must beat to enter each existing list; entries without one are recomputed anyway
+        thresholds = np.full(len(ids), np.inf)
+        for source_id, scores in current.items():
+            thresholds[positions[source_id]] = min(scores) if len(scores) >= k else min_score
+        new = [positions[pk] for pk in ids.tolist() if pk not in current]
+        dirty = set(new)
+        for batch in _batches(new, batch_size):
+            # similarity is symmetric, so the new rows also tell which old lists they would enter
+            entering = (similarities(matrix, batch) > thresholds).any(axis=0)
+            dirty.update(np.flatnonzero(entering).tolist())
+        rows = sorted(dirty)
+    else:
+        rows = list(range(len(ids)))
+
+    for batch in _batches(rows, batch_size):
+        with transaction.atomic():
+            sources = ids[batch].tolist()
+            RelatedItem.objects.filter(source__in=sources).delete()
+            RelatedItem.objects.bulk_create(
+                RelatedItem(source_id=int(ids[row]), target_id=int(ids[column]), rank=rank, score=score)
+                for row, neighbours in top_neighbours(matrix, batch, k, min_score)
+                for rank, (column, score) in enumerate(neighbours)
+            )
+    return len(rows)
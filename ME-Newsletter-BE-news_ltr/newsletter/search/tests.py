@@ -0,0 +1,220 @@
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from scipy import sparse
+
+from newsletter.locations.models import Country, Region
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.models import Practical
+from newsletter.search import backends
+from newsletter.search.autocomplete import PrefixIndex, Suggestion, autocomplete_index
+from newsletter.search.models import FacetCount, RelatedItem, SearchEntry
+from newsletter.search.similarity import compute_related, top_neighbours
+from newsletter.updates.models import Update
+
+pytestmark = pytest.mark.django_db
+
+
+def search(client, **params):
+    response = client.get("/api/v1/search/", params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_index_follows_saves_and_soft_deletes(client):
+    update = Update.objects.create(title="Oil prices", content="<p>Brent crude &amp; <b>OPEC</b> output</p>")
+    Practical.objects.create(title="Visa rules", description="Residency and crude paperwork")
+    assert {hit["type"] for hit in search(client, q="crude")["results"]} == {"update", "practical"}
+
+    update.title = "Gas prices"
+    update.save()
+    assert search(client, q="gas", type="update")["results"][0]["title_highlight"] == "<mark>Gas</mark> prices"
+
+    update.remove()
+    assert [hit["type"] for hit in search(client, q="crude")["results"]] == ["practical"]
+
+
+def test_title_matches_rank_first_and_snippets_are_escaped(client):
+    Update.objects.create(title="Weekly roundup", content="<p>Notes on <script>tax</script> &lt;tax&gt; rules</p>")
+    Update.objects.create(title="Tax changes", content="<p>New rules</p>")
+    hits = search(client, q="tax")["results"]
+    assert hits[0]["title"] == "Tax changes"
+    assert "<script>" not in hits[1]["snippet"]
+    assert "&lt;<mark>tax</mark>&gt;" in hits[1]["snippet"]
+
+
+def test_keyset_pagination(client):
+    for number in range(5):
+        NewsLetter.objects.create(title="Issue %d" % number, description="monthly digest")
+    page = search(client, q="digest", limit=2)
+    seen = [hit["id"] for hit in page["results"]]
+    while page["next"]:
+        page = search(client, q="digest", limit=2, cursor=page["next"])
+        seen += [hit["id"] for hit in page["results"]]
+    assert sorted(seen) == sorted(NewsLetter.objects.values_list("id", flat=True))
+
+
+def test_other_databases_use_the_plain_backend(client, monkeypatch):
+    monkeypatch.setattr(backends, "BACKENDS", {})
+    Update.objects.create(title="Weekly roundup", content="<p>Notes on &lt;tax&gt; rules</p>")
+    Update.objects.create(title="Tax changes", content="<p>New rules</p>")
+    hits = search(client, q="tax rules")["results"]
+    assert [hit["title"] for hit in hits] == ["Tax changes", "Weekly roundup"]
+    assert hits[0]["title_highlight"] == "<mark>Tax</mark> changes"
+    assert "&lt;<mark>tax</mark>&gt; <mark>rules</mark>" in hits[1]["snippet"]
+    assert search(client, q="tax", limit=1, cursor=search(client, q="tax", limit=1)["next"])["results"][0]["title"] == (
+        "Weekly roundup"
+    )
+
+
+def test_bad_requests(client):
+    assert client.get("/api/v1/search/").status_code == 400
+    assert client.get("/api/v1/search/", {"q": "x", "type": "user"}).status_code == 400
+    assert client.get("/api/v1/search/", {"q": "x", "cursor": "%%%"}).status_code == 400
+
+
+def test_reindex_command(client):
+    Practical.objects.create(title="Labour law")
+    SearchEntry.objects.all().delete()
+    call_command("reindex_search")
+    assert search(client, q="labour")["results"][0]["type"] == "practical"
+
+
+class TestFacets:
+    def create(self, model, country, year, region=None):
+        return model.objects.create(
+            title="%s %s" % (country, year),
+            country=Country.objects.get(code=country),
+            region=region and Region.objects.get(code=region),
+            publish=datetime(year, 6, 1, tzinfo=dt_timezone.utc),
+        )
+
+    def facet(self, value, label, count):
+        return {"value": value, "label": label, "count": count}
+
+    def test_counts_follow_saves_and_status_changes(self, client):
+        update = self.create(Update, "AE", 2024, region=Region.MIDDLE_EAST)
+        self.create(Update, "AE", 2023, region=Region.MIDDLE_EAST)
+        self.create(Update, "OM", 2024, region=Region.MIDDLE_EAST)
+        self.create(Practical, "AE", 2024)
+
+        result = client.get("/api/v1/facets/", {"type": "update", "country": "ae"}).json()["result"]
+        assert result["year"] == [self.facet("2023", "2023", 1), self.facet("2024", "2024", 1)]
+        assert result["country"] == [self.facet("OM", "Oman", 1), self.facet("AE", "United Arab Emirates", 2)]
+        assert result["region"] == [self.facet(Region.MIDDLE_EAST, "MiddleEast", 2)]
+
+        update.country = Country.objects.get(code="OM")
+        update.save()
+        update.deactivate()
+        update.activate()
+        result = client.get("/api/v1/facets/", {"type": "update", "year": "2024"}).json()["result"]
+        assert result["country"] == [self.facet("OM", "Oman", 2)]
+
+        update.remove()
+        result = client.get("/api/v1/facets/", {"type": "update", "country": "Atlantis"}).json()["result"]
+        assert result["region"] == []
+        assert result["country"] == [self.facet("OM", "Oman", 1), self.facet("AE", "United Arab Emirates", 1)]
+
+    def test_counts_match_filtered_lists(self, client):
+        self.create(Practical, "AE", 2024)
+        self.create(Practical, "AE", 2023)
+        self.create(Practical, "QA", 2024)
+        FacetCount.objects.all().delete()
+        call_command("rebuild_facets")
+        result = client.get("/api/v1/facets/", {"type": "practical", "year": "2024"}).json()["result"]
+        for facet in result["country"]:
+            listed = client.get("/api/v1/practical-list/", {"year": "2024", "country": facet["value"]}).json()
+            assert listed["count"] == facet["count"]
+
+    def test_update_list_filters(self, client):
+        self.create(Update, "AE", 2024, region=Region.MIDDLE_EAST)
+        self.create(Update, "OM", 2024, region=Region.MIDDLE_EAST)
+        response = client.get("/api/v1/update-list/", {"country": "Oman"}).json()
+        assert [update["country"] for update in response["updates"]] == ["Oman"]
+        assert client.get("/api/v1/update-list/", {"country": "Atlantis"}).json()["updates"] == []
+        assert client.get("/api/v1/update-list/", {"year": "soon"}).status_code == 400
+
+
+class TestAutocomplete:
+    @pytest.fixture(autouse=True)
+    def index(self):
+        autocomplete_index.clear()
+        yield autocomplete_index
+        autocomplete_index.clear()
+
+    def suggest(self, client, **params):
+        response = client.get("/api/v1/autocomplete/", params)
+        assert response.status_code == 200
+        return [suggestion["title"] for suggestion in response.json()["result"]]
+
+    def test_prefixes_of_titles_words_and_slugs(self, client):
+        Update.objects.create(title="Oil prices rise", publish=datetime(2024, 1, 1, tzinfo=dt_timezone.utc))
+        Update.objects.create(title="Price caps", publish=datetime(2023, 1, 1, tzinfo=dt_timezone.utc))
+        Practical.objects.create(title="Visa rules", slug="uae-visa-rules")
+        assert self.suggest(client, q="pric") == ["Price caps", "Oil prices rise"]
+        assert self.suggest(client, q="uae-vi") == ["Visa rules"]
+        assert self.suggest(client, q="pric", type="practical") == []
+        assert self.suggest(client, q="") == []
+
+    def test_follows_changes_without_queries(self, client, django_capture_on_commit_callbacks):
+        update = Update.objects.create(title="Gold rush", slug="rush-hour")
+        assert self.suggest(client, q="gold") == ["Gold rush"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            update.title = "Silver rush"
+            update.save()
+        with CaptureQueriesContext(connection) as context:
+            assert self.suggest(client, q="gold") == []
+            assert self.suggest(client, q="silv") == ["Silver rush"]
+        assert not [query for query in context.captured_queries if query["sql"].startswith("SELECT")]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            update.deactivate()
+        assert self.suggest(client, q="rush") == []
+
+    def test_removing_a_stale_suggestion_at_the_end_of_the_index(self):
+        publish = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        index = PrefixIndex([Suggestion("update", 1, "Zinc", "zinc", publish)])
+        # an entry whose keys point at another post, e.g. after a missed reload
+        index._suggestions["update", 2] = Suggestion("update", 2, "Zinc", "zinc", publish)
+        index = index.without(("update", 2))
+        assert [suggestion.object_id for suggestion in index.lookup("zin")] == [1]
+
+    def test_changes_leave_the_index_being_read_alone(self):
+        publish = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        index = PrefixIndex([Suggestion("update", 1, "Zinc", "zinc", publish)])
+        changed = index.added(Suggestion("update", 2, "Zinc mines", "zinc-mines", publish)).without(("update", 1))
+        assert [suggestion.object_id for suggestion in index.lookup("zin")] == [1]
+        assert [suggestion.object_id for suggestion in changed.lookup("zin")] == [2]
+
+
+class TestRelatedItems:
+    def test_neighbours_by_content(self, client):
+        visa = Practical.objects.create(title="Work visa renewal", description="Visa renewal documents and fees")
+        Update.objects.create(title="Visa fees rise", content="<p>Renewal fees for work visa holders</p>")
+        Update.objects.create(title="Oil output", content="<p>OPEC crude production</p>")
+        call_command("compute_related", "--top-k", "3")
+
+        related = client.get("/api/v1/practical-detail/%s/" % visa.slug).json()[0]["related"]
+        assert [item["title"] for item in related] == ["Visa fees rise"]
+        assert related[0]["type"] == "update"
+
+    def test_zero_scores_are_never_related(self):
+        matrix = sparse.csr_matrix(np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 0.0]]))
+        assert dict(top_neighbours(matrix, np.array([0, 1]), 3, min_score=0)) == {0: [(2, 1.0)], 1: []}
+
+    def test_incremental_run_adds_new_posts(self):
+        Update.objects.create(title="Gold prices", content="<p>Gold bullion prices</p>")
+        Update.objects.create(title="Tax rules", content="<p>Corporate tax</p>")
+        assert compute_related() == 2
+        gold = Update.objects.create(title="Gold demand", content="<p>Bullion demand</p>")
+
+        # the new post, the list it enters, and the post with no neighbours yet
+        assert compute_related(incremental=True) == 3
+        entry = SearchEntry.objects.get(kind=SearchEntry.UPDATE, object_id=gold.pk)
+        assert [item.target.title for item in RelatedItem.objects.for_object("update", gold.pk)] == ["Gold prices"]
+        assert RelatedItem.objects.filter(target=entry).count() == 1
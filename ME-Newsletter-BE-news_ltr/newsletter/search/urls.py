@@ -0,0 +1,9 @@
+from django.urls import path
+
+from newsletter.search.api.v1 import views
+
+urlpatterns = [
+    path("search/", views.SearchView.as_view(), name="search"),
+    path("autocomplete/", views.AutocompleteView.as_view(), name="autocomplete"),
+    path("facets/", views.FacetView.as_view(), name="facets"),
+]
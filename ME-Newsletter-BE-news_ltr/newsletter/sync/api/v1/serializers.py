@@ -0,0 +1,35 @@
+from newsletter.core.serializers import ModelSerializer
+
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.api.v1.serializers import PracticalListSerializer
+from newsletter.sync.changes import is_tombstone
+from newsletter.updates.api.v1.serializers import UpdateListSerializer
+
+
+class NewsLetterChangeSerializer(ModelSerializer):
+    class Meta:
+        model = NewsLetter
+        fields = ["title", "slug", "image", "description", "publish", "time_to_read"]
+
+
+SERIALIZERS = {
+    "newsletter": NewsLetterChangeSerializer,
+    "practical": PracticalListSerializer,
+    "update": UpdateListSerializer,
+}
+
+
+def change_data(change, context=None):
+    """
+    Envelope of one change; ``data`` is the list representation, ``None`` for tombstones.
+    """
+    instance = change.instance
+    deleted = is_tombstone(instance)
+    return {
+        "type": change.kind,
+        "id": instance.pk,
+        "slug": instance.slug,
+        "modified": instance.modified.isoformat(),
+        "deleted": deleted,
+        "data": None if deleted else SERIALIZERS[change.kind](instance, context=context).data,
+    }
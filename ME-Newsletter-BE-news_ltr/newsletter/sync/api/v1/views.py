@@ -0,0 +1,140 @@
+import time
+
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
+from rest_framework.renderers import BaseRenderer
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from drf_spectacular.types import OpenApiTypes
+
+from newsletter.sync.api.v1.serializers import change_data
+from newsletter.sync.events import RESET, format_event, get_broker
+from newsletter.sync.changes import (
+    MODELS, changes_after, decode_position, encode_position, position_of, since_position,
+)
+
+MAX_LIMIT = 500
+
+
+class ChangesView(APIView):
+    permission_classes = ()
+    authentication_classes = ()
+    batchable = True
+
+    @extend_schema(
+        summary="Content changed since a watermark",
+        description=(
+            "Newsletters, updates and practicals created, modified or removed after `since` or `cursor`, "
+            "oldest first. Keep `next` and send it as `cursor` to get the following page or, once "
+            "`has_more` is false, the next sync. Changes show up once they are `SYNC_SETTLE_SECONDS` old."
+        ),
+        parameters=[
+            OpenApiParameter("since", OpenApiTypes.DATETIME, description="ISO 8601 timestamp, for the first sync"),
+            OpenApiParameter("cursor", OpenApiTypes.STR, description="`next` value of the previous response"),
+            OpenApiParameter("type", OpenApiTypes.STR, description="Comma separated: newsletter, update, practical"),
+            OpenApiParameter("limit", OpenApiTypes.INT, description="Changes per page, at most %d" % MAX_LIMIT),
+        ],
+        responses={200: OpenApiTypes.OBJECT, 400: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        kinds = [kind for kind in request.GET.get("type", "").split(",") if kind]
+        if set(kinds) - set(MODELS):
+            return Response({"result": "Unknown type"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.GET.get("limit", 100)), MAX_LIMIT))
+            position = self.get_position(request)
+        except ValueError:
+            return Response({"result": "Invalid since, cursor or limit"}, status=status.HTTP_400_BAD_REQUEST)
+
+        changes, has_more = changes_after(position, kinds=kinds, limit=limit)
+        if changes:
+            position = position_of(changes[-1])
+        return Response(
+            {
+                "results": [change_data(change, {"request": request}) for change in changes],
+                "next": encode_position(position) if position else None,
+                "has_more": has_more,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def get_position(self, request):
+        if request.GET.get("cursor"):
+            return decode_position(request.GET["cursor"])
+        if request.GET.get("since"):
+            since = parse_datetime(request.GET["since"])
+            if since is None:
+                raise ValueError("Invalid since")
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            return since_position(since)
+        return None
+
+
+class EventStreamRenderer(BaseRenderer):
+    media_type = "text/event-stream"
+    format = "sse"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class EventStreamView(APIView):
+    permission_classes = ()
+    authentication_classes = ()
+    renderer_classes = (EventStreamRenderer,)
+
+    # seconds between keep-alive comments, and before the stream ends and the client reconnects
+    heartbeat = 15
+    max_duration = 300
+    retry = 3000
+
+    @extend_schema(
+        summary="Server-sent events of new publications",
+        description=(
+            "A `text/event-stream` of `published`, `updated` and `removed` events for newsletters, updates "
+            "and practicals, each with `type`, `id`, `slug` and `modified`. Reconnecting clients send the "
+            "last event id in the `Last-Event-ID` header (or `last_event_id`) to receive what they missed; "
+            "a `reset` event means those are gone and the client must sync again through `changes/`."
+        ),
+        parameters=[
+            OpenApiParameter("last_event_id", OpenApiTypes.STR, description="Resume after this event"),
+        ],
+        responses={200: OpenApiTypes.STR},
+    )
+    def get(self, request):
+        last_id = request.META.get("HTTP_LAST_EVENT_ID") or request.GET.get("last_event_id")
+        response = StreamingHttpResponse(self.stream(last_id), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    def stream(self, last_id):
+        broker = get_broker()
+        deadline = time.monotonic() + self.max_duration
+        yield "retry: %d\n\n" % self.retry
+        # subscribe first, so nothing published during the replay is lost
+        with broker.subscribe() as subscription:
+            sent = set()
+            if last_id:
+                missed = broker.replay(last_id)
+                if missed is None:
+                    yield format_event(None, {"event": RESET})
+                for event_id, data in missed or ():
+                    sent.add(event_id)
+                    yield format_event(event_id, data)
+            while not subscription.overflowed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                item = subscription.get(timeout=min(self.heartbeat, remaining))
+                if item is None:
+                    yield ": keep-alive\n\n"
+                elif item[0] not in sent:
+                    yield format_event(*item)
@@ -0,0 +1,113 @@
+"""
+Changes to newsletters, updates and practicals since a watermark, for clients that keep a copy.
+
+Changes are ordered by ``(modified, type, id)`` and read with keyset conditions served by the
+``(modified, id)`` index of each table: a position in that order is the cursor, so following
+pages and later syncs start exactly after the last change a client has seen. Posts that are
+soft-deleted or deactivated come back as tombstones, and so do rows deleted from the database,
+through the ``Deletion`` rows the delete signal leaves behind.
+
+``modified`` is set before the saving transaction commits, so a change may become visible after
+a client's cursor has passed its timestamp. Changes younger than ``SYNC_SETTLE_SECONDS`` are held
+back until every transaction that could have set them has committed.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import base64
+import heapq
+import json
+from collections import namedtuple
+from datetime import timedelta
+
+# django imports
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.models import Practical
+from newsletter.sync.models import Deletion
+from newsletter.updates.models import Update
+
+MODELS = {
+    "newsletter": NewsLetter,
+    "practical": Practical,
+    "update": Update,
+}
+
+Position = namedtuple("Position", ["modified", "kind", "id"])
+Change = namedtuple("Change", ["kind", "instance"])
+# stands in for the instance of a deleted row
+Deleted = namedtuple("Deleted", ["pk", "slug", "modified", "is_active", "is_deleted"])
+
+
+def encode_position(position):
+    value = [position.modified.isoformat(), position.kind, position.id]
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def decode_position(cursor):
+    """
+    Raises ``ValueError`` for anything that is not a cursor made by ``encode_position``.
+    """
+    try:
+        modified, kind, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        modified = parse_datetime(modified)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if modified is None or modified.tzinfo is None or not isinstance(kind, str) or not isinstance(pk, int):
+        raise ValueError("Invalid cursor")
+    return Position(modified, kind, pk)
+
+
+def since_position(since):
+    # before every change made at ``since``
+    return Position(since, "", 0)
+
+
+def is_tombstone(instance):
+    return instance.is_deleted or not instance.is_active
+
+
+def settled():
+    """
+    Newest ``modified`` that ``changes_after`` returns.
+    """
+    return timezone.now() - timedelta(seconds=getattr(settings, "SYNC_SETTLE_SECONDS", 30))
+
+
+def _after(kind, position, id_field="id"):
+    if position is None:
+        return Q()
+    if kind > position.kind:
+        return Q(modified__gte=position.modified)
+    if kind == position.kind:
+        return Q(modified__gt=position.modified) | Q(modified=position.modified, **{id_field + "__gt": position.id})
+    return Q(modified__gt=position.modified)
+
+
+def changes_after(position, kinds=None, limit=100):
+    """
+    Up to ``limit`` changes after ``position`` (``None`` for all), and whether more follow.
+    """
+    until = settled()
+    streams = []
+    for kind in sorted(kinds or MODELS):
+        # the manager's base queryset keeps soft-deleted rows, which become tombstones
+        queryset = MODELS[kind].objects.get_queryset().filter(_after(kind, position), modified__lte=until)
+        streams.append([Change(kind, instance) for instance in queryset.order_by("modified", "id")[:limit + 1]])
+        deletions = Deletion.objects.filter(_after(kind, position, "object_id"), kind=kind, modified__lte=until)
+        streams.append([
+            Change(kind, Deleted(deletion.object_id, deletion.slug, deletion.modified, False, True))
+            for deletion in deletions.order_by("modified", "object_id")[:limit + 1]
+        ])
+    merged = list(
+        heapq.merge(*streams, key=lambda change: (change.instance.modified, change.kind, change.instance.pk))
+    )
+    return merged[:limit], len(merged) > limit
+
+
+def position_of(change):
+    return Position(change.instance.modified, change.kind, change.instance.pk)
@@ -0,0 +1,198 @@
+"""
+"published", "updated" and "removed" events of newsletters, updates and practicals, fanned out
+to the server-sent event streams of ``events/``.
+
+Each worker process holds one broker. ``LocalBroker`` numbers events itself and only reaches
+streams of its own process, which is enough for tests and a single-process server.
+``RedisBroker`` appends every event to a capped Redis stream (its id is the event id, and the
+stream is what ``Last-Event-ID`` resumes from) and announces it on a pub/sub channel. One
+listener thread per process receives the announcements, so an idle client costs an in-memory
+queue rather than a Redis connection.
+
+A client whose ``Last-Event-ID`` is no longer in the history gets a ``reset`` event instead of a
+replay, and syncs again through ``changes/``.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+
+# django imports
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED = "published"
+UPDATED = "updated"
+REMOVED = "removed"
+RESET = "reset"
+
+
+class Subscription:
+    """
+    Events delivered to one stream. A client too slow to keep up is marked ``overflowed`` and
+    its stream ends, so it reconnects and catches up from its ``Last-Event-ID``.
+    """
+
+    def __init__(self, size):
+        self.queue = queue.Queue(maxsize=size)
+        self.overflowed = False
+
+    def put(self, event_id, data):
+        try:
+            self.queue.put_nowait((event_id, data))
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class LocalBroker:
+    def __init__(self, history=1000, queue_size=100):
+        self.queue_size = queue_size
+        self._history = deque(maxlen=history)
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._last_id = 0
+
+    def publish(self, data):
+        with self._lock:
+            self._last_id += 1
+            event_id = str(self._last_id)
+            self._history.append((event_id, data))
+        self._fan_out(event_id, data)
+        return event_id
+
+    def _fan_out(self, event_id, data):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.put(event_id, data)
+
+    @contextmanager
+    def subscribe(self):
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions.discard(subscription)
+
+    def replay(self, last_id):
+        """
+        ``(id, data)`` of the events after ``last_id``; ``None`` if some of them are no longer in
+        the history, or ``last_id`` was never published.
+        """
+        try:
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            oldest = int(self._history[0][0]) if self._history else self._last_id + 1
+            if last_id < oldest - 1 or last_id > self._last_id:
+                return None
+            return [(event_id, data) for event_id, data in self._history if int(event_id) > last_id]
+
+
+class RedisBroker(LocalBroker):
+    def __init__(self, url, stream="newsletter:events", channel="newsletter:events", history=10000, queue_size=100):
+        import redis
+
+        super().__init__(history=0, queue_size=queue_size)
+        self.client = redis.Redis.from_url(url)
+        self.stream = stream
+        self.channel = channel
+        self.maxlen = history
+        self._listener = None
+
+    def publish(self, data):
+        payload = json.dumps(data)
+        event_id = self.client.xadd(self.stream, {"d": payload}, maxlen=self.maxlen, approximate=True).decode()
+        self.client.publish(self.channel, json.dumps([event_id, data]))
+        return event_id
+
+    @contextmanager
+    def subscribe(self):
+        self._start_listener()
+        with super().subscribe() as subscription:
+            yield subscription
+
+    def _start_listener(self):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="content-events", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    event_id, data = json.loads(message["data"])
+                    self._fan_out(event_id, data)
+            except Exception:
+                # streams resume from the Redis stream once clients reconnect
+                logger.exception("Content event listener lost its Redis connection")
+                time.sleep(1)
+
+    def replay(self, last_id):
+        import redis
+
+        try:
+            entries = self.client.xrange(self.stream, min=last_id, max="+", count=self.maxlen + 1)
+        except redis.ResponseError:
+            return None
+        # the stream starts with last_id unless it has been trimmed
+        if not entries or entries[0][0].decode() != last_id:
+            return None
+        return [(entry_id.decode(), json.loads(fields[b"d"])) for entry_id, fields in entries[1:]]
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    config = getattr(settings, "CONTENT_EVENTS", {})
+    backend = import_string(config.get("BACKEND", "newsletter.sync.events.LocalBroker"))
+    return backend(**config.get("OPTIONS", {}))
+
+
+def transition(was_visible, is_visible, created=False):
+    """
+    Event for a post going from ``was_visible`` to ``is_visible``, ``None`` if clients don't see it.
+    """
+    if is_visible:
+        return PUBLISHED if created or not was_visible else UPDATED
+    return REMOVED if was_visible and not created else None
+
+
+def event_data(event, kind, instance):
+    return {
+        "event": event,
+        "type": kind,
+        "id": instance.pk,
+        "slug": instance.slug,
+        "modified": instance.modified.isoformat(),
+    }
+
+
+def format_event(event_id, data):
+    """
+    Without ``event_id`` the client keeps its last one.
+    """
+    if event_id is None:
+        return "event: %s\ndata: %s\n\n" % (data["event"], json.dumps(data))
+    return "id: %s\nevent: %s\ndata: %s\n\n" % (event_id, data["event"], json.dumps(data))
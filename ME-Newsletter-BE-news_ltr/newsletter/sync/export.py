@@ -0,0 +1,220 @@
+"""
+Static copy of the public API for a CDN: every response written as ``.json`` with ``.json.gz``
+and ``.json.br`` variants under ``<output>/<version>/``.
+
+Responses are rendered by calling the views in-process, inside one read-only snapshot transaction
+so the export is consistent. A body identical to the one of the previous version (by SHA-256 in its
+``manifest.json``) is hard-linked from there; only changed bodies are written and compressed, by
+a pool of processes. ``<output>/LATEST`` names the current version and is replaced last, so a
+half-written export is never served; any response other than a 200 aborts the export before
+anything is written.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlencode
+
+# django imports
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.utils import timezone
+
+from newsletter.core.batch import PREFIX, dispatch, snapshot
+from newsletter.core.renderers import ORJSONRenderer
+from newsletter.locations.models import Region
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.api.v1.views import PracticalListView
+from newsletter.practicals.models import Practical
+
+LATEST = "LATEST"
+MANIFEST = "manifest.json"
+VARIANTS = (".json", ".json.gz", ".json.br")
+
+
+class ExportError(RuntimeError):
+    pass
+
+
+def targets():
+    """
+    ``(path, query)`` of every exported response, paths relative to ``api/v1/``.
+    """
+    yield from (("news-letter-list/", {}), ("news-letter-recent-list/", {}), ("prev-news-letter-list/", {}))
+    yield from (("update-list/", {}), ("update-recent-list/", {}), ("practical-recent-list/", {}), ("home/", {}))
+
+    for slug in NewsLetter.objects.active().order_by("id").values_list("slug", flat=True):
+        yield "news-letter-detail/%s/" % slug, {}
+    # the pages of the updates list run over every newsletter, and the last one has no page of
+    # its own unless it is the only one
+    issues = NewsLetter.objects.count()
+    pages = max(issues - 1, 1) if issues else 0
+    for code in Region.objects.order_by("id").values_list("code", flat=True):
+        for page in range(1, pages + 1):
+            yield "update-list/", {"region": code, "page": page}
+
+    practicals = Practical.objects.active()
+    for page in range(1, -(-practicals.count() // PracticalListView.page_size) + 1):
+        yield "practical-list/", {"page": page}
+    for slug in practicals.order_by("id").values_list("slug", flat=True):
+        yield "practical-detail/%s/" % slug, {}
+
+
+def file_name(path, query):
+    """
+    ``update-list/`` with ``region=middle-east&page=2`` -> ``update-list/page/2/region/middle-east/index``
+    """
+    parts = [part for part in path.split("/") if part]
+    for key in sorted(query):
+        parts += [key, str(query[key])]
+    if any(part in (".", "..") for part in parts):
+        raise ValueError("Unsafe path %r" % path)
+    return "/".join(["api", "v1"] + parts + ["index"])
+
+
+def export_host():
+    # absolute links in the export point to the first allowed host
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*":
+            return host.lstrip(".")
+    return "localhost"
+
+
+def base_request():
+    return WSGIRequest({
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": PREFIX,
+        "SERVER_NAME": export_host(),
+        "SERVER_PORT": "80",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+    })
+
+
+def render_all():
+    """
+    ``{url: body}`` of every target, read in one transaction. Raises ``ExportError`` if one of
+    them is not a 200, rather than leave it out of the export.
+    """
+    request = base_request()
+    renderer = ORJSONRenderer()
+    bodies = {}
+    with snapshot():
+        for path, query in targets():
+            url = PREFIX + path + ("?" + urlencode(query) if query else "")
+            status_code, data = dispatch(request, PREFIX + path, urlencode(query), throttled=False)
+            if status_code != 200 or data is None:
+                raise ExportError("%s answered %s" % (url, status_code))
+            bodies[url] = (file_name(path, query), renderer.render(data))
+    return bodies
+
+
+def _write_files(directory, name, body):
+    # runs in a worker process: compression only, no database access
+    import brotli
+
+    base = os.path.join(directory, name)
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    for suffix, content in (
+        (".json", body),
+        (".json.gz", gzip.compress(body, compresslevel=9, mtime=0)),
+        (".json.br", brotli.compress(body, quality=11)),
+    ):
+        with open(base + suffix, "wb") as handle:
+            handle.write(content)
+    return name
+
+
+def _link_files(previous, directory, name):
+    base = os.path.join(directory, name)
+    os.makedirs(os.path.dirname(base), exist_ok=True)
+    for suffix in VARIANTS:
+        try:
+            os.link(os.path.join(previous, name) + suffix, base + suffix)
+        except OSError:
+            shutil.copyfile(os.path.join(previous, name) + suffix, base + suffix)
+
+
+def latest_version(output):
+    try:
+        with open(os.path.join(output, LATEST)) as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {}
+
+
+def export(output, workers=None, full=False, keep=3):
+    """
+    Writes a new version under ``output``; returns ``(version, written, linked)``.
+    """
+    previous_version = None if full else latest_version(output)
+    previous_dir = os.path.join(output, previous_version) if previous_version else None
+    previous = read_manifest(previous_dir) if previous_dir else {}
+
+    bodies = render_all()
+    version = timezone.now().strftime("%Y%m%dT%H%M%S%fZ")
+    directory = os.path.join(output, version)
+    os.makedirs(directory)
+
+    manifest, changed, linked = {}, [], 0
+    for url, (name, body) in bodies.items():
+        digest = hashlib.sha256(body).hexdigest()
+        manifest[url] = {"file": name, "sha256": digest}
+        entry = previous.get(url)
+        if entry and entry["sha256"] == digest and entry["file"] == name:
+            _link_files(previous_dir, directory, name)
+            linked += 1
+        else:
+            changed.append((name, body))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for name, body in changed:
+            _write_files(directory, name, body)
+    else:
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for name, body in changed:
+                pending.append(executor.submit(_write_files, directory, name, body))
+                # bounded, so all compressed bodies are never held at once
+                if len(pending) >= workers * 2:
+                    pending.popleft().result()
+            while pending:
+                pending.popleft().result()
+
+    with open(os.path.join(directory, MANIFEST), "w") as handle:
+        json.dump(manifest, handle, indent=1, sort_keys=True)
+    pointer = os.path.join(output, LATEST + ".tmp")
+    with open(pointer, "w") as handle:
+        handle.write(version)
+    os.replace(pointer, os.path.join(output, LATEST))
+
+    prune(output, keep)
+    return version, len(changed), linked
+
+
+def prune(output, keep):
+    """
+    Removes all but the ``keep`` newest versions.
+    """
+    versions = sorted(
+        name for name in os.listdir(output)
+        if os.path.isfile(os.path.join(output, name, MANIFEST))
+    )
+    for name in versions[:-keep]:
+        shutil.rmtree(os.path.join(output, name))
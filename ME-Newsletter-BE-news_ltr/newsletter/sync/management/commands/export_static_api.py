@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from newsletter.sync.export import ExportError, export
+
+
+class Command(BaseCommand):
+    help = "Write the public API responses, with gzip and brotli variants, to a new versioned directory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory holding the versions and the LATEST pointer")
+        parser.add_argument(
+            "--workers", type=int, default=None, help="Compressing processes, defaults to the CPU count"
+        )
+        parser.add_argument("--full", action="store_true", help="Rewrite every file instead of reusing unchanged ones")
+        parser.add_argument("--keep", type=int, default=3, help="Versions to keep")
+
+    def handle(self, *args, **options):
+        try:
+            version, written, linked = export(
+                options["output"], workers=options["workers"], full=options["full"], keep=max(options["keep"], 1)
+            )
+        except ExportError as error:
+            raise CommandError("Export aborted, LATEST unchanged: %s" % error)
+        self.stdout.write(self.style.SUCCESS(
+            "Exported version %s: %d files written, %d unchanged" % (version, written, linked)
+        ))
@@ -0,0 +1,32 @@
+# Generated by Django 3.2.11 on 2026-10-19 19:45
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Deletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20, verbose_name='kind')),
+                ('object_id', models.PositiveIntegerField(verbose_name='object id')),
+                ('slug', models.CharField(blank=True, max_length=255, null=True, verbose_name='slug')),
+                ('modified', models.DateTimeField(default=django.utils.timezone.now, verbose_name='modified')),
+            ],
+            options={
+                'verbose_name': 'Deletion',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='deletion',
+            index=models.Index(fields=['kind', 'modified', 'object_id'], name='sync_deleti_kind_1f9179_idx'),
+        ),
+    ]
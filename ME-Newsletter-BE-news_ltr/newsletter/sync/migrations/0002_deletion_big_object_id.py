@@ -0,0 +1,18 @@
+# Generated by Django 3.2.11 on 2026-10-19 20:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='deletion',
+            name='object_id',
+            field=models.PositiveBigIntegerField(verbose_name='object id'),
+        ),
+    ]
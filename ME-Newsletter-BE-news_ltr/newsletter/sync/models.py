@@ -0,0 +1,20 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Deletion(models.Model):
+    """
+    A newsletter, update or practical deleted from the database, reported by ``changes/`` as a tombstone
+    """
+    kind = models.CharField(_("kind"), max_length=20)
+    object_id = models.PositiveBigIntegerField(_("object id"))
+    slug = models.CharField(_("slug"), max_length=255, null=True, blank=True)
+    modified = models.DateTimeField(_("modified"), default=timezone.now)
+
+    def __str__(self):
+        return "%s %s" % (self.kind, self.object_id)
+
+    class Meta:
+        verbose_name = "Deletion"
+        indexes = [models.Index(fields=["kind", "modified", "object_id"])]
@@ -0,0 +1,44 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from newsletter.sync.changes import MODELS
+from newsletter.sync.events import REMOVED, event_data, get_broker, transition
+from newsletter.sync.models import Deletion
+
+KINDS = {model: kind for kind, model in MODELS.items()}
+
+
+def _visible(is_active, is_deleted):
+    return bool(is_active) and not is_deleted
+
+
+def publish_on_commit(data):
+    transaction.on_commit(lambda: get_broker().publish(data))
+
+
+def publish_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    was_visible = not created and _visible(
+        instance.tracker.previous("is_active"), instance.tracker.previous("is_deleted")
+    )
+    event = transition(was_visible, _visible(instance.is_active, instance.is_deleted), created=created)
+    if event:
+        publish_on_commit(event_data(event, KINDS[sender], instance))
+
+
+def record_deletion(sender, instance, **kwargs):
+    # in the deleting transaction, a tombstone for changes/
+    Deletion.objects.create(kind=KINDS[sender], object_id=instance.pk, slug=instance.slug)
+
+
+def publish_on_delete(sender, instance, **kwargs):
+    if _visible(instance.is_active, instance.is_deleted):
+        # the primary key is cleared once the delete is done
+        publish_on_commit(event_data(REMOVED, KINDS[sender], instance))
+
+
+for model in MODELS.values():
+    post_save.connect(publish_on_save, sender=model, dispatch_uid="events-save-%s" % model.__name__)
+    post_delete.connect(publish_on_delete, sender=model, dispatch_uid="events-delete-%s" % model.__name__)
+    post_delete.connect(record_deletion, sender=model, dispatch_uid="deletion-%s" % model.__name__)
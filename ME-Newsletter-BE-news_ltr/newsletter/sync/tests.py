@@ -0,0 +1,226 @@
+import gzip
+import json
+import threading
+from datetime import timedelta
+
+import brotli
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from newsletter.core.throttling import AnonThrottle
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.practicals.models import Practical
+from newsletter.sync.api.v1.views import EventStreamView
+from newsletter.sync.events import LocalBroker, get_broker
+from newsletter.sync import export as export_module
+from newsletter.sync.export import export, latest_version, read_manifest
+from newsletter.updates.models import Update
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def settled_at_once(settings):
+    settings.SYNC_SETTLE_SECONDS = 0
+
+
+def changes(client, **params):
+    response = client.get("/api/v1/changes/", params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_delta_sync_with_tombstones(client):
+    start = (timezone.now() - timedelta(seconds=1)).isoformat()
+    update = Update.objects.create(title="Oil prices")
+    Practical.objects.create(title="Visa rules")
+    NewsLetter.objects.create(title="Issue 1")
+
+    first = changes(client, since=start)
+    assert sorted(change["type"] for change in first["results"]) == ["newsletter", "practical", "update"]
+    assert not first["has_more"]
+    assert changes(client, cursor=first["next"])["results"] == []
+
+    update.title = "Gas prices"
+    update.save()
+    second = changes(client, cursor=first["next"])
+    assert [(change["id"], change["data"]["title"]) for change in second["results"]] == [(update.pk, "Gas prices")]
+
+    update.remove()
+    third = changes(client, cursor=second["next"], type="update")
+    assert [(change["id"], change["deleted"], change["data"]) for change in third["results"]] == [
+        (update.pk, True, None)
+    ]
+
+
+def test_pages_through_equal_timestamps(client):
+    for number in range(3):
+        Update.objects.create(title="Update %d" % number)
+        Practical.objects.create(title="Practical %d" % number)
+    Update.objects.all().update(modified=timezone.now())
+    Practical.objects.all().update(modified=timezone.now())
+
+    page = changes(client, limit=2)
+    seen = [(change["type"], change["id"]) for change in page["results"]]
+    while page["has_more"]:
+        page = changes(client, limit=2, cursor=page["next"])
+        seen += [(change["type"], change["id"]) for change in page["results"]]
+    assert len(seen) == len(set(seen)) == 6
+
+
+def test_hard_deletes_leave_tombstones(client):
+    practical = Practical.objects.create(title="Visa rules")
+    page = changes(client, type="practical")
+    pk = practical.pk
+    practical.delete()
+
+    page = changes(client, cursor=page["next"], type="practical")
+    assert [(change["id"], change["slug"], change["deleted"]) for change in page["results"]] == [
+        (pk, "visa-rules", True)
+    ]
+    assert changes(client, cursor=page["next"])["results"] == []
+
+
+def test_recent_changes_wait_until_settled(client, settings):
+    settings.SYNC_SETTLE_SECONDS = 60
+    old = Update.objects.create(title="Oil prices")
+    Update.objects.filter(pk=old.pk).update(modified=timezone.now() - timedelta(minutes=10))
+    update = Update.objects.create(title="Gas prices")
+    page = changes(client)
+    assert [change["id"] for change in page["results"]] == [old.pk]
+
+    # a transaction committing late with an older timestamp is still ahead of the cursor
+    Update.objects.filter(pk=update.pk).update(modified=timezone.now() - timedelta(minutes=5))
+    assert [change["id"] for change in changes(client, cursor=page["next"])["results"]] == [update.pk]
+
+
+def test_bad_requests(client):
+    assert client.get("/api/v1/changes/", {"since": "yesterday"}).status_code == 400
+    assert client.get("/api/v1/changes/", {"cursor": "e30="}).status_code == 400
+    assert client.get("/api/v1/changes/", {"type": "user"}).status_code == 400
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    get_broker.cache_clear()
+    monkeypatch.setattr(EventStreamView, "max_duration", 0.3)
+    monkeypatch.setattr(EventStreamView, "heartbeat", 0.1)
+    yield get_broker()
+    get_broker.cache_clear()
+
+
+def read_events(response):
+    events = []
+    for chunk in response.streaming_content:
+        for block in chunk.decode().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if line.startswith(("id:", "data:")))
+            if fields:
+                events.append((fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+def test_publications_become_events(broker, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        update = Update.objects.create(title="Oil prices")
+        draft = Practical.objects.create(title="Draft", is_active=False)
+    practical_id = draft.pk
+    with django_capture_on_commit_callbacks(execute=True):
+        update.title = "Gas prices"
+        update.save()
+        draft.activate()
+    with django_capture_on_commit_callbacks(execute=True):
+        update.remove()
+        draft.delete()
+    # not committed yet, so not announced
+    NewsLetter.objects.create(title="Issue 1")
+
+    assert [(data["event"], data["type"], data["id"]) for _id, data in broker.replay("0")] == [
+        ("published", "update", update.pk),
+        ("updated", "update", update.pk),
+        ("published", "practical", practical_id),
+        ("removed", "update", update.pk),
+        ("removed", "practical", practical_id),
+    ]
+
+
+def test_stream_resumes_and_follows_live_events(client, broker):
+    first = broker.publish({"event": "published", "type": "update", "id": 1})
+    second = broker.publish({"event": "published", "type": "update", "id": 2})
+    threading.Timer(0.1, broker.publish, [{"event": "removed", "type": "update", "id": 1}]).start()
+
+    response = client.get("/api/v1/events/", HTTP_LAST_EVENT_ID=first, HTTP_ACCEPT="text/event-stream")
+    assert response["Content-Type"] == "text/event-stream"
+    events = read_events(response)
+    assert [(event_id, data["event"]) for event_id, data in events] == [
+        (second, "published"), (str(int(second) + 1), "removed"),
+    ]
+
+
+def test_stream_resets_clients_behind_the_history(client, broker):
+    small = LocalBroker(history=2)
+    first = small.publish({"event": "published", "type": "update", "id": 1})
+    for pk in (2, 3, 4):
+        last = small.publish({"event": "published", "type": "update", "id": pk})
+    # 2 was dropped from the history
+    assert small.replay(first) is None
+    assert [data["id"] for _id, data in small.replay(str(int(first) + 1))] == [3, 4]
+    assert small.replay(last) == []
+
+    # an id this broker never published, e.g. from before a restart
+    response = client.get("/api/v1/events/", HTTP_LAST_EVENT_ID="99", HTTP_ACCEPT="text/event-stream")
+    assert read_events(response) == [(None, {"event": "reset"})]
+
+
+def test_static_export_reuses_unchanged_files(client, tmp_path):
+    NewsLetter.objects.create(title="Issue 1", slug="issue-1")
+    practical = Practical.objects.create(title="Visa rules", slug="visa-rules")
+    Practical.objects.create(title="Labour law", slug="labour-law")
+
+    version, written, linked = export(str(tmp_path), workers=1)
+    directory = tmp_path / version
+    manifest = read_manifest(str(directory))
+    detail = directory / manifest["/api/v1/practical-detail/visa-rules/"]["file"]
+    body = detail.with_suffix(".json").read_bytes()
+    assert json.loads(body) == client.get("/api/v1/practical-detail/visa-rules/").json()
+    assert gzip.decompress(detail.with_suffix(".json.gz").read_bytes()) == body
+    assert brotli.decompress(detail.with_suffix(".json.br").read_bytes()) == body
+    assert "/api/v1/news-letter-detail/issue-1/" in manifest and "/api/v1/practical-list/?page=1" in manifest
+    assert linked == 0 and written == len(manifest)
+
+    practical.title = "Visa rules 2024"
+    practical.save()
+    call_command("export_static_api", str(tmp_path), "--workers", "2")
+    latest = latest_version(str(tmp_path))
+    changed = {
+        url for url, entry in read_manifest(str(tmp_path / latest)).items() if manifest.get(url) != entry
+    }
+    # the detail page, and the lists showing the practical
+    assert "/api/v1/practical-detail/visa-rules/" in changed
+    assert "/api/v1/practical-detail/labour-law/" not in changed
+    unchanged = tmp_path / latest / manifest["/api/v1/practical-detail/labour-law/"]["file"]
+    assert unchanged.with_suffix(".json").stat().st_nlink == 2
+
+
+def test_static_export_pages_every_newsletter_but_the_last(tmp_path):
+    NewsLetter.objects.create(title="Issue 1", slug="issue-1", publish=timezone.now() - timedelta(days=14))
+    NewsLetter.objects.create(title="Issue 2", slug="issue-2", publish=timezone.now() - timedelta(days=7))
+    NewsLetter.objects.create(title="Issue 3", slug="issue-3", is_active=False)
+
+    version, _written, _linked = export(str(tmp_path), workers=1)
+    pages = sorted(url for url in read_manifest(str(tmp_path / version)) if "region=middle-east" in url)
+    assert pages == ["/api/v1/update-list/?region=middle-east&page=%s" % page for page in (1, 2)]
+
+
+def test_static_export_is_not_throttled_and_all_or_nothing(tmp_path, monkeypatch):
+    Practical.objects.create(title="Visa rules", slug="visa-rules")
+    monkeypatch.setattr(AnonThrottle, "THROTTLE_RATES", {"anon": "1/day"})
+    version, written, _linked = export(str(tmp_path), workers=1)
+    assert written > 1
+
+    monkeypatch.setattr(export_module, "targets", lambda: iter([("home/", {}), ("nowhere/", {})]))
+    with pytest.raises(CommandError):
+        call_command("export_static_api", str(tmp_path), "--workers", "1")
+    assert latest_version(str(tmp_path)) == version
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted([version, "LATEST"])
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from newsletter.sync.api.v1 import views
+
+urlpatterns = [
+    path("changes/", views.ChangesView.as_view(), name="changes"),
+    path("events/", views.EventStreamView.as_view(), name="events"),
+]
@@ -0,0 +1,23 @@
+from django.contrib import admin
+from newsletter.tracking.models import IssueEngagement, TrackedLink
+
+
+class TrackedLinkAdmin(admin.ModelAdmin):
+    list_display = ["url", "newsletter", "created"]
+    list_filter = ["newsletter"]
+
+    def get_readonly_fields(self, request, obj=None):
+        # links are cached by id once created
+        return ["newsletter", "url"] if obj else []
+
+
+class IssueEngagementAdmin(admin.ModelAdmin):
+    list_display = ["newsletter", "opens", "clicks", "modified"]
+    readonly_fields = ["newsletter", "opens", "clicks", "modified"]
+
+    def has_add_permission(self, request):
+        return False
+
+
+admin.site.register(TrackedLink, TrackedLinkAdmin)
+admin.site.register(IssueEngagement, IssueEngagementAdmin)
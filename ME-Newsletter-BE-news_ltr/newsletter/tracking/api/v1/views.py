@@ -0,0 +1,57 @@
+import base64
+
+from django.core import signing
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseRedirect
+from django.utils.decorators import method_decorator
+from rest_framework.views import APIView
+from rest_framework import status
+from rest_framework.response import Response
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+
+from newsletter.tracking.buffer import track
+from newsletter.tracking.links import read_click_token, read_open_token, resolve_link
+from newsletter.tracking.models import EngagementEvent
+
+# 1x1 transparent GIF
+PIXEL = base64.b64decode("R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7")
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class OpenPixelView(APIView):
+    permission_classes = ()
+    authentication_classes = ()
+    throttle_classes = ()
+
+    @extend_schema(summary="Newsletter open tracking pixel", responses={200: OpenApiTypes.BINARY})
+    def get(self, request, token):
+        try:
+            newsletter_id, subscriber_id = read_open_token(token)
+        except signing.BadSignature:
+            pass
+        else:
+            track(EngagementEvent.OPEN, newsletter_id, subscriber_id=subscriber_id)
+        response = HttpResponse(PIXEL, content_type="image/gif")
+        response["Cache-Control"] = "no-store, max-age=0"
+        return response
+
+
+@method_decorator(transaction.non_atomic_requests, name="dispatch")
+class ClickRedirectView(APIView):
+    permission_classes = ()
+    authentication_classes = ()
+    throttle_classes = ()
+
+    @extend_schema(summary="Newsletter link click redirect", responses={302: None, 404: OpenApiTypes.OBJECT})
+    def get(self, request, token):
+        try:
+            link_id, subscriber_id = read_click_token(token)
+        except signing.BadSignature:
+            return Response({"result": "Invalid link"}, status=status.HTTP_404_NOT_FOUND)
+        target = resolve_link(link_id)
+        if target is None:
+            return Response({"result": "Invalid link"}, status=status.HTTP_404_NOT_FOUND)
+        url, newsletter_id = target
+        track(EngagementEvent.CLICK, newsletter_id, link_id=link_id, subscriber_id=subscriber_id)
+        return HttpResponseRedirect(url)
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class TrackingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'newsletter.tracking'
+
+    def ready(self):
+        import newsletter.tracking.signals  # noqa F401
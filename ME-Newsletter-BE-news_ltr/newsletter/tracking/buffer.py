@@ -0,0 +1,223 @@
+"""
+Opens and clicks are appended to a buffer instead of being written one row per hit.
+
+``LocalEventBuffer`` keeps them in the worker's memory and writes them in batches;
+``RedisStreamBuffer`` appends them to a Redis stream that ``manage.py flush_tracking_events``
+drains, so a send never puts per-hit writes on the primary database.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import datetime, timezone as dt_timezone
+from functools import lru_cache
+
+# django imports
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+Event = namedtuple("Event", ["kind", "newsletter_id", "link_id", "subscriber_id", "timestamp"])
+
+
+def _existing(model, ids):
+    ids = {pk for pk in ids if pk is not None}
+    return set(model.objects.filter(pk__in=ids).values_list("pk", flat=True)) if ids else set()
+
+
+def live_events(events):
+    """
+    ``events`` without references to rows deleted since they were tracked, so one of them cannot
+    fail the whole insert: events of a deleted issue are dropped, and deleted links and
+    subscribers become ``None``, like their ``SET_NULL`` foreign keys.
+    """
+    from newsletter.landing.models import SubscribeEmail
+    from newsletter.newsletterapp.models import NewsLetter
+    from newsletter.tracking.models import TrackedLink
+
+    newsletters = _existing(NewsLetter, (event.newsletter_id for event in events))
+    links = _existing(TrackedLink, (event.link_id for event in events))
+    subscribers = _existing(SubscribeEmail, (event.subscriber_id for event in events))
+    live = [
+        event._replace(
+            link_id=event.link_id if event.link_id in links else None,
+            subscriber_id=event.subscriber_id if event.subscriber_id in subscribers else None,
+        )
+        for event in events
+        if event.newsletter_id in newsletters
+    ]
+    if len(live) < len(events):
+        logger.warning("Dropped %d tracking events of deleted newsletters", len(events) - len(live))
+    return live
+
+
+def persist_events(events):
+    """
+    Writes a batch of events with one bulk insert and one counter update per issue.
+    """
+    from newsletter.tracking.models import EngagementEvent, IssueEngagement
+
+    events = live_events(events) if events else events
+    if not events:
+        return
+    opens, clicks = Counter(), Counter()
+    for event in events:
+        (opens if event.kind == EngagementEvent.OPEN else clicks)[event.newsletter_id] += 1
+    with transaction.atomic():
+        EngagementEvent.objects.bulk_create(
+            [
+                EngagementEvent(
+                    kind=event.kind,
+                    newsletter_id=event.newsletter_id,
+                    link_id=event.link_id,
+                    subscriber_id=event.subscriber_id,
+                    created=datetime.fromtimestamp(event.timestamp, tz=dt_timezone.utc),
+                )
+                for event in events
+            ],
+            batch_size=500,
+        )
+        for newsletter_id in set(opens) | set(clicks):
+            IssueEngagement.objects.add(newsletter_id, opens=opens[newsletter_id], clicks=clicks[newsletter_id])
+
+
+class LocalEventBuffer:
+    """
+    Per-worker buffer, written by a background thread once it holds ``flush_size`` events or its
+    oldest event is ``flush_interval`` seconds old, and when the worker exits. Requests only
+    append.
+    """
+
+    def __init__(self, flush_size=500, flush_interval=10):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._events = []
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._wake = threading.Event()
+        self._flusher = None
+        self._pid = None
+        atexit.register(self.flush)
+
+    def append(self, event):
+        with self._lock:
+            if not self._events:
+                self._started = time.monotonic()
+            self._events.append(event)
+            full = len(self._events) >= self.flush_size
+        self._start_flusher()
+        if full:
+            self._wake.set()
+
+    def _start_flusher(self):
+        # threads do not survive a fork: a worker forked from a process using the buffer starts its own
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._flusher = threading.Thread(target=self._run, name="tracking-flush", daemon=True)
+                self._flusher.start()
+
+    def _next_flush(self):
+        """
+        Seconds until the buffer is due, ``0`` if it is.
+        """
+        with self._lock:
+            if not self._events:
+                return self.flush_interval
+            if len(self._events) >= self.flush_size:
+                return 0
+            return max(self._started + self.flush_interval - time.monotonic(), 0)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self._next_flush())
+            self._wake.clear()
+            if len(self) and not self._next_flush():
+                self.flush()
+                connections.close_all()
+
+    def flush(self):
+        with self._lock:
+            events, self._events = self._events, []
+        try:
+            persist_events(events)
+        except Exception:
+            logger.exception("Could not persist %d tracking events", len(events))
+
+    def __len__(self):
+        return len(self._events)
+
+
+class RedisStreamBuffer:
+    """
+    Appends events to a capped Redis stream; ``drain`` reads them back through a consumer group
+    and acknowledges them once persisted, so several flushers can share the work.
+    """
+    group = "persist"
+
+    def __init__(self, url, stream="newsletter:tracking", maxlen=1000000, consumer="flusher"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.stream = stream
+        self.maxlen = maxlen
+        self.consumer = consumer
+
+    def append(self, event):
+        self.client.xadd(self.stream, {"e": json.dumps(event)}, maxlen=self.maxlen, approximate=True)
+
+    def flush(self):
+        """
+        Events are persisted by ``drain``, there is nothing held in the worker.
+        """
+
+    def _ensure_group(self):
+        import redis
+
+        try:
+            self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except redis.ResponseError as error:
+            if "BUSYGROUP" not in str(error):
+                raise
+
+    def drain(self, count=1000, block=None):
+        """
+        Persists up to ``count`` pending events and returns how many were written.
+        """
+        self._ensure_group()
+        # entries delivered to this consumer but never acknowledged come first ("0"), then new ones
+        for start in ("0", ">"):
+            response = self.client.xreadgroup(
+                self.group, self.consumer, {self.stream: start}, count=count, block=block if start == ">" else None
+            )
+            entries = response[0][1] if response else []
+            if entries:
+                break
+        if not entries:
+            return 0
+        ids = [entry_id for entry_id, _fields in entries]
+        persist_events([Event(*json.loads(fields[b"e"])) for _entry_id, fields in entries])
+        self.client.xack(self.stream, self.group, *ids)
+        self.client.xdel(self.stream, *ids)
+        return len(ids)
+
+
+@lru_cache(maxsize=None)
+def get_buffer():
+    config = getattr(settings, "TRACKING_BUFFER", {})
+    backend = import_string(config.get("BACKEND", "newsletter.tracking.buffer.LocalEventBuffer"))
+    return backend(**config.get("OPTIONS", {}))
+
+
+def track(kind, newsletter_id, link_id=None, subscriber_id=None):
+    get_buffer().append(Event(kind, newsletter_id, link_id, subscriber_id, time.time()))
@@ -0,0 +1,66 @@
+from __future__ import unicode_literals, absolute_import
+
+# django imports
+from django.core import signing
+from django.core.cache import cache
+from django.urls import reverse
+
+from newsletter.tracking.models import TrackedLink
+
+OPEN_SALT = "newsletter.tracking.open"
+CLICK_SALT = "newsletter.tracking.click"
+# per-worker copy of the link table; links are immutable, so entries never go stale
+LOCAL_LINKS_MAX = 10000
+_local_links = {}
+
+
+def _cache_key(link_id):
+    return "tracking:link:%s" % link_id
+
+
+def remember_link(link):
+    cache.set(_cache_key(link.pk), (link.url, link.newsletter_id), None)
+
+
+def forget_link(link_id):
+    cache.delete(_cache_key(link_id))
+    _local_links.pop(link_id, None)
+
+
+def resolve_link(link_id):
+    """
+    ``(url, newsletter_id)`` of a tracked link, from worker memory, then the shared cache.
+    The database is only read for a link that was never cached, e.g. after a cache flush.
+    """
+    target = _local_links.get(link_id)
+    if target is None:
+        target = cache.get(_cache_key(link_id))
+        if target is None:
+            target = TrackedLink.objects.filter(pk=link_id).values_list("url", "newsletter_id").first()
+            if target is None:
+                return None
+            cache.set(_cache_key(link_id), target, None)
+        if len(_local_links) >= LOCAL_LINKS_MAX:
+            _local_links.clear()
+        _local_links[link_id] = target = tuple(target)
+    return target
+
+
+def open_pixel_path(newsletter, subscriber=None):
+    token = signing.dumps([newsletter.pk, subscriber.pk if subscriber else None], salt=OPEN_SALT, compress=True)
+    return reverse("track-open", kwargs={"token": token})
+
+
+def click_path(link, subscriber=None):
+    token = signing.dumps([link.pk, subscriber.pk if subscriber else None], salt=CLICK_SALT, compress=True)
+    return reverse("track-click", kwargs={"token": token})
+
+
+def read_open_token(token):
+    newsletter_id, subscriber_id = signing.loads(token, salt=OPEN_SALT)
+    return newsletter_id, subscriber_id
+
+
+def read_click_token(token):
+    link_id, subscriber_id = signing.loads(token, salt=CLICK_SALT)
+    return link_id, subscriber_id
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from newsletter.tracking.buffer import get_buffer
+
+
+class Command(BaseCommand):
+    help = "Persist buffered open/click events; with --follow, keep draining the Redis stream"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--follow", action="store_true", help="Keep running, waiting for new events")
+
+    def handle(self, *args, **options):
+        buffer = get_buffer()
+        if not hasattr(buffer, "drain"):
+            # a per-worker buffer is flushed by the workers; this process would only see its own
+            raise CommandError("TRACKING_BUFFER has no shared queue to drain, the workers flush their own events")
+        total = 0
+        while True:
+            written = buffer.drain(options["batch_size"], block=5000 if options["follow"] else None)
+            total += written
+            if not written and not options["follow"]:
+                break
+        self.stdout.write(self.style.SUCCESS("Persisted %d tracking events" % total))
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.11 on 2026-10-19 18:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('newsletterapp', '0008_auto_20230215_0958'),
+        ('landing', '0004_subscribeemail_pending_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueEngagement',
+            fields=[
+                ('newsletter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='engagement', serialize=False, to='newsletterapp.newsletter')),
+                ('opens', models.PositiveIntegerField(default=0, verbose_name='opens')),
+                ('clicks', models.PositiveIntegerField(default=0, verbose_name='clicks')),
+                ('modified', models.DateTimeField(default=django.utils.timezone.now, verbose_name='modified')),
+            ],
+            options={
+                'verbose_name': 'Issue Engagement',
+            },
+        ),
+        migrations.CreateModel(
+            name='TrackedLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('url', models.URLField(max_length=2000, verbose_name='url')),
+                ('newsletter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tracked_links', to='newsletterapp.newsletter')),
+            ],
+            options={
+                'verbose_name': 'Tracked Link',
+                'unique_together': {('newsletter', 'url')},
+            },
+        ),
+        migrations.CreateModel(
+            name='EngagementEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('open', 'Open'), ('click', 'Click')], max_length=10, verbose_name='kind')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='created')),
+                ('link', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='tracking.trackedlink')),
+                ('newsletter', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='newsletterapp.newsletter')),
+                ('subscriber', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='landing.subscribeemail')),
+            ],
+            options={
+                'verbose_name': 'Engagement Event',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='engagementevent',
+            index=models.Index(fields=['newsletter', 'created'], name='engagement_issue_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from model_utils.models import TimeStampedModel
+
+from newsletter.core.managers import CounterManager
+from newsletter.landing.models import SubscribeEmail
+from newsletter.newsletterapp.models import NewsLetter
+
+
+class TrackedLink(TimeStampedModel):
+    """
+    Target of a tracked link in a newsletter issue. Links are cached by id once created,
+    so the url must not change after the issue went out.
+    """
+    newsletter = models.ForeignKey(NewsLetter, on_delete=models.CASCADE, related_name="tracked_links")
+    url = models.URLField(_("url"), max_length=2000)
+
+    def __str__(self):
+        return self.url
+
+    class Meta:
+        verbose_name = "Tracked Link"
+        unique_together = ("newsletter", "url")
+
+
+class EngagementEvent(models.Model):
+    """
+    A single open or click, written in batches from the tracking buffer
+    """
+    OPEN = "open"
+    CLICK = "click"
+    KIND_CHOICES = (
+        (OPEN, "Open"),
+        (CLICK, "Click"),
+    )
+    kind = models.CharField(_("kind"), choices=KIND_CHOICES, max_length=10)
+    newsletter = models.ForeignKey(NewsLetter, on_delete=models.CASCADE, db_index=False)
+    link = models.ForeignKey(TrackedLink, on_delete=models.SET_NULL, null=True, blank=True)
+    subscriber = models.ForeignKey(SubscribeEmail, on_delete=models.SET_NULL, null=True, blank=True)
+    created = models.DateTimeField(_("created"), default=timezone.now)
+
+    class Meta:
+        verbose_name = "Engagement Event"
+        indexes = [models.Index(fields=["newsletter", "created"], name="engagement_issue_idx")]
+
+
+class IssueEngagementManager(CounterManager):
+    def add(self, newsletter_id, opens=0, clicks=0):
+        self.increment(
+            {"newsletter_id": newsletter_id}, values={"modified": timezone.now()}, opens=opens, clicks=clicks
+        )
+
+
+class IssueEngagement(models.Model):
+    """
+    Open and click counters per newsletter issue, rolled up on every buffer flush
+    """
+    newsletter = models.OneToOneField(
+        NewsLetter, on_delete=models.CASCADE, primary_key=True, related_name="engagement"
+    )
+    opens = models.PositiveIntegerField(_("opens"), default=0)
+    clicks = models.PositiveIntegerField(_("clicks"), default=0)
+    modified = models.DateTimeField(_("modified"), default=timezone.now)
+
+    objects = IssueEngagementManager()
+
+    def __str__(self):
+        return str(self.newsletter)
+
+    class Meta:
+        verbose_name = "Issue Engagement"
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from newsletter.tracking.links import forget_link, remember_link
+from newsletter.tracking.models import TrackedLink
+
+
+@receiver(post_save, sender=TrackedLink)
+def cache_link(sender, instance, **kwargs):
+    remember_link(instance)
+
+
+@receiver(post_delete, sender=TrackedLink)
+def uncache_link(sender, instance, **kwargs):
+    forget_link(instance.pk)
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from newsletter.landing.models import SubscribeEmail
+from newsletter.newsletterapp.models import NewsLetter
+from newsletter.tracking.buffer import Event, get_buffer, persist_events, track
+from newsletter.tracking.links import click_path, open_pixel_path
+from newsletter.tracking.models import EngagementEvent, IssueEngagement, TrackedLink
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def buffer(settings):
+    settings.TRACKING_BUFFER = {
+        "BACKEND": "newsletter.tracking.buffer.LocalEventBuffer",
+        "OPTIONS": {"flush_size": 3, "flush_interval": 3600},
+    }
+    get_buffer.cache_clear()
+    yield get_buffer()
+    get_buffer.cache_clear()
+
+
+@pytest.fixture
+def newsletter():
+    return NewsLetter.objects.create(title="Issue 1")
+
+
+def test_open_pixel_is_buffered(client, buffer, newsletter):
+    subscriber = SubscribeEmail.objects.create(email="a@example.com")
+    path = open_pixel_path(newsletter, subscriber)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(path)
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/gif"
+    assert not context.captured_queries
+    assert len(buffer) == 1
+
+    buffer.flush()
+    assert EngagementEvent.objects.get().subscriber == subscriber
+    assert IssueEngagement.objects.get(newsletter=newsletter).opens == 1
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+# the buffer is written by its own thread, on its own connection
+@pytest.mark.django_db(transaction=True)
+def test_click_redirects_from_cache_and_flushes_in_batches(client, buffer, newsletter):
+    link = TrackedLink.objects.create(newsletter=newsletter, url="https://example.com/story")
+    path = click_path(link)
+    with CaptureQueriesContext(connection) as context:
+        for _ in range(2):
+            response = client.get(path)
+            assert response.status_code == 302
+            assert response["Location"] == "https://example.com/story"
+    assert not context.captured_queries
+
+    client.get(path)
+    assert wait_for(lambda: IssueEngagement.objects.filter(newsletter=newsletter, clicks=3).exists())
+    assert len(buffer) == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_quiet_buffer_is_flushed_on_time(settings, newsletter):
+    settings.TRACKING_BUFFER = {
+        "BACKEND": "newsletter.tracking.buffer.LocalEventBuffer",
+        "OPTIONS": {"flush_size": 100, "flush_interval": 0.2},
+    }
+    get_buffer.cache_clear()
+    track(EngagementEvent.OPEN, newsletter.pk)
+    # no further event comes to trigger it
+    assert wait_for(lambda: EngagementEvent.objects.exists())
+    assert len(get_buffer()) == 0
+    get_buffer.cache_clear()
+
+
+def test_invalid_tokens(client, buffer):
+    assert client.get("/api/v1/track/click/nope/").status_code == 404
+    assert client.get("/api/v1/track/open/nope/").status_code == 200
+    assert len(buffer) == 0
+
+
+def test_events_of_deleted_rows_do_not_fail_the_batch(newsletter):
+    link = TrackedLink.objects.create(newsletter=newsletter, url="https://example.com/")
+    subscriber = SubscribeEmail.objects.create(email="a@example.com")
+    gone = NewsLetter.objects.create(title="Issue 2")
+    events = [
+        Event(EngagementEvent.CLICK, newsletter.pk, link.pk, subscriber.pk, 0),
+        Event(EngagementEvent.OPEN, gone.pk, None, subscriber.pk, 0),
+    ]
+    gone.delete()
+    link.delete()
+    subscriber.delete()
+    persist_events(events)
+    event = EngagementEvent.objects.get()
+    assert (event.newsletter_id, event.link_id, event.subscriber_id) == (newsletter.pk, None, None)
+    assert IssueEngagement.objects.get(newsletter=newsletter).clicks == 1
+
+
+def test_flush_command_needs_a_shared_buffer(buffer):
+    with pytest.raises(CommandError):
+        call_command("flush_tracking_events")
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from newsletter.tracking.api.v1 import views
+
+urlpatterns = [
+    path("track/open/<str:token>/", views.OpenPixelView.as_view(), name="track-open"),
+    path("track/click/<str:token>/", views.ClickRedirectView.as_view(), name="track-click"),
+]
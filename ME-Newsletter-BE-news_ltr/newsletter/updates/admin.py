@@ -1,8 +1,44 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+
+from newsletter.updates.dedup import duplicates_of
 from newsletter.updates.models import Update
 
+
 class UpdateAdmin(admin.ModelAdmin):
-    fields = ['newsletter','title','content','region', 'country','publish','is_active', 'is_deleted', 'meta_title', 'meta_description', 'meta_keywords']
+    fields = [
+        'newsletter', 'title', 'content', 'region', 'country', 'publish', 'is_active', 'is_deleted',
+        'meta_title', 'meta_description', 'meta_keywords', 'possible_duplicates',
+    ]
+    readonly_fields = ['possible_duplicates']
+
+    @admin.display(description="Possible duplicates")
+    def possible_duplicates(self, obj):
+        if obj is None or obj.pk is None:
+            return "-"
+        duplicates = duplicates_of(obj)
+        if not duplicates:
+            return "-"
+        return format_html_join(
+            format_html("<br>"),
+            '<a href="{}">{}</a> ({}% similar)',
+            (
+                (reverse("admin:updates_update_change", args=[other.pk]), other.title, round(score * 100))
+                for other, score in duplicates
+            ),
+        )
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        duplicates = duplicates_of(obj)
+        if duplicates:
+            self.message_user(
+                request,
+                "\"%s\" looks like a duplicate of: %s"
+                % (obj.title, ", ".join(other.title for other, _score in duplicates)),
+                messages.WARNING,
+            )
 
 
 admin.site.register(Update, UpdateAdmin)
@@ -0,0 +1,15 @@
+from django_filters import rest_framework as filters
+
+from newsletter.locations.filters import LocationFilter
+from newsletter.locations.models import Country, Region
+from newsletter.updates.models import Update
+
+
+class UpdateFilter(filters.FilterSet):
+    region = LocationFilter(field_name="region", location_model=Region)
+    country = LocationFilter(field_name="country", location_model=Country)
+    year = filters.NumberFilter(field_name="publish", lookup_expr="year")
+
+    class Meta:
+        model = Update
+        fields = ["region", "country", "year"]
@@ -1,11 +1,17 @@
-from rest_framework.serializers import ModelSerializer, SerializerMethodField
+from rest_framework.serializers import SerializerMethodField, StringRelatedField
 
+from newsletter.core.serializers import ModelSerializer, ValuesListSerializer
 from newsletter.updates.models import Update
 from newsletter.newsletterapp.models import NewsLetter
 
 
 class UpdateListSerializer(ModelSerializer):
+    region = StringRelatedField()
+    country = StringRelatedField()
+
     class Meta:
         model = Update
         fields = ["id","title", "description","content", "image", "region", "author","country", "publish", "time_to_read"]
+        list_serializer_class = ValuesListSerializer
+        values_sources = {"region": "region__name", "country": "country__name"}
 
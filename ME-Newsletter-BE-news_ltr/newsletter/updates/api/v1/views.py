@@ -3,21 +3,37 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 
+from newsletter.core.cache import cached_get
+from newsletter.locations.managers import UNKNOWN_ID
+from newsletter.locations.models import Region
 from newsletter.updates.models import Update
+from newsletter.newsletterapp.corpus import published_corpus
 from newsletter.newsletterapp.models import NewsLetter
 from newsletter.newsletterapp.api.v1.serializers import ListSerializer, DetailSerializer
+from newsletter.updates.api.v1.filters import UpdateFilter
 from newsletter.updates.api.v1.serializers import UpdateListSerializer
 
 
 class UpdateAndAroundTheWorldListView(APIView):
     permission_classes = ()
     authentication_classes = ()
+    batchable = True
 
+    @cached_get(params=("region", "page", "country", "year"))
     def get(self, request):
         region = request.GET.get("region")
         page = request.GET.get("page")
+        filterset = UpdateFilter(request.GET, queryset=Update.objects.active())
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+        filtered_updates = filterset.qs
+        # the snapshot has no other filters than the region
+        corpus = published_corpus.get() if set(request.GET) <= {"region", "page"} else None
 
         if region and page:
+            region_id = Region.objects.resolve(region, default=UNKNOWN_ID)
+            if corpus is not None:
+                return self.get_page(corpus, region_id, page)
             try:
                 page = int(page)
                 current_page = page - 1
@@ -27,10 +43,10 @@ class UpdateAndAroundTheWorldListView(APIView):
                     previous_updates = []
                 else:
                     previous_news_letter = NewsLetter.objects.order_by("-publish")[page]
-                    previous_updates = Update.objects.active().filter(newsletter=previous_news_letter, region=region)
+                    previous_updates = filtered_updates.filter(newsletter=previous_news_letter, region_id=region_id)
                     previous_updates_serilizer = UpdateListSerializer(previous_updates, many=True)
                     previous_updates = previous_updates_serilizer.data
-                updates = Update.objects.active().filter(newsletter=news_letter, region=region)
+                updates = filtered_updates.filter(newsletter=news_letter, region_id=region_id)
                 serializer = UpdateListSerializer(updates, many=True)
                 return Response({"result":serializer.data, "previous_updates":previous_updates}, status=status.HTTP_200_OK)
 
@@ -38,8 +54,15 @@ class UpdateAndAroundTheWorldListView(APIView):
                 return Response({"result":"Page doen't exist"}, status=status.HTTP_400_BAD_REQUEST)
 
         elif not region and not page:
-            updates = Update.objects.active().order_by("-publish").filter(region="MiddleEast")
-            arountheworld = Update.objects.active().order_by("-publish").filter(region="Around The World")
+            middle_east = Region.objects.resolve(Region.MIDDLE_EAST, default=UNKNOWN_ID)
+            around_the_world = Region.objects.resolve(Region.AROUND_THE_WORLD, default=UNKNOWN_ID)
+            if corpus is not None:
+                return Response({
+                    "updates": corpus.with_content(corpus.updates_in(middle_east)),
+                    "around_the_world": corpus.with_content(corpus.updates_in(around_the_world)),
+                }, status=status.HTTP_200_OK)
+            updates = filtered_updates.order_by("-publish").filter(region_id=middle_east)
+            arountheworld = filtered_updates.order_by("-publish").filter(region_id=around_the_world)
             updates_serializer = UpdateListSerializer(updates, many=True)
             atw_serilizer = UpdateListSerializer(arountheworld, many=True)
             return Response({"updates":updates_serializer.data, "around_the_world":atw_serilizer.data}, status=status.HTTP_200_OK)
@@ -47,11 +70,32 @@ class UpdateAndAroundTheWorldListView(APIView):
         else:
             return Response({"result":"Either Page or Region Not Provided"}, status=status.HTTP_400_BAD_REQUEST )
 
+    def get_page(self, corpus, region_id, page):
+        """
+        Same pages as the database queries above: page ``n`` is the ``n``-th newsletter by
+        ``-publish`` and needs a next one, unless it is the only one.
+        """
+        issues = corpus.issues
+        try:
+            page = int(page)
+        except ValueError:
+            page = 0
+        if page < 1 or page > len(issues) or (len(issues) > 1 and page == len(issues)):
+            return Response({"result":"Page doen't exist"}, status=status.HTTP_400_BAD_REQUEST)
+        previous_updates = corpus.with_content(corpus.updates_of(issues[page], region_id)) if len(issues) > 1 else []
+        updates = corpus.with_content(corpus.updates_of(issues[page - 1], region_id))
+        return Response({"result":updates, "previous_updates":previous_updates}, status=status.HTTP_200_OK)
+
 class UpdateRecentView(APIView):
     permission_classes = ()
     authentication_classes = ()
+    batchable = True
     queryset = Update.objects.active()
+    @cached_get()
     def get(self, request):
+        corpus = published_corpus.get()
+        if corpus is not None:
+            return Response({"result":corpus.with_content(corpus.updates[:4])}, status=status.HTTP_200_OK)
         queryset = self.queryset.all().order_by("-created")[:4]
         serializer = UpdateListSerializer(queryset, many=True)
         return Response({"result":serializer.data}, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UpdatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'newsletter.updates'
+
+    def ready(self):
+        import newsletter.updates.signals  # noqa F401
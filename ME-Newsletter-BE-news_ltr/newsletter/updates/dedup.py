@@ -0,0 +1,147 @@
+"""
+Near-duplicate updates from MinHash signatures and their LSH buckets.
+
+Each update's signature is stored on save with one ``UpdateBand`` row per band; the duplicates
+of an update are the updates sharing at least one bucket with it whose estimated similarity
+reaches ``DUPLICATE_THRESHOLD``, found through the ``(band, bucket)`` index.
+"""
+from __future__ import unicode_literals, absolute_import
+
+# python imports
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+
+# django imports
+from django.db import transaction
+from django.db.models import Q
+
+from newsletter.core.minhash import bands, from_bytes, signature, similarity, to_bytes
+from newsletter.core.utils import html_to_text
+from newsletter.updates.models import Update, UpdateBand, UpdateSignature
+
+DUPLICATE_THRESHOLD = 0.5
+
+
+def update_text(title, content):
+    return " ".join(filter(None, [title, html_to_text(content)]))
+
+
+def store_signature(update_id, minhash):
+    with transaction.atomic():
+        UpdateBand.objects.filter(update_id=update_id).delete()
+        if minhash is None:
+            UpdateSignature.objects.filter(update_id=update_id).delete()
+            return
+        UpdateSignature.objects.update_or_create(update_id=update_id, defaults={"minhash": to_bytes(minhash)})
+        UpdateBand.objects.bulk_create(
+            [UpdateBand(update_id=update_id, band=band, bucket=bucket) for band, bucket in bands(minhash)]
+        )
+
+
+def sign_update(update):
+    store_signature(update.pk, signature(update_text(update.title, update.content)))
+
+
+def duplicates_of(update, threshold=DUPLICATE_THRESHOLD):
+    """
+    ``[(update, similarity), ...]`` of the other live updates resembling ``update``, most similar first.
+    """
+    try:
+        minhash = from_bytes(update.signature.minhash)
+    except UpdateSignature.DoesNotExist:
+        return []
+    same_bucket = Q()
+    for band, bucket in bands(minhash):
+        same_bucket |= Q(band=band, bucket=bucket)
+    candidates = UpdateBand.objects.filter(same_bucket).exclude(update_id=update.pk).values("update_id")
+    signatures = UpdateSignature.objects.filter(
+        update_id__in=candidates, update__is_deleted=False
+    ).select_related("update")
+    found = [(other.update, similarity(minhash, from_bytes(other.minhash))) for other in signatures]
+    return sorted(
+        [(other, score) for other, score in found if score >= threshold],
+        key=lambda pair: (-pair[1], pair[0].pk),
+    )
+
+
+def _sign_chunk(rows):
+    # runs in a worker process: no database access, only hashing
+    result = []
+    for pk, title, content in rows:
+        minhash = signature(update_text(title, content))
+        result.append((pk, None if minhash is None else to_bytes(minhash)))
+    return result
+
+
+def _store_chunk(chunk):
+    for pk, minhash in chunk:
+        store_signature(pk, None if minhash is None else from_bytes(minhash))
+    return len(chunk)
+
+
+def sign_corpus(resign=False, workers=None, chunk_size=500):
+    """
+    Computes the signatures of the live updates (only the missing ones unless ``resign``) in
+    chunks hashed by a pool of ``workers`` processes; returns how many updates were signed.
+    """
+    queryset = Update.objects.all()
+    if not resign:
+        queryset = queryset.filter(signature__isnull=True)
+    # ids first, so storing signatures never races the query selecting unsigned updates
+    ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+    chunks = (
+        list(Update.objects.all().filter(pk__in=ids[start:start + chunk_size]).values_list("pk", "title", "content"))
+        for start in range(0, len(ids), chunk_size)
+    )
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return sum(_store_chunk(_sign_chunk(chunk)) for chunk in chunks)
+
+    total, pending = 0, deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in chunks:
+            pending.append(executor.submit(_sign_chunk, chunk))
+            # a couple of chunks in flight per worker keeps memory flat on large tables
+            if len(pending) >= workers * 2:
+                total += _store_chunk(pending.popleft().result())
+        while pending:
+            total += _store_chunk(pending.popleft().result())
+    return total
+
+
+def find_clusters(threshold=DUPLICATE_THRESHOLD):
+    """
+    Groups of live updates linked by pairwise similarity of at least ``threshold``, as sorted id
+    lists; only updates sharing a bucket are ever compared.
+    """
+    signatures = {
+        pk: from_bytes(minhash)
+        for pk, minhash in UpdateSignature.objects.filter(update__is_deleted=False).values_list("update_id", "minhash")
+    }
+    parent = {}
+
+    def find(pk):
+        while parent[pk] != pk:
+            pk = parent[pk]
+        return pk
+
+    compared = set()
+    rows = UpdateBand.objects.filter(update__is_deleted=False).order_by("band", "bucket", "update_id")
+    for _key, group in groupby(rows.values_list("band", "bucket", "update_id").iterator(), key=lambda row: row[:2]):
+        members = [row[2] for row in group]
+        for position, first in enumerate(members):
+            for second in members[position + 1:]:
+                if (first, second) in compared or first not in signatures or second not in signatures:
+                    continue
+                compared.add((first, second))
+                if similarity(signatures[first], signatures[second]) >= threshold:
+                    parent.setdefault(first, first)
+                    parent.setdefault(second, second)
+                    parent[find(second)] = find(first)
+
+    clusters = {}
+    for pk in parent:
+        clusters.setdefault(find(pk), set()).add(pk)
+    return sorted(sorted(cluster) for cluster in clusters.values())
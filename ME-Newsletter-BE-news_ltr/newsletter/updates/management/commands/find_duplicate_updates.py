@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from newsletter.updates.dedup import DUPLICATE_THRESHOLD, find_clusters, sign_corpus
+from newsletter.updates.models import Update
+
+
+class Command(BaseCommand):
+    help = "Sign unsigned updates in parallel chunks and report clusters of near-duplicates"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resign", action="store_true", help="Recompute every signature, not only missing ones")
+        parser.add_argument("--workers", type=int, default=None, help="Hashing processes, defaults to the CPU count")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD)
+
+    def handle(self, *args, **options):
+        signed = sign_corpus(options["resign"], options["workers"], options["chunk_size"])
+        self.stdout.write("Signed %d updates" % signed)
+        clusters = find_clusters(options["threshold"])
+        titles = dict(Update.objects.all().filter(pk__in=[pk for cluster in clusters for pk in cluster])
+                      .values_list("pk", "title"))
+        for cluster in clusters:
+            self.stdout.write("")
+            for pk in cluster:
+                self.stdout.write("  #%d %s" % (pk, titles.get(pk, "")))
+        self.stdout.write(self.style.SUCCESS("Found %d clusters of near-duplicate updates" % len(clusters)))
@@ -0,0 +1,40 @@
+# Generated by Django 3.2.11 on 2026-10-19 19:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('updates', '0007_alter_update_region'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UpdateSignature',
+            fields=[
+                ('update', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='updates.update')),
+                ('minhash', models.BinaryField(verbose_name='MinHash')),
+            ],
+            options={
+                'verbose_name': 'Update Signature',
+            },
+        ),
+        migrations.CreateModel(
+            name='UpdateBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField(verbose_name='band')),
+                ('bucket', models.BigIntegerField(verbose_name='bucket')),
+                ('update', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bands', to='updates.update')),
+            ],
+            options={
+                'verbose_name': 'Update Band',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='updateband',
+            index=models.Index(fields=['band', 'bucket'], name='update_band_bucket_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0002_seed_locations'),
+        ('updates', '0008_update_minhash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='update',
+            name='region_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updates', to='locations.region', verbose_name='Region'),
+        ),
+        migrations.AddField(
+            model_name='update',
+            name='country_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updates', to='locations.country', verbose_name='Country'),
+        ),
+    ]
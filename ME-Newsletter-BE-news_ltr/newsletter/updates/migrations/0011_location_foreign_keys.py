@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('updates', '0010_map_locations'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='update',
+            name='region',
+        ),
+        migrations.RemoveField(
+            model_name='update',
+            name='country',
+        ),
+        migrations.RenameField(
+            model_name='update',
+            old_name='region_ref',
+            new_name='region',
+        ),
+        migrations.RenameField(
+            model_name='update',
+            old_name='country_ref',
+            new_name='country',
+        ),
+    ]
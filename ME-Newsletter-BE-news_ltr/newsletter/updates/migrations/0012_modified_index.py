@@ -0,0 +1,17 @@
+# Generated by Django 3.2.11 on 2026-10-19 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('updates', '0011_location_foreign_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='update',
+            index=models.Index(fields=['modified', 'id'], name='update_modified_idx'),
+        ),
+    ]
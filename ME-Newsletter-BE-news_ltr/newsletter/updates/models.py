@@ -1,22 +1,55 @@
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
+from model_utils import FieldTracker
 
 from newsletter.newsletterapp.models import NewsLetter
 from newsletter.core.behaviors import PostMixin
+from newsletter.locations.managers import LocatedPostManager
+from newsletter.locations.models import Country, Region
 
 
 class Update(PostMixin):
-    CHOICES = (
-        ("MiddleEast", "MiddleEast"),
-        ("Around The World", "Around The World")
-    )
     newsletter = models.ForeignKey(NewsLetter, on_delete=models.CASCADE ,blank=True, null=True)
-    region = models.CharField(_("Region"), choices=CHOICES, max_length=100 ,null=True, blank=True)
-    country = models.CharField(_("Country"), max_length=100 ,null=True, blank=True)
+    region = models.ForeignKey(
+        Region, verbose_name=_("Region"), on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="updates",
+    )
+    country = models.ForeignKey(
+        Country, verbose_name=_("Country"), on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="updates",
+    )
+
+    objects = LocatedPostManager()
+
+    tracker = FieldTracker(fields=["region", "country", "publish", "is_active", "is_deleted", "title", "content"])
     
     def __str__(self):
         return self.title
             
     class Meta:
         verbose_name = "Update"
+        indexes = [models.Index(fields=["modified", "id"], name="update_modified_idx")]
+
 
+class UpdateSignature(models.Model):
+    """
+    MinHash signature of an update's title and text, see ``newsletter.core.minhash``.
+    """
+    update = models.OneToOneField(Update, on_delete=models.CASCADE, primary_key=True, related_name="signature")
+    minhash = models.BinaryField(_("MinHash"))
+
+    class Meta:
+        verbose_name = "Update Signature"
+
+
+class UpdateBand(models.Model):
+    """
+    LSH bucket of one band of an update's signature; updates sharing a bucket are duplicate candidates.
+    """
+    update = models.ForeignKey(Update, on_delete=models.CASCADE, related_name="bands")
+    band = models.PositiveSmallIntegerField(_("band"))
+    bucket = models.BigIntegerField(_("bucket"))
+
+    class Meta:
+        verbose_name = "Update Band"
+        indexes = [models.Index(fields=["band", "bucket"], name="update_band_bucket_idx")]
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+
+from newsletter.updates.dedup import sign_update
+from newsletter.updates.models import Update
+
+
+def sign_on_save(sender, instance, created, raw=False, **kwargs):
+    if not raw and (created or instance.tracker.has_changed("title") or instance.tracker.has_changed("content")):
+        sign_update(instance)
+
+
+post_save.connect(sign_on_save, sender=Update, dispatch_uid="update-minhash")
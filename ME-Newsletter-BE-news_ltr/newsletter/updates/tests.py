@@ -1,3 +1,52 @@
-from django.test import TestCase
+import pytest
+from django.core.management import call_command
 
-# Create your tests here.
+from newsletter.updates.dedup import duplicates_of, find_clusters, sign_corpus
+from newsletter.updates.models import Update, UpdateSignature
+
+pytestmark = pytest.mark.django_db
+
+WIRE = (
+    "<p>Saudi Arabia raised fuel prices for the second month in a row on Sunday, the state news agency said, "
+    "as the kingdom continues to align domestic energy costs with international benchmarks.</p>"
+)
+
+
+def test_signature_follows_saves_and_finds_duplicates():
+    original = Update.objects.create(title="Saudi fuel prices rise", content=WIRE)
+    copy = Update.objects.create(title="Saudi fuel prices rise again", content=WIRE.replace("Sunday", "Saturday"))
+    other = Update.objects.create(title="Qatar visa centre", content="<p>A new visa centre opened in Doha.</p>")
+
+    assert [update for update, _score in duplicates_of(original)] == [copy]
+    assert duplicates_of(other) == []
+
+    copy.content = other.content
+    copy.save()
+    assert duplicates_of(original) == []
+
+    copy.content = WIRE
+    copy.save()
+    copy.remove()
+    assert duplicates_of(original) == []
+
+
+def test_corpus_scan_reports_clusters(capsys):
+    first = Update.objects.create(title="Oil output", content=WIRE)
+    second = Update.objects.create(title="Oil output", content=WIRE)
+    Update.objects.create(title="Unrelated", content="<p>Labour law changes in Oman.</p>")
+    UpdateSignature.objects.all().delete()
+
+    assert sign_corpus(workers=1, chunk_size=2) == 3
+    assert find_clusters() == [[first.pk, second.pk]]
+    assert sign_corpus(workers=1) == 0
+
+    call_command("find_duplicate_updates", "--resign", "--workers", "2")
+    assert "Found 1 clusters" in capsys.readouterr().out
+
+
+def test_admin_shows_duplicates(admin_client):
+    original = Update.objects.create(title="Fuel prices", content=WIRE)
+    Update.objects.create(title="Fuel prices", content=WIRE)
+    response = admin_client.get("/admin/updates/update/%d/change/" % original.pk)
+    assert response.status_code == 200
+    assert b"100% similar" in response.content